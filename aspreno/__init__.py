@@ -1,29 +1,171 @@
 import copy
 import sys
-from importlib.metadata import distribution as __dist
+import typing
 
 from ._utils import log as _log
+from .fingerprint import CoalescedReport as CoalescedReport
+from .fingerprint import StormCoalescer as StormCoalescer
+from .fingerprint import fingerprint as fingerprint
 from .global_handler import ArgumentedException as ArgumentedException
 from .global_handler import ExceptionHandler as ExceptionHandler
+from .global_handler import RelayOutcome as RelayOutcome
+from .global_handler import route as route
+from .guard import Guard as Guard
+
+if typing.TYPE_CHECKING:
+    import asyncio
+
+    from .capture import CapturedFrame as CapturedFrame
+    from .capture import CaptureRecord as CaptureRecord
+    from .collector import Collector as Collector
+    from .collector import CollectorSink as CollectorSink
+    from .heavy_hitters import HeavyHitter as HeavyHitter
+    from .heavy_hitters import HeavyHitters as HeavyHitters
+    from .metrics import InMemoryMetrics as InMemoryMetrics
+    from .metrics import MetricsHook as MetricsHook
+    from .pipeline import ReportPipeline as ReportPipeline
+    from .pipeline import ReportRecord as ReportRecord
+    from .process import ProcessReporter as ProcessReporter
+    from .rendering import LazyTraceback as LazyTraceback
+    from .rendering import TracebackRenderer as TracebackRenderer
+    from .sampling import EveryNth as EveryNth
+    from .sampling import Reservoir as Reservoir
+    from .sampling import SamplingPolicy as SamplingPolicy
+    from .sampling import TokenBucket as TokenBucket
+    from .shared_counters import SharedCounters as SharedCounters
+    from .spool import Spool as Spool
+
+# The optional features are only imported once they are used.
+_LAZY_NAMES: typing.Dict[str, str] = {
+    "CapturedFrame": "capture",
+    "CaptureRecord": "capture",
+    "Collector": "collector",
+    "CollectorSink": "collector",
+    "HeavyHitter": "heavy_hitters",
+    "HeavyHitters": "heavy_hitters",
+    "InMemoryMetrics": "metrics",
+    "MetricsHook": "metrics",
+    "ReportPipeline": "pipeline",
+    "ReportRecord": "pipeline",
+    "ProcessReporter": "process",
+    "LazyTraceback": "rendering",
+    "TracebackRenderer": "rendering",
+    "EveryNth": "sampling",
+    "Reservoir": "sampling",
+    "SamplingPolicy": "sampling",
+    "TokenBucket": "sampling",
+    "SharedCounters": "shared_counters",
+    "Spool": "spool",
+}
+
+
+def __getattr__(name: str) -> typing.Any:
+    module = _LAZY_NAMES.get(name)
+    if module is not None:
+        import importlib
+
+        value = getattr(importlib.import_module(f".{module}", __name__), name)
+        globals()[name] = value
+        return value
+
+    # Reading the package metadata scans site-packages, only do it when asked to.
+    if name in ("__version__", "__author__"):
+        from importlib.metadata import distribution
+
+        dist = distribution("aspreno")
+        globals().update(__version__=dist.version, __author__=dist.metadata["Author"])
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> typing.List[str]:
+    return sorted({*globals(), *_LAZY_NAMES})
 
-__version__ = __dist("aspreno").version
-__author__ = __dist("aspreno").metadata["Author"]
 
 __old_excepthook = None
+__old_threading_excepthook = None
+__old_unraisablehook = None
+__old_loop_exception_handler: typing.Optional[typing.Tuple[typing.Any, typing.Any]] = None
 
 
-def register_global_handler(handler: ExceptionHandler) -> None:
-    global __old_excepthook
-    _log.debug(f"Registering a global handler: {handler}")
+def register_global_handler(
+    handler: ExceptionHandler,
+    *,
+    threads: bool = True,
+    unraisable: bool = True,
+    loop: typing.Optional["asyncio.AbstractEventLoop"] = None,
+) -> None:
+    """
+    Make the handler receive the exceptions nobody caught.
+
+    The handler replaces :py:func:`sys.excepthook`, and by default :py:func:`threading.excepthook`
+    and :py:func:`sys.unraisablehook` too. If an event loop is given, or one is running, the
+    handler also becomes its exception handler. Exceptions the handler does not handle are given
+    back to the hook they come from.
+
+    Parameters
+    ----------
+    handler : ExceptionHandler
+        The handler to register.
+    threads : bool
+        Also handle exceptions raised in threads.
+    unraisable : bool
+        Also handle exceptions that cannot be raised, such as the ones raised in ``__del__``.
+    loop : asyncio.AbstractEventLoop | None
+        The event loop whose exception handler to replace. Defaults to the running loop, if any.
+    """
+    global __old_excepthook, __old_threading_excepthook, __old_unraisablehook
+    global __old_loop_exception_handler
+    _log.debug("Registering a global handler: %s", handler)
     __old_excepthook = copy.copy(sys.excepthook)
     sys.excepthook = handler._global_handler  # pyright: reportPrivateUsage=false
     _log.debug(__old_excepthook)
     handler.old_excepthook = __old_excepthook
 
+    if threads:
+        import threading
+
+        __old_threading_excepthook = threading.excepthook
+        threading.excepthook = handler._threading_excepthook
+        handler.old_threading_excepthook = __old_threading_excepthook
+
+    if unraisable:
+        __old_unraisablehook = sys.unraisablehook
+        sys.unraisablehook = handler._unraisablehook
+        handler.old_unraisablehook = __old_unraisablehook
+
+    # There cannot be a running loop if asyncio has not been imported yet.
+    if loop is None and "asyncio" in sys.modules:
+        try:
+            loop = sys.modules["asyncio"].get_running_loop()
+        except RuntimeError:
+            pass
+    if loop is not None:
+        __old_loop_exception_handler = (loop, loop.get_exception_handler())
+        loop.set_exception_handler(handler._loop_exception_handler)
+        handler.old_loop_exception_handler = __old_loop_exception_handler[1]
+
 
 def reset_global_handler() -> None:
-    global __old_excepthook
+    global __old_excepthook, __old_threading_excepthook, __old_unraisablehook
+    global __old_loop_exception_handler
     _log.debug("Replacing global handler by default the old excepthook.")
     if __old_excepthook:
         sys.excepthook = __old_excepthook
         __old_excepthook = None
+
+    if __old_threading_excepthook:
+        import threading
+
+        threading.excepthook = __old_threading_excepthook
+        __old_threading_excepthook = None
+
+    if __old_unraisablehook:
+        sys.unraisablehook = __old_unraisablehook
+        __old_unraisablehook = None
+
+    if __old_loop_exception_handler:
+        loop, loop_exception_handler = __old_loop_exception_handler
+        if not loop.is_closed():
+            loop.set_exception_handler(loop_exception_handler)
+        __old_loop_exception_handler = None
@@ -0,0 +1,109 @@
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+import typing
+
+from ._utils import log as _log
+
+
+class BackgroundLoop:
+    """
+    An event loop running in its own daemon thread, started on first use.
+
+    It is used to run coroutine "handle" and "report" methods when no event loop is running in
+    the thread that received the exception, which is usually the case in :py:func:`sys.excepthook`.
+    """
+
+    def __init__(self, name: str = "aspreno-loop", shutdown_timeout: float = 5.0) -> None:
+        self.name = name
+        self.shutdown_timeout = shutdown_timeout
+        self._loop: typing.Optional[asyncio.AbstractEventLoop] = None
+        self._thread: typing.Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._pending: typing.Set["concurrent.futures.Future[typing.Any]"] = set()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is not None:
+                return self._loop
+
+            _log.debug("Starting Aspreno's background event loop.")
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def run() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+            self._thread.start()
+            started.wait()
+            self._loop = loop
+            atexit.register(self.shutdown, self.shutdown_timeout)
+            return loop
+
+    def submit(
+        self, coroutine: typing.Coroutine[typing.Any, typing.Any, typing.Any]
+    ) -> "concurrent.futures.Future[typing.Any]":
+        """
+        Run a coroutine in the background loop without waiting for it.
+
+        Parameters
+        ----------
+        coroutine : Coroutine
+            The coroutine to run.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            The future of the coroutine's result.
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._ensure_started())
+        self._pending.add(future)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: "concurrent.futures.Future[typing.Any]") -> None:
+        self._pending.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            _log.error(
+                "A coroutine ran in the background loop has failed.", exc_info=future.exception()
+            )
+
+    def shutdown(self, timeout: typing.Optional[float] = None) -> bool:
+        """
+        Wait for the pending coroutines, then stop the background loop.
+
+        Parameters
+        ----------
+        timeout : float | None
+            How many seconds to wait for pending coroutines. Wait forever if None.
+
+        Returns
+        -------
+        bool
+            True if every pending coroutine has finished, or False if some were left behind.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or thread is None:
+                return True
+            self._loop = self._thread = None
+            atexit.unregister(self.shutdown)
+
+        _log.debug("Shutting down Aspreno's background event loop.")
+        _, not_done = concurrent.futures.wait(list(self._pending), timeout=timeout)
+        for future in not_done:
+            future.cancel()
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+        return not not_done
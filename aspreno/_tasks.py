@@ -0,0 +1,183 @@
+import collections
+import threading
+import typing
+
+from ._utils import OverflowPolicy
+from ._utils import log as _log
+
+if typing.TYPE_CHECKING:
+    import asyncio
+    import concurrent.futures
+
+AnyFuture = typing.Union["asyncio.Future[typing.Any]", "concurrent.futures.Future[typing.Any]"]
+Coroutine = typing.Coroutine[typing.Any, typing.Any, typing.Any]
+Launcher = typing.Callable[[Coroutine], AnyFuture]
+CallSoon = typing.Callable[..., typing.Any]
+
+
+class TaskRegistry:
+    """
+    Keeps a strong reference to the coroutines scheduled by an exception handler until they
+    are done, so they cannot be garbage-collected mid-flight, and logs their failures.
+
+    The amount of coroutines running at once can be limited. Once the limit is reached, new
+    coroutines either wait for a free slot ("wait") or are dropped ("drop"). The amount of
+    waiting coroutines can be limited too, as each of them keeps its exception and frames alive.
+    Coroutines going over that limit are dropped.
+
+    A slot can be freed from another thread than the one of the waiting coroutine's loop, such
+    as the thread of the background loop. Launchers that are not thread-safe are given a
+    ``call_soon`` function, which runs the launch in their own loop.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: typing.Set[AnyFuture] = set()
+        self._waiting: typing.Deque[
+            typing.Tuple[Coroutine, Launcher, typing.Optional[CallSoon]]
+        ] = collections.deque()
+        # Coroutines taken out of the waiting queue, but not launched yet.
+        self._starting = 0
+        self.overflow_counts: typing.Counter[str] = collections.Counter()
+        """How many coroutines overflowed the limit, per overflow policy."""
+
+    def __len__(self) -> int:
+        return len(self._in_flight) + len(self._waiting) + self._starting
+
+    def submit(
+        self,
+        coroutine: Coroutine,
+        launch: Launcher,
+        limit: typing.Optional[int] = None,
+        policy: OverflowPolicy = "wait",
+        max_waiting: typing.Optional[int] = None,
+        call_soon: typing.Optional[CallSoon] = None,
+    ) -> None:
+        """
+        Launch a coroutine, unless the limit of running coroutines has been reached.
+
+        Parameters
+        ----------
+        coroutine : Coroutine
+            The coroutine to launch.
+        launch : Callable[[Coroutine], Future]
+            Schedules the coroutine and returns its future.
+        limit : int | None
+            The maximum amount of coroutines running at once. Unlimited if None. If 0, every
+            coroutine is dropped, whatever the policy.
+        policy : "wait" | "drop"
+            What to do with the coroutine if the limit has been reached.
+        max_waiting : int | None
+            The maximum amount of coroutines waiting for a free slot. Unlimited if None.
+        call_soon : Callable | None
+            Runs a callback in the thread the launcher belongs to, such as
+            :py:meth:`asyncio.loop.call_soon_threadsafe`. Only needed if the launcher is not
+            thread-safe.
+        """
+        with self._lock:
+            overflowing = limit is not None and len(self._in_flight) >= limit
+            if overflowing:
+                if (
+                    policy == "wait"
+                    and limit
+                    and (max_waiting is None or len(self._waiting) < max_waiting)
+                ):
+                    self.overflow_counts["wait"] += 1
+                    self._waiting.append((coroutine, launch, call_soon))
+                    return
+                self.overflow_counts["drop"] += 1
+        if overflowing:
+            _log.warning("Too many coroutines are running, dropping %r.", coroutine)
+            coroutine.close()
+            return
+        self._launch(coroutine, launch)
+
+    def _launch(self, coroutine: Coroutine, launch: Launcher) -> None:
+        future = launch(coroutine)
+        with self._lock:
+            self._in_flight.add(future)
+        future.add_done_callback(self._on_done)  # type: ignore[arg-type]
+
+    def _on_done(self, future: AnyFuture) -> None:
+        with self._lock:
+            self._in_flight.discard(future)
+            waiting = self._waiting.popleft() if self._waiting else None
+            if waiting is not None:
+                self._starting += 1
+
+        if not future.cancelled() and future.exception() is not None:
+            _log.error("A scheduled coroutine has failed.", exc_info=future.exception())
+
+        if waiting is not None:
+            coroutine, launch, call_soon = waiting
+            try:
+                if call_soon is None:
+                    self._start(coroutine, launch)
+                else:
+                    call_soon(self._start, coroutine, launch)
+            except RuntimeError:  # pragma: no cover
+                # The loop the coroutine was meant for has been closed meanwhile.
+                self._abandon(coroutine)
+
+    def _start(self, coroutine: Coroutine, launch: Launcher) -> None:
+        try:
+            self._launch(coroutine, launch)
+        except RuntimeError:  # pragma: no cover
+            self._abandon(coroutine)
+            return
+        with self._lock:
+            self._starting -= 1
+
+    def _abandon(self, coroutine: Coroutine) -> None:
+        coroutine.close()
+        with self._lock:
+            self._starting -= 1
+
+    async def drain(self, timeout: typing.Optional[float] = None) -> bool:
+        """
+        Wait until every running and waiting coroutine is done.
+
+        Parameters
+        ----------
+        timeout : float | None
+            How many seconds to wait. Wait forever if None.
+
+        Returns
+        -------
+        bool
+            True if everything is done, or False if the timeout has been reached.
+        """
+        import asyncio
+        import concurrent.futures
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        while True:
+            with self._lock:
+                futures = list(self._in_flight)
+                starting = self._starting
+            if not futures and not starting:
+                return not self._waiting
+
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return False
+            if not futures:
+                # A waiting coroutine is being launched in its own loop.
+                await asyncio.sleep(0.001)
+                continue
+
+            awaitables = [
+                (
+                    asyncio.wrap_future(future)
+                    if isinstance(future, concurrent.futures.Future)
+                    # Tasks of other loops cannot be awaited here, skip them.
+                    else future if future.get_loop() is loop else None
+                )
+                for future in futures
+            ]
+            pending = [awaitable for awaitable in awaitables if awaitable is not None]
+            if not pending:
+                return False
+            await asyncio.wait(pending, timeout=remaining)
@@ -1,7 +1,8 @@
+import functools
 import logging
 import sys
 import types
-from typing import Any, Callable, Optional, Type
+from typing import Any, Callable, Dict, Generic, Literal, Mapping, Optional, Type, TypeVar
 
 if sys.version_info < (3, 10):
     # 3.8, 3.9
@@ -20,4 +21,89 @@ TYPE_EXCEPTHOOK: TypeAlias = Callable[
     Any,
 ]
 
+OverflowPolicy: TypeAlias = Literal["wait", "drop"]
+
 log = logging.getLogger("aspreno")
+
+_CO_COROUTINE = 0x80
+"""The code flag of coroutine functions, see :py:data:`inspect.CO_COROUTINE`."""
+
+
+def iscoroutinefunction(function: Any) -> bool:
+    """
+    Same as :py:func:`inspect.iscoroutinefunction`, without importing :py:mod:`inspect`.
+
+    Functions can only be marked as coroutine functions by :py:mod:`inspect`, so it is only
+    delegated to once it has been imported by someone else.
+    """
+    inspect = sys.modules.get("inspect")
+    if inspect is not None:
+        return bool(inspect.iscoroutinefunction(function))
+
+    function = getattr(function, "__func__", function)
+    while isinstance(function, functools.partial):
+        function = function.func
+    code = getattr(function, "__code__", None)
+    return isinstance(code, types.CodeType) and bool(code.co_flags & _CO_COROUTINE)
+
+
+class NoRunningLoop(RuntimeError):
+    """
+    Raised when a coroutine must be scheduled, but no event loop is running and the background
+    loop is disabled.
+    """
+
+
+T = TypeVar("T")
+
+
+def evict_oldest(cache: Dict[Any, Any]) -> None:
+    """
+    Remove the oldest entry of a dictionary used as a cache.
+
+    This is done without locking: if another thread changes the dictionary meanwhile, nothing is
+    removed and the cache gets trimmed the next time.
+    """
+    try:
+        cache.pop(next(iter(cache)), None)
+    except (RuntimeError, StopIteration):
+        pass
+
+
+class TypeIndex(Generic[T]):
+    """
+    A frozen mapping of types to values that is resolved through the method resolution order.
+
+    Looking up a type returns the value of the first class of its MRO that is part of the
+    rules. The verdict is cached, so every type only has its MRO walked once.
+    """
+
+    __slots__ = ("rules", "cache_size", "_cache")
+
+    def __init__(self, rules: Mapping[type, T], cache_size: int = 256) -> None:
+        self.rules: Mapping[type, T] = types.MappingProxyType(dict(rules))
+        self.cache_size = cache_size
+        self._cache: Dict[type, Optional[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def lookup(self, key: type) -> Optional[T]:
+        """
+        Obtain the value of the closest class of the type's MRO, or None if none matched.
+        """
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+
+        value: Optional[T] = None
+        for base in key.__mro__:
+            if base in self.rules:
+                value = self.rules[base]
+                break
+
+        if len(self._cache) >= self.cache_size:
+            evict_oldest(self._cache)
+        self._cache[key] = value
+        return value
@@ -0,0 +1,96 @@
+import concurrent.futures
+import queue
+import threading
+import typing
+
+from ._utils import log as _log
+
+
+class Watchdog:
+    """
+    Runs calls on daemon worker threads, so their caller can stop waiting for them.
+
+    A call that goes over its time budget keeps its worker busy until it returns, and being
+    daemons, such workers never prevent the interpreter from exiting. Workers are started on
+    demand, up to ``max_workers``. Once every worker is stuck, new calls wait in the queue and
+    are cancelled by their caller when their own budget runs out.
+
+    Parameters
+    ----------
+    max_workers : int
+        The maximum amount of worker threads.
+    name : str
+        The prefix of the worker thread names.
+    """
+
+    def __init__(self, max_workers: int = 4, name: str = "aspreno-watchdog") -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        self.max_workers = max_workers
+        self.name = name
+        self._queue: "queue.SimpleQueue[typing.Any]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._workers = 0
+        self._idle = 0
+
+    def submit(
+        self, function: typing.Callable[..., typing.Any], *args: typing.Any
+    ) -> "concurrent.futures.Future[typing.Any]":
+        """
+        Run a call on a worker thread.
+
+        Parameters
+        ----------
+        function : Callable[..., Any]
+            The function to call.
+        *args : Any
+            The arguments of the call.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            The future of the call's result. Cancelling it before a worker picks it up skips
+            the call.
+        """
+        future: "concurrent.futures.Future[typing.Any]" = concurrent.futures.Future()
+        with self._lock:
+            if self._idle == 0 and self._workers < self.max_workers:
+                self._workers += 1
+                threading.Thread(
+                    target=self._work, name=f"{self.name}-{self._workers}", daemon=True
+                ).start()
+        self._queue.put((future, function, args))
+        return future
+
+    def _work(self) -> None:
+        while True:
+            with self._lock:
+                self._idle += 1
+            item = self._queue.get()
+            with self._lock:
+                self._idle -= 1
+                if item is None:
+                    self._workers -= 1
+                    return
+
+            future, function, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = function(*args)
+            except BaseException as exception:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+
+    def shutdown(self) -> None:
+        """
+        Stop the idle worker threads, and the busy ones once their call returns.
+        This never waits for them.
+        """
+        with self._lock:
+            workers = self._workers
+        if workers:
+            _log.debug("Stopping %s watchdog workers.", workers)
+        for _ in range(workers):
+            self._queue.put(None)
@@ -0,0 +1,208 @@
+import time
+import types
+import typing
+
+from .fingerprint import fingerprint
+
+
+class CapturedFrame(typing.NamedTuple):
+    """
+    Where a frame of a traceback was, without the frame itself.
+    """
+
+    filename: str
+    lineno: int
+    function: str
+
+
+class CaptureRecord:
+    """
+    What is kept of an exception once its traceback has been let go of.
+
+    Records only hold strings, numbers and the ``additional_args`` of
+    :py:class:`ArgumentedException <aspreno.ArgumentedException>`, so they keep no frame or local
+    alive and can be pickled as long as those arguments can.
+    """
+
+    __slots__ = (
+        "type_name",
+        "message",
+        "additional_args",
+        "fingerprint",
+        "frames",
+        "created_at",
+    )
+
+    type_name: str
+    """The qualified name of the exception type, such as "builtins.ValueError"."""
+
+    message: str
+    """The exception converted to a string."""
+
+    additional_args: typing.Dict[str, typing.Any]
+    """The kwargs given to an ``ArgumentedException``, or an empty dict for other exceptions."""
+
+    fingerprint: int
+    """The fingerprint of the exception, see :py:func:`aspreno.fingerprint`."""
+
+    frames: typing.Tuple[CapturedFrame, ...]
+    """The frames of the traceback, the outermost one first."""
+
+    created_at: float
+    """When the record was created, as given by :py:func:`time.time`."""
+
+    def __init__(
+        self,
+        type_name: str,
+        message: str,
+        additional_args: typing.Dict[str, typing.Any],
+        fingerprint: int,
+        frames: typing.Tuple[CapturedFrame, ...],
+        created_at: typing.Optional[float] = None,
+    ) -> None:
+        self.type_name = type_name
+        self.message = message
+        self.additional_args = additional_args
+        self.fingerprint = fingerprint
+        self.frames = frames
+        self.created_at = time.time() if created_at is None else created_at
+
+    def __repr__(self) -> str:
+        return (
+            f"<CaptureRecord type_name={self.type_name} message={self.message!r} "
+            f"fingerprint={self.fingerprint} frames={len(self.frames)}>"
+        )
+
+    def __getstate__(self) -> typing.Tuple[typing.Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: typing.Tuple[typing.Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    @classmethod
+    def from_exception(
+        cls, error: BaseException, traceback: typing.Optional[types.TracebackType] = None
+    ) -> "CaptureRecord":
+        """
+        Capture an exception.
+
+        Parameters
+        ----------
+        error : BaseException
+            The exception to capture.
+        traceback : types.TracebackType | None
+            The traceback of the exception. Defaults to the exception's own traceback.
+
+        Returns
+        -------
+        CaptureRecord
+            The record of the exception.
+        """
+        error_type = type(error)
+        if traceback is None:
+            traceback = error.__traceback__
+
+        frames: typing.List[CapturedFrame] = []
+        current = traceback
+        while current is not None:
+            code = current.tb_frame.f_code
+            frames.append(CapturedFrame(code.co_filename, current.tb_lineno, code.co_name))
+            current = current.tb_next
+
+        try:
+            message = str(error)
+        except Exception:
+            message = f"<exception str() failed for {error_type.__name__}>"
+
+        return cls(
+            f"{error_type.__module__}.{error_type.__qualname__}",
+            message,
+            dict(getattr(error, "additional_args", None) or {}),
+            fingerprint(error_type, traceback),
+            tuple(frames),
+        )
+
+
+def clear_frames(traceback: typing.Optional[types.TracebackType]) -> None:
+    """
+    Release the locals of every frame of a traceback, except the frames still running.
+
+    Parameters
+    ----------
+    traceback : types.TracebackType | None
+        The traceback whose frames must be cleared.
+    """
+    while traceback is not None:
+        try:
+            traceback.tb_frame.clear()
+        except RuntimeError:
+            # The frame is still running, such as the one that called relay().
+            pass
+        traceback = traceback.tb_next
+
+
+def dump_report(
+    error: BaseException, kwargs: typing.Dict[str, typing.Any], check: bool = False
+) -> bytes:
+    """
+    Pickle an exception with the kwargs of its "report" method, so it can be reported elsewhere.
+
+    Tracebacks cannot be pickled, so the "traceback" kwarg is replaced by the "capture" kwarg, the
+    :py:class:`CaptureRecord` of the exception.
+
+    Some exceptions pickle but cannot be unpickled, such as those whose ``__init__`` takes more
+    arguments than they give to ``Exception.__init__``. Checking the payload finds them here,
+    instead of where the report is loaded.
+
+    Parameters
+    ----------
+    error : BaseException
+        The exception to report.
+    kwargs : Dict[str, Any]
+        The kwargs to give to the "report" method of the exception.
+    check : bool
+        If True, the payload is unpickled once before being returned.
+
+    Returns
+    -------
+    bytes
+        The pickled report, see :py:func:`load_report`.
+
+    Raises
+    ------
+    Exception
+        Whatever :py:func:`pickle.dumps` raises if the exception or a kwarg cannot be pickled,
+        or :py:func:`pickle.loads` if it is checked and cannot be unpickled.
+    """
+    import pickle
+
+    kwargs = kwargs.copy()
+    traceback = kwargs.pop("traceback", None) or error.__traceback__
+    if "capture" not in kwargs:
+        kwargs["capture"] = CaptureRecord.from_exception(error, traceback)
+    payload = pickle.dumps((error, kwargs), pickle.HIGHEST_PROTOCOL)
+    if check:
+        pickle.loads(payload)
+    return payload
+
+
+def load_report(
+    payload: bytes,
+) -> typing.Tuple[BaseException, typing.Dict[str, typing.Any]]:
+    """
+    Unpickle a report made by :py:func:`dump_report`.
+
+    Parameters
+    ----------
+    payload : bytes
+        The pickled report.
+
+    Returns
+    -------
+    Tuple[BaseException, Dict[str, Any]]
+        The exception, and the kwargs to give to its "report" method.
+    """
+    import pickle
+
+    return pickle.loads(payload)
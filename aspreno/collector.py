@@ -0,0 +1,434 @@
+import struct
+import threading
+import time
+import typing
+
+from ._utils import log as _log
+from .capture import CapturedFrame, CaptureRecord
+from .pipeline import ReportPipeline, ReportRecord
+
+if typing.TYPE_CHECKING:
+    import socket
+    import socketserver
+
+Address = typing.Union[str, typing.Tuple[str, int]]
+"""The path of a Unix-domain socket, or the host and port of a TCP socket."""
+
+_LENGTH = struct.Struct(">I")
+_BATCH = struct.Struct(">IH")
+_RECORD = struct.Struct(">QdH")
+_FRAME_LINENO = struct.Struct(">I")
+
+
+def _pack_string(value: str) -> bytes:
+    encoded = value.encode("utf-8", "replace")
+    return _LENGTH.pack(len(encoded)) + encoded
+
+
+def _unpack_string(data: bytes, offset: int) -> typing.Tuple[str, int]:
+    (length,) = _LENGTH.unpack_from(data, offset)
+    offset += _LENGTH.size
+    return data[offset : offset + length].decode("utf-8"), offset + length
+
+
+def encode_record(record: CaptureRecord) -> bytes:
+    """
+    Encode a capture record in the collector's binary format.
+
+    Additional arguments are encoded as JSON, using their ``repr`` when they are not
+    serializable.
+
+    Parameters
+    ----------
+    record : CaptureRecord
+        The record to encode.
+
+    Returns
+    -------
+    bytes
+        The encoded record, see :py:func:`decode_record`.
+    """
+    import json
+
+    parts = [
+        _RECORD.pack(record.fingerprint, record.created_at, len(record.frames)),
+        _pack_string(record.type_name),
+        _pack_string(record.message),
+        _pack_string(json.dumps(record.additional_args, default=repr)),
+    ]
+    for frame in record.frames:
+        parts.append(_pack_string(frame.filename))
+        parts.append(_FRAME_LINENO.pack(frame.lineno))
+        parts.append(_pack_string(frame.function))
+    return b"".join(parts)
+
+
+def decode_record(data: bytes) -> CaptureRecord:
+    """
+    Decode a capture record encoded by :py:func:`encode_record`.
+
+    Parameters
+    ----------
+    data : bytes
+        The encoded record.
+
+    Returns
+    -------
+    CaptureRecord
+        The decoded record.
+    """
+    import json
+
+    fingerprint, created_at, frame_count = _RECORD.unpack_from(data)
+    offset = _RECORD.size
+    type_name, offset = _unpack_string(data, offset)
+    message, offset = _unpack_string(data, offset)
+    additional_args, offset = _unpack_string(data, offset)
+
+    frames: typing.List[CapturedFrame] = []
+    for _ in range(frame_count):
+        filename, offset = _unpack_string(data, offset)
+        (lineno,) = _FRAME_LINENO.unpack_from(data, offset)
+        function, offset = _unpack_string(data, offset + _FRAME_LINENO.size)
+        frames.append(CapturedFrame(filename, lineno, function))
+
+    return CaptureRecord(
+        type_name, message, json.loads(additional_args), fingerprint, tuple(frames), created_at
+    )
+
+
+def encode_batch(records: typing.Sequence[CaptureRecord]) -> bytes:
+    """
+    Encode capture records as one message: its length and record count, followed by every
+    record prefixed by its own length.
+
+    Parameters
+    ----------
+    records : Sequence[CaptureRecord]
+        The records to encode, at most 65535.
+
+    Returns
+    -------
+    bytes
+        The encoded message.
+    """
+    body = b"".join(
+        _LENGTH.pack(len(encoded)) + encoded
+        for encoded in (encode_record(record) for record in records)
+    )
+    return _BATCH.pack(len(body), len(records)) + body
+
+
+def _read_exactly(connection: "socket.socket", size: int) -> typing.Optional[bytes]:
+    chunks: typing.List[bytes] = []
+    while size:
+        chunk = connection.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_batches(connection: "socket.socket") -> typing.Iterator[typing.List[CaptureRecord]]:
+    """
+    Read the messages sent by a :py:class:`CollectorSink` until the connection is closed.
+
+    Parameters
+    ----------
+    connection : socket.socket
+        The connection to read from.
+
+    Yields
+    ------
+    List[CaptureRecord]
+        The records of each message.
+    """
+    while True:
+        header = _read_exactly(connection, _BATCH.size)
+        if header is None:
+            return
+        length, count = _BATCH.unpack(header)
+        body = _read_exactly(connection, length)
+        if body is None:
+            return
+
+        records: typing.List[CaptureRecord] = []
+        offset = 0
+        for _ in range(count):
+            (size,) = _LENGTH.unpack_from(body, offset)
+            offset += _LENGTH.size
+            records.append(decode_record(body[offset : offset + size]))
+            offset += size
+        yield records
+
+
+def _connect(address: Address, timeout: float) -> "socket.socket":
+    import socket
+
+    if isinstance(address, str):
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    connection.settimeout(timeout)
+    try:
+        connection.connect(address)
+    except OSError:
+        connection.close()
+        raise
+    return connection
+
+
+class CollectorSink(ReportPipeline):
+    """
+    Sends reports to a collector daemon running on the same machine, instead of calling the
+    "report" methods of the exceptions.
+
+    Reports are turned into :py:class:`CaptureRecord <aspreno.CaptureRecord>`, batched by the
+    pipeline, and written in a compact binary format, see :py:func:`encode_batch`. Every worker
+    thread keeps its own persistent connection, so there are as many connections as workers.
+    A connection that fails is reopened, waiting longer after every consecutive failure.
+
+    Parameters
+    ----------
+    address : str | Tuple[str, int]
+        The path of the collector's Unix-domain socket, or its host and port over TCP.
+    workers : int
+        The amount of worker threads, and of connections.
+    max_queue : int
+        How many reports can wait in the queue. Reports submitted to a full queue are dropped.
+    batch_size : int
+        The maximum amount of reports sent at once.
+    batch_interval : float
+        How many seconds to wait for more reports before sending an incomplete batch.
+    timeout : float
+        How many seconds connecting and sending may take.
+    max_attempts : int
+        How many times a batch is sent before being dropped.
+    backoff : float
+        How many seconds to wait before reconnecting after the first failure. The wait doubles
+        with every consecutive failure.
+    max_backoff : float
+        The longest wait before reconnecting.
+    """
+
+    def __init__(
+        self,
+        address: Address,
+        workers: int = 2,
+        max_queue: int = 4096,
+        batch_size: int = 64,
+        batch_interval: float = 0.05,
+        timeout: float = 1.0,
+        max_attempts: int = 3,
+        backoff: float = 0.1,
+        max_backoff: float = 5.0,
+    ) -> None:
+        if batch_size > 0xFFFF:
+            raise ValueError("batch_size must be at most 65535.")
+        super().__init__(
+            workers=workers,
+            max_queue=max_queue,
+            batch_size=batch_size,
+            batch_interval=batch_interval,
+        )
+        self.address = address
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.sent = 0
+        """How many reports have been sent to the collector."""
+        self.failed = 0
+        """How many reports were dropped because the collector could not be reached."""
+
+        self._local = threading.local()
+
+    def report_batch(self, records: typing.List[ReportRecord]) -> None:
+        captures = [
+            record.kwargs.get("capture")
+            or CaptureRecord.from_exception(record.error, record.kwargs.get("traceback"))
+            for record in records
+        ]
+        message = encode_batch(captures)
+
+        for attempt in range(self.max_attempts):
+            try:
+                self._send(message)
+            except OSError as exception:
+                _log.warning(
+                    "Failed to send %s reports to the collector (attempt %s): %s",
+                    len(records),
+                    attempt + 1,
+                    exception,
+                )
+                continue
+            self.sent += len(records)
+            for record in records:
+                record.mark_reported()
+            return
+
+        self.failed += len(records)
+        _log.error("Dropping %s reports, the collector cannot be reached.", len(records))
+
+    def _send(self, message: bytes) -> None:
+        local = self._local
+        connection: typing.Optional["socket.socket"] = getattr(local, "connection", None)
+        if connection is None:
+            delay = getattr(local, "retry_at", 0.0) - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                connection = _connect(self.address, self.timeout)
+            except OSError:
+                self._back_off()
+                raise
+            local.connection = connection
+
+        try:
+            connection.sendall(message)
+        except OSError:
+            connection.close()
+            local.connection = None
+            self._back_off()
+            raise
+        local.failures = 0
+
+    def _back_off(self) -> None:
+        local = self._local
+        failures = getattr(local, "failures", 0)
+        local.failures = failures + 1
+        local.retry_at = time.monotonic() + min(self.backoff * 2**failures, self.max_backoff)
+
+    def _work(self) -> None:
+        try:
+            super()._work()
+        finally:
+            connection = getattr(self._local, "connection", None)
+            if connection is not None:
+                connection.close()
+
+
+class Collector:
+    """
+    A minimal collector, receiving the reports of :py:class:`CollectorSink` on one machine.
+
+    Parameters
+    ----------
+    address : str | Tuple[str, int]
+        The path of the Unix-domain socket to listen on, or the host and port over TCP.
+    on_batch : Callable[[List[CaptureRecord]], Any] | None
+        Called with the records of every received batch, from the thread of the connection.
+        Defaults to printing one line per record.
+    """
+
+    def __init__(
+        self,
+        address: Address,
+        on_batch: typing.Optional[
+            typing.Callable[[typing.List[CaptureRecord]], typing.Any]
+        ] = None,
+    ) -> None:
+        import socketserver
+
+        self.address = address
+        self.on_batch = on_batch or self.print_batch
+        self.received = 0
+        """How many records have been received."""
+
+        collector = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                for records in read_batches(self.request):
+                    collector.received += len(records)
+                    collector.on_batch(records)
+
+        self._server: "socketserver.BaseServer"
+        if isinstance(address, str):
+            self._server = socketserver.ThreadingUnixStreamServer(address, Handler)
+        else:
+            self._server = socketserver.ThreadingTCPServer(address, Handler)
+        self._server.daemon_threads = True  # type: ignore[attr-defined]
+
+    @property
+    def server_address(self) -> Address:
+        """The address the collector listens on, with the actual port if 0 was given."""
+        return self._server.server_address  # type: ignore[return-value]
+
+    @staticmethod
+    def print_batch(records: typing.List[CaptureRecord]) -> None:
+        for record in records:
+            location = record.frames[-1] if record.frames else None
+            where = f" at {location.filename}:{location.lineno}" if location else ""
+            print(f"{record.type_name}: {record.message}{where} [{record.fingerprint:016x}]")
+
+    def serve_forever(self) -> None:
+        """
+        Receive reports until :py:meth:`shutdown` is called.
+        """
+        self._server.serve_forever()
+
+    def start(self) -> threading.Thread:
+        """
+        Receive reports in a daemon thread.
+
+        Returns
+        -------
+        threading.Thread
+            The thread receiving reports.
+        """
+        thread = threading.Thread(target=self.serve_forever, name="aspreno-collector", daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self) -> None:
+        """
+        Stop receiving reports, and close the socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        if isinstance(self.address, str):
+            import os
+
+            try:
+                os.remove(self.address)
+            except FileNotFoundError:
+                pass
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    """
+    Run the reference collector from the command line, printing every received report.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="aspreno-collector", description="Print the reports sent by an Aspreno sink."
+    )
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--unix", metavar="PATH", help="the Unix-domain socket to listen on")
+    group.add_argument("--tcp", metavar="HOST:PORT", help="the TCP address to listen on")
+    arguments = parser.parse_args(argv)
+
+    address: Address
+    if arguments.unix:
+        address = arguments.unix
+    else:
+        host, _, port = arguments.tcp.rpartition(":")
+        address = (host or "127.0.0.1", int(port))
+
+    collector = Collector(address)
+    print(f"Listening on {collector.server_address}.")
+    try:
+        collector.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        collector._server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
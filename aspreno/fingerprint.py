@@ -0,0 +1,198 @@
+import threading
+import time
+import types
+import typing
+import weakref
+import zlib
+
+_code_keys: "weakref.WeakKeyDictionary[types.CodeType, int]" = weakref.WeakKeyDictionary()
+_type_keys: "weakref.WeakKeyDictionary[type, int]" = weakref.WeakKeyDictionary()
+
+
+def _code_key(code: types.CodeType) -> int:
+    try:
+        return _code_keys[code]
+    except KeyError:
+        key = zlib.crc32(f"{code.co_filename}:{code.co_name}:{code.co_firstlineno}".encode())
+        _code_keys[code] = key
+        return key
+
+
+def _type_key(error_type: type) -> int:
+    try:
+        return _type_keys[error_type]
+    except KeyError:
+        key = zlib.crc32(f"{error_type.__module__}.{error_type.__qualname__}".encode())
+        _type_keys[error_type] = key
+        return key
+
+
+def fingerprint(
+    error_type: typing.Type[BaseException], traceback: typing.Optional[types.TracebackType]
+) -> int:
+    """
+    Identify where an exception comes from.
+
+    Two exceptions of the same type, raised through the same code locations, share the same
+    fingerprint. It is computed from code objects and line numbers, without formatting anything,
+    and is stable across processes running the same code.
+
+    Parameters
+    ----------
+    error_type : Type[BaseException]
+        The type of the exception.
+    traceback : types.TracebackType | None
+        The traceback of the exception.
+
+    Returns
+    -------
+    int
+        A 64-bit fingerprint.
+    """
+    parts = [_type_key(error_type)]
+    while traceback is not None:
+        parts.append(_code_key(traceback.tb_frame.f_code))
+        parts.append(traceback.tb_lineno)
+        traceback = traceback.tb_next
+    # Integer tuples do not use the randomized string hash.
+    return hash(tuple(parts)) & 0xFFFFFFFFFFFFFFFF
+
+
+class CoalescedReport:
+    """
+    The occurrences of an exception that were not reported during a window of a
+    :py:class:`StormCoalescer`.
+    """
+
+    __slots__ = ("fingerprint", "error", "count", "first_seen", "last_seen")
+
+    fingerprint: int
+    """The fingerprint shared by the occurrences."""
+
+    error: BaseException
+    """The first occurrence, the one that has been reported."""
+
+    count: int
+    """How many times the exception occurred during the window, including the first time."""
+
+    first_seen: float
+    """When the first occurrence happened, as given by :py:func:`time.time`."""
+
+    last_seen: float
+    """When the last occurrence happened, as given by :py:func:`time.time`."""
+
+    def __init__(self, fingerprint: int, error: BaseException, now: float) -> None:
+        self.fingerprint = fingerprint
+        self.error = error
+        self.count = 1
+        self.first_seen = self.last_seen = now
+
+    def __repr__(self) -> str:
+        return (
+            f"<CoalescedReport error={type(self.error).__name__} count={self.count} "
+            f"first_seen={self.first_seen} last_seen={self.last_seen}>"
+        )
+
+
+class StormCoalescer:
+    """
+    Suppresses repeated reports of the same exception.
+
+    The first occurrence of a fingerprint is reported right away and opens a window. The other
+    occurrences within the window are only counted, and are given back as one
+    :py:class:`CoalescedReport` by :py:meth:`collect` once the window is over.
+
+    Parameters
+    ----------
+    window : float
+        How many seconds a window lasts.
+    max_fingerprints : int
+        How many windows can be open at once. When reached, the oldest window is closed early.
+    """
+
+    def __init__(self, window: float = 60.0, max_fingerprints: int = 1024) -> None:
+        self.window = window
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._windows: typing.Dict[int, CoalescedReport] = {}
+        self._closed: typing.List[CoalescedReport] = []
+        self._next_sweep = 0.0
+
+    def observe(
+        self, fingerprint: int, error: BaseException, now: typing.Optional[float] = None
+    ) -> bool:
+        """
+        Count an occurrence of an exception.
+
+        Parameters
+        ----------
+        fingerprint : int
+            The fingerprint of the exception, see :py:func:`fingerprint`.
+        error : BaseException
+            The exception.
+        now : float | None
+            The time of the occurrence. Defaults to :py:func:`time.time`.
+
+        Returns
+        -------
+        bool
+            True if the exception must be reported now, or False if it has been coalesced.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            current = self._windows.get(fingerprint)
+            if current is not None:
+                if now - current.first_seen < self.window:
+                    current.count += 1
+                    current.last_seen = now
+                    return False
+                self._close(fingerprint)
+
+            if len(self._windows) >= self.max_fingerprints:
+                self._close(next(iter(self._windows)))
+            self._windows[fingerprint] = CoalescedReport(fingerprint, error, now)
+            return True
+
+    def _close(self, fingerprint: int) -> None:
+        report = self._windows.pop(fingerprint)
+        if report.count > 1:
+            self._closed.append(report)
+
+    def collect(
+        self, now: typing.Optional[float] = None, force: bool = False
+    ) -> typing.List[CoalescedReport]:
+        """
+        Obtain the reports of the windows that are over.
+        Only reports where the exception occurred more than once are given back.
+
+        Parameters
+        ----------
+        now : float | None
+            The current time. Defaults to :py:func:`time.time`.
+        force : bool
+            Close every window, even if it is not over yet.
+
+        Returns
+        -------
+        List[CoalescedReport]
+            The reports of the closed windows.
+        """
+        now = time.time() if now is None else now
+        if not force and not self._closed and now < self._next_sweep:
+            return []
+
+        with self._lock:
+            expired = [
+                fingerprint
+                for fingerprint, report in self._windows.items()
+                if force or now - report.first_seen >= self.window
+            ]
+            for fingerprint in expired:
+                self._close(fingerprint)
+            closed, self._closed = self._closed, []
+            # Nothing can expire before the oldest open window does.
+            self._next_sweep = min(
+                (report.first_seen + self.window for report in self._windows.values()),
+                default=now + self.window,
+            )
+        return closed
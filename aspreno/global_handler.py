@@ -1,13 +1,109 @@
 # mypy: disable-error-code="attr-defined"
 
-import asyncio
+import atexit
+import builtins
+import collections
+import contextvars
+import functools
 import sys
+import time
 import types
 import typing
-from inspect import iscoroutinefunction, signature
+import weakref
 
-from ._utils import TYPE_EXCEPTHOOK
+from ._tasks import TaskRegistry
+from ._utils import (
+    TYPE_EXCEPTHOOK,
+    NoRunningLoop,
+    OverflowPolicy,
+    TypeIndex,
+    evict_oldest,
+    iscoroutinefunction,
+)
 from ._utils import log as _log
+from .fingerprint import CoalescedReport, StormCoalescer, fingerprint
+from .guard import Guard
+
+if typing.TYPE_CHECKING:
+    import asyncio
+    import threading
+
+    from ._loop import BackgroundLoop
+    from ._watchdog import Watchdog
+    from .heavy_hitters import HeavyHitters
+    from .metrics import MetricsHook
+    from .pipeline import ReportPipeline
+    from .process import ProcessReporter
+    from .rendering import TracebackRenderer
+    from .sampling import SamplingPolicy
+    from .shared_counters import SharedCounters
+    from .spool import Spool
+
+_BaseExceptionGroup: typing.Optional[type] = getattr(builtins, "BaseExceptionGroup", None)
+"""The base class of exception groups, on Python 3.11 and later."""
+_ExceptionGroup: typing.Any = getattr(builtins, "ExceptionGroup", None)
+
+_fallback_hook: "contextvars.ContextVar[typing.Optional[typing.Callable[[], typing.Any]]]" = (
+    contextvars.ContextVar("aspreno_fallback_hook", default=None)
+)
+"""
+The hook to give unhandled exceptions to, when they come from another hook than
+:py:func:`sys.excepthook`.
+"""
+
+
+class _DeferredFallbacks:
+    """
+    The members of an exception group that were not handled, while its members are dispatched.
+    The group is given to the previous hook once afterwards, instead of each member.
+    """
+
+    __slots__ = ("errors", "closed")
+
+    def __init__(self) -> None:
+        self.errors: typing.List[BaseException] = []
+        self.closed = False
+
+
+_deferred_fallbacks: "contextvars.ContextVar[typing.Optional[_DeferredFallbacks]]" = (
+    contextvars.ContextVar("aspreno_deferred_fallbacks", default=None)
+)
+
+
+class _ArgumentPlan(typing.NamedTuple):
+    """
+    The result of introspecting a "handle" or "report" method once.
+
+    Storing the plan avoids calling :py:func:`inspect.signature` every time an argumented
+    exception is handled.
+    """
+
+    function: typing.Callable[..., typing.Any]
+    """The function the plan was built from, used to detect reassigned methods."""
+
+    parameters: typing.FrozenSet[str]
+    """Names of the parameters that can be fed by keyword."""
+
+    accepts_var_keyword: bool
+    """Whether the method takes ``**kwargs``."""
+
+    @classmethod
+    def from_method(cls, method: typing.Callable[..., typing.Any]) -> "_ArgumentPlan":
+        from inspect import signature
+
+        parameters: typing.Set[str] = set()
+        accepts_var_keyword = False
+
+        for parameter in signature(method).parameters.values():
+            if parameter.kind is parameter.VAR_KEYWORD:
+                accepts_var_keyword = True
+            elif parameter.kind is not parameter.VAR_POSITIONAL:
+                parameters.add(parameter.name)
+
+        return cls(getattr(method, "__func__", method), frozenset(parameters), accepts_var_keyword)
+
+    def extract(self, arguments: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+        return {name: value for name, value in arguments.items() if name in self.parameters}
 
 
 class ArgumentedException(Exception):
@@ -18,6 +114,16 @@ class ArgumentedException(Exception):
 
     additional_args: typing.Dict[str, typing.Any]
 
+    _argument_plans: typing.ClassVar[typing.Dict[str, _ArgumentPlan]] = {}
+    """
+    Introspected "handle" and "report" methods, keyed by method name.
+    Each subclass owns its own mapping.
+    """
+
+    def __init_subclass__(cls, **kwargs: typing.Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._argument_plans = {}
+
     def __init__(self, *args: object, **kwargs: typing.Any) -> None:
         self.additional_args = kwargs
         super().__init__(*args)
@@ -31,15 +137,198 @@ class ArgumentedException(Exception):
     def get_kwargs_for_method(
         self, method: typing.Callable[..., typing.Any]
     ) -> typing.Dict[str, typing.Any]:
-        method_signature = signature(method)
+        return self.get_argument_plan(method).extract(self.additional_args)
 
-        kwargs: typing.Dict[str, typing.Any] = {
-            argument_name: self.additional_args[argument_name]
-            for argument_name in method_signature.parameters
-            if argument_name in self.additional_args
-        }
+    @classmethod
+    def get_argument_plan(cls, method: typing.Callable[..., typing.Any]) -> _ArgumentPlan:
+        """
+        Obtain the argument plan of a method, introspecting it only if it has not been seen.
+
+        Plans are cached per class for the class's own methods, and are rebuilt when the method
+        has been reassigned since the plan was made.
+
+        Parameters
+        ----------
+        method : Callable[..., Any]
+            The method to obtain the plan for.
 
-        return kwargs
+        Returns
+        -------
+        _ArgumentPlan
+            The plan of the method.
+        """
+        function = getattr(method, "__func__", method)
+        name = getattr(function, "__name__", None)
+
+        plan = cls._argument_plans.get(name) if name else None
+        if plan is not None and plan.function is function:
+            return plan
+
+        plan = _ArgumentPlan.from_method(method)
+        # Only cache the class's own methods, anything else could be an arbitrary callable.
+        if name and getattr(cls, name, None) is function:
+            cls._argument_plans[name] = plan
+        return plan
+
+
+class _DispatchPlan(typing.NamedTuple):
+    """
+    How an exception type is dispatched by :py:meth:`ExceptionHandler.handle`.
+
+    The answers only depend on the exception's class, so they are computed once per type.
+    """
+
+    has_handle: bool
+    handle_is_coroutine: bool
+    has_report: bool
+    report_is_coroutine: bool
+    is_argumented: bool
+    """Whether additional kwargs must be extracted from the exception."""
+    is_group: bool
+    """Whether the exception is a group whose members must be dispatched one by one."""
+
+    @classmethod
+    def from_type(cls, error_type: typing.Type[BaseException]) -> "_DispatchPlan":
+        handle = getattr(error_type, "handle", None)
+        report = getattr(error_type, "report", None)
+        return cls(
+            has_handle=handle is not None,
+            handle_is_coroutine=iscoroutinefunction(handle),
+            has_report=bool(report),
+            report_is_coroutine=iscoroutinefunction(report),
+            is_argumented=issubclass(error_type, ArgumentedException),
+            # Groups that handle or report themselves are dispatched like any exception.
+            is_group=_BaseExceptionGroup is not None
+            and issubclass(error_type, _BaseExceptionGroup)
+            and handle is None
+            and not report,
+        )
+
+
+class RelayOutcome:
+    """
+    What happened to an exception given to :py:meth:`ExceptionHandler.arelay`.
+    """
+
+    __slots__ = ("error", "ignored", "handled", "reported", "timed_out", "failures", "members")
+
+    error: BaseException
+    """The exception that was relayed."""
+
+    ignored: bool
+    """Whether the exception has been set to be ignored."""
+
+    handled: bool
+    """Whether a route or the exception's "handle" method has completed."""
+
+    reported: bool
+    """Whether the exception's "report" method has completed."""
+
+    timed_out: bool
+    """Whether a coroutine has been cancelled because it went over the deadline."""
+
+    failures: typing.List[BaseException]
+    """The exceptions raised while handling or reporting."""
+
+    members: typing.List["RelayOutcome"]
+    """
+    The outcomes of the members of an exception group, nested groups being flattened. Empty for
+    other exceptions.
+    """
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+        self.ignored = self.handled = self.reported = self.timed_out = False
+        self.failures = []
+        self.members = []
+
+    @classmethod
+    def aggregate(
+        cls, error: BaseException, members: typing.List["RelayOutcome"]
+    ) -> "RelayOutcome":
+        """
+        Combine the outcomes of the members of an exception group.
+
+        The group is ignored if every member is, handled if every member that is not ignored
+        is, reported if any member is, and timed out if any member did.
+        """
+        outcome = cls(error)
+        outcome.members = members
+        remaining = [member for member in members if not member.ignored]
+        outcome.ignored = not remaining
+        outcome.handled = bool(remaining) and all(member.handled for member in remaining)
+        outcome.reported = any(member.reported for member in members)
+        outcome.timed_out = any(member.timed_out for member in members)
+        for member in members:
+            outcome.failures.extend(member.failures)
+        return outcome
+
+    def __repr__(self) -> str:
+        return (
+            f"<RelayOutcome error={type(self.error).__name__} ignored={self.ignored} "
+            f"handled={self.handled} reported={self.reported} timed_out={self.timed_out} "
+            f"failed={self.failed}>"
+        )
+
+    @property
+    def failed(self) -> bool:
+        """Whether handling or reporting has raised an exception."""
+        return bool(self.failures)
+
+
+def _acknowledged(
+    method: typing.Callable[..., typing.Any],
+    acknowledge: typing.Callable[[], typing.Any],
+    is_coroutine: bool,
+) -> typing.Callable[..., typing.Any]:
+    """
+    Wrap a "report" method so its spooled report is acknowledged once it has returned.
+    """
+    if is_coroutine:
+
+        async def report_coroutine(**kwargs: typing.Any) -> None:
+            await method(**kwargs)
+            acknowledge()
+
+        return report_coroutine
+
+    def report(**kwargs: typing.Any) -> None:
+        method(**kwargs)
+        acknowledge()
+
+    return report
+
+
+RouteHandler = typing.Callable[..., typing.Any]
+_ROUTES_ATTRIBUTE = "__aspreno_routes__"
+
+
+def route(
+    *error_types: typing.Type[BaseException],
+) -> typing.Callable[[RouteHandler], RouteHandler]:
+    """
+    Mark a method of an :py:class:`ExceptionHandler` subclass as the handler of exception types.
+
+    The method is called with the exception and the kwargs given to
+    :py:meth:`ExceptionHandler.handle` instead of letting the exception self-handle.
+    Subclasses of the given types are routed to the method too, unless they have their own route.
+    To let an exception go through the default handling anyway, the method calls
+    :py:meth:`ExceptionHandler.handle_unrouted` with the exception and its kwargs.
+
+    Parameters
+    ----------
+    *error_types : Type[BaseException]
+        The exception types to route to the method.
+    """
+    if not error_types:
+        raise TypeError("At least one exception type must be given.")
+
+    def decorator(method: RouteHandler) -> RouteHandler:
+        routes = getattr(method, _ROUTES_ATTRIBUTE, ())
+        setattr(method, _ROUTES_ATTRIBUTE, routes + error_types)
+        return method
+
+    return decorator
 
 
 class ExceptionHandler:
@@ -47,52 +336,936 @@ class ExceptionHandler:
     """
     A list of exceptions to ignore.
     If an exception has been set to be ignored, the "handle" method will not be called.
+    Subclasses of an ignored exception are ignored too.
+
+    .. note::
+       The list is compiled into a lookup index the first time it is used. The index is
+       rebuilt when the list is replaced or its size changes.
     """
 
     old_excepthook: typing.Optional[TYPE_EXCEPTHOOK] = None
 
-    _last_exception: typing.Optional[typing.Type[BaseException]] = None
+    old_threading_excepthook: typing.Optional[
+        typing.Callable[["threading.ExceptHookArgs"], typing.Any]
+    ] = None
+    """The :py:func:`threading.excepthook` replaced by :py:func:`aspreno.register_global_handler`."""
+
+    old_unraisablehook: typing.Optional[typing.Callable[[typing.Any], typing.Any]] = None
+    """The :py:func:`sys.unraisablehook` replaced by :py:func:`aspreno.register_global_handler`."""
+
+    old_loop_exception_handler: typing.Optional[
+        typing.Callable[["asyncio.AbstractEventLoop", typing.Dict[str, typing.Any]], typing.Any]
+    ] = None
+    """
+    The exception handler of the event loop replaced by :py:func:`aspreno.register_global_handler`.
+    """
+
+    use_background_loop: bool = False
+    """
+    Run coroutine "handle" and "report" methods in a background event loop owned by the handler
+    when no event loop is running, instead of raising a :py:exc:`RuntimeError`.
+    The loop is started the first time it is needed, see :py:meth:`shutdown`.
+    If disabled, exceptions received from threads, finalizers or a loop that is no longer
+    running are given back to the hook they come from.
+    """
+
+    max_pending_tasks: typing.Optional[int] = None
+    """
+    The maximum amount of coroutine "handle" and "report" methods running at once.
+    Unlimited if None. If 0, coroutine methods are never run, they are all dropped.
+    """
+
+    task_overflow_policy: OverflowPolicy = "wait"
+    """
+    What to do with new coroutines once :py:attr:`max_pending_tasks` has been reached.
+    "wait" runs them once a slot is free, "drop" discards them.
+    """
+
+    max_waiting_tasks: typing.Optional[int] = 1024
+    """
+    The maximum amount of coroutines waiting for a free slot with the "wait" policy. Each of them
+    keeps its exception, traceback and frames alive, so the coroutines going over this limit are
+    dropped, and counted as such. Unlimited if None.
+    """
+
+    report_pipeline: typing.Optional["ReportPipeline"] = None
+    """
+    If set, synchronous "report" methods are called by the pipeline's worker threads instead of
+    the thread that received the exception.
+    """
+
+    process_reporter: typing.Optional["ProcessReporter"] = None
+    """
+    If set, synchronous "report" methods are made in worker processes. Exceptions that cannot be
+    pickled are reported in this process, through the :py:attr:`report_pipeline` if set.
+    """
+
+    spool: typing.Optional["Spool"] = None
+    """
+    If set, reports are written to the spool before being made, and the spool is synced to the disk
+    before :py:func:`sys.excepthook` returns. Reports that were not made when the process died
+    can then be replayed, see :py:meth:`Spool.replay <aspreno.Spool.replay>`.
+    """
+
+    coalescer: typing.Optional[StormCoalescer] = None
+    """
+    If set, repeated occurrences of an exception are only reported once per window of the
+    coalescer. The suppressed occurrences are given to :py:meth:`report_aggregate` afterwards,
+    when an exception occurs after the window, on :py:meth:`shutdown`, or when the interpreter
+    exits.
+    """
+
+    sampling_policy: typing.Optional["SamplingPolicy"] = None
+    """
+    If set, the policy decides which exceptions are reported. Exceptions are always handled.
+    """
+
+    metrics: typing.Optional["MetricsHook"] = None
+    """
+    If set, receives the latencies of "handle" and "report" methods, and counts ignored exceptions,
+    fallbacks to the previous excepthook and scheduled coroutines.
+    """
+
+    heavy_hitters: typing.Optional["HeavyHitters"] = None
+    """
+    If set, every handled exception is counted by its type and fingerprint, giving the most
+    frequent exceptions in fixed memory.
+    """
+
+    shared_counters: typing.Optional["SharedCounters"] = None
+    """
+    If set, every handled exception is counted by type in shared memory, so the counts of
+    forked worker processes can be read from any process.
+    """
+
+    relay_timeout: typing.Optional[float] = None
+    """
+    How many seconds :py:meth:`arelay` waits for coroutine "handle" and "report" methods before
+    cancelling them. Wait forever if None.
+    """
+
+    time_budget: typing.Optional[float] = None
+    """
+    How many seconds a synchronous "report" method may run. Methods going over their budget are
+    abandoned: they keep running on a daemon thread of the watchdog, but the handler stops waiting
+    for them, which keeps :py:func:`sys.excepthook` from hanging.
+    Not limited if None.
+    """
+
+    time_budgets: typing.Dict[typing.Type[BaseException], float] = {}
+    """
+    The time budgets of specific exception types, and their subclasses, overriding
+    :py:attr:`time_budget`.
+    """
+
+    budget_handle: bool = False
+    """
+    If True, synchronous "handle" methods and routes are limited by the time budgets too.
+    """
+
+    watchdog_workers: int = 4
+    """
+    The maximum amount of threads running methods with a time budget.
+    """
+
+    capture_records: bool = False
+    """
+    If True, a :py:class:`CaptureRecord <aspreno.CaptureRecord>` is made of every exception, and
+    given to "handle" and "report" methods as the "capture" kwarg.
+    """
+
+    clear_frames: bool = False
+    """
+    If True, the locals of the traceback's frames are released once the exception has been
+    captured, instead of being kept alive until it has been reported. Implies
+    :py:attr:`capture_records`. The "traceback" kwarg is still given, but its frames are empty.
+    """
+
+    traceback_renderer: typing.Optional["TracebackRenderer"] = None
+    """
+    If set, "handle" and "report" methods are given the "formatted_traceback" kwarg, a
+    :py:class:`LazyTraceback <aspreno.LazyTraceback>` rendered by this renderer when first read.
+    Exceptions given back to :py:func:`sys.__excepthook__` are printed from it too, so repeated
+    exceptions do not format their stack again.
     """
-    Store the last exception that has been received.
 
-    .. warning::
-       Because the last exception has been received, it does not mean it has been handled.
+    dispatch_cache_size: int = 256
+    """
+    The maximum amount of exception types whose dispatch plan is kept.
+    Once reached, the oldest plan is dropped to make room for the new one.
+    """
+
+    _routes: typing.ClassVar[typing.Dict[typing.Type[BaseException], str]] = {}
+    """
+    The exception types routed to a method by :py:func:`route`, with the name of the method.
+    """
+
+    guard: Guard
+    """
+    Handles the exceptions raised in a block or by a function, then swallows them.
+    Use ``handler.guard(reraise=True)`` to raise them again once handled, see
+    :py:class:`Guard <aspreno.Guard>`.
     """
 
+    overrun_counts: typing.Counter[str]
+    """How many methods went over their time budget, per exception type name."""
+
+    # The mutable state of each handler is made on first use, see "_LAZY_STATE".
+    _last_exception_var: "contextvars.ContextVar[typing.Optional[typing.Type[BaseException]]]"
+    _dispatch_cache: typing.Dict[typing.Type[BaseException], _DispatchPlan]
+    _tasks: TaskRegistry
+    _added_routes: typing.Dict[typing.Type[BaseException], RouteHandler]
+
+    _exit_registered: bool = False
+    _background_loop: typing.Optional["BackgroundLoop"] = None
+    _watchdog: typing.Optional["Watchdog"] = None
+    _route_index: typing.Optional[TypeIndex[typing.Tuple[RouteHandler, bool]]] = None
+    # The indexes are stored with the list they were compiled from and its size, in one tuple so
+    # threads never see an index with the source of another.
+    _ignore_index: typing.Tuple[typing.Optional[TypeIndex[bool]], typing.Any, int] = (
+        None,
+        None,
+        0,
+    )
+    _budget_index: typing.Tuple[typing.Optional[TypeIndex[float]], typing.Any, int] = (
+        None,
+        None,
+        0,
+    )
+
+    def __init_subclass__(cls, **kwargs: typing.Any) -> None:
+        super().__init_subclass__(**kwargs)
+        routes = dict(cls._routes)
+        for name, attribute in vars(cls).items():
+            for error_type in getattr(attribute, _ROUTES_ATTRIBUTE, ()):
+                routes[error_type] = name
+        cls._routes = routes
+
+    if not typing.TYPE_CHECKING:
+
+        def __getattr__(self, name: str) -> typing.Any:
+            # The state of each handler is made on first use, so subclasses defining their own
+            # "__init__" do not have to call this class' one.
+            factory = _LAZY_STATE.get(name)
+            if factory is None:
+                raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+            return self.__dict__.setdefault(name, factory(self))
+
+    def add_route(self, error_type: typing.Type[BaseException], handler: RouteHandler) -> None:
+        """
+        Route an exception type, and its subclasses, to a callable on this handler only.
+        See :py:func:`route` to declare routes on a subclass.
+
+        Parameters
+        ----------
+        error_type : Type[BaseException]
+            The exception type to route.
+        handler : Callable[..., Any]
+            Called with the exception and the kwargs given to :py:meth:`handle`.
+        """
+        self._added_routes[error_type] = handler
+        self._route_index = None
+
+    def remove_route(self, error_type: typing.Type[BaseException]) -> None:
+        """
+        Remove a route added by :py:meth:`add_route`.
+
+        Parameters
+        ----------
+        error_type : Type[BaseException]
+            The exception type that is not routed anymore.
+        """
+        del self._added_routes[error_type]
+        self._route_index = None
+
+    def get_route(self, error_type: typing.Type[BaseException]) -> typing.Optional[RouteHandler]:
+        """
+        Obtain the callable an exception type is routed to.
+
+        Parameters
+        ----------
+        error_type : Type[BaseException]
+            The exception type.
+
+        Returns
+        -------
+        Callable[..., Any] | None
+            The callable of the closest routed class in the type's MRO, or None if not routed.
+        """
+        found = self._lookup_route(error_type)
+        return found[0] if found else None
+
+    def handle_unrouted(self, error: BaseException, **kwargs: typing.Any) -> None:
+        """
+        Handle an exception as if it had no route: let it self-handle if it defines "handle",
+        or give it back to the previous excepthook.
+
+        Routes call it for the exceptions they do not want to handle themselves. Coroutine
+        "handle" methods are scheduled. Reporting is not affected, as it is done by
+        :py:meth:`handle` once the route returns.
+
+        Parameters
+        ----------
+        error : BaseException
+            The exception given to the route.
+        **kwargs : Any
+            The kwargs given to the route.
+        """
+        handle_call = self._get_self_handle_call(
+            error, self.get_dispatch_plan(type(error)), kwargs
+        )
+        if handle_call is None:
+            self._fall_back(error, kwargs)
+            return
+        method, handle_kwargs, is_coroutine = handle_call
+        if is_coroutine:
+            self._schedule(
+                self._invoke(error, "handle", method, handle_kwargs), type(error), "handle"
+            )
+        else:
+            self._invoke(error, "handle", method, handle_kwargs)
+
+    def _lookup_route(
+        self, error_type: typing.Type[BaseException]
+    ) -> typing.Optional[typing.Tuple[RouteHandler, bool]]:
+        index = self._route_index
+        if index is None:
+            if not self._routes and not self._added_routes:
+                return None
+            handlers: typing.Dict[typing.Type[BaseException], RouteHandler] = {
+                error_type: getattr(self, name) for error_type, name in self._routes.items()
+            }
+            handlers.update(self._added_routes)
+            index = self._route_index = TypeIndex(
+                {
+                    error_type: (handler, iscoroutinefunction(handler))
+                    for error_type, handler in handlers.items()
+                },
+                self.dispatch_cache_size,
+            )
+        return index.lookup(error_type)
+
+    def is_ignored(self, error_type: typing.Type[BaseException]) -> bool:
+        """
+        Indicates if an exception type, or one of its parents, has been set to be ignored.
+
+        Parameters
+        ----------
+        error_type : Type[BaseException]
+            The exception type to check.
+
+        Returns
+        -------
+        bool
+            True if the exception must be ignored, or False if not.
+        """
+        index, compiled_source, compiled_size = self._ignore_index
+        source = self.ignore_errors
+        if index is None or compiled_source is not source or compiled_size != len(source):
+            index = TypeIndex(dict.fromkeys(source, True))
+            self._ignore_index = (index, source, len(source))
+        return index.lookup(error_type) is not None
+
+    def get_dispatch_plan(self, error_type: typing.Type[BaseException]) -> _DispatchPlan:
+        """
+        Obtain how an exception type is dispatched, compiling it if the type is new.
+
+        Parameters
+        ----------
+        error_type : Type[BaseException]
+            The type of the exception to dispatch.
+
+        Returns
+        -------
+        _DispatchPlan
+            The dispatch plan of the exception type.
+        """
+        try:
+            return self._dispatch_cache[error_type]
+        except KeyError:
+            pass
+
+        plan = _DispatchPlan.from_type(error_type)
+        if len(self._dispatch_cache) >= self.dispatch_cache_size:
+            evict_oldest(self._dispatch_cache)
+        self._dispatch_cache[error_type] = plan
+        return plan
+
+    def invalidate_dispatch_cache(
+        self, error_type: typing.Optional[typing.Type[BaseException]] = None
+    ) -> None:
+        """
+        Forget compiled dispatch plans.
+        This must be called after the "handle" or "report" method of a class has been reassigned.
+
+        Parameters
+        ----------
+        error_type : Type[BaseException] | None
+            The exception type to forget. If not given, every plan is forgotten.
+        """
+        if error_type is None:
+            self._dispatch_cache.clear()
+        else:
+            self._dispatch_cache.pop(error_type, None)
+
+    def _schedule(
+        self,
+        coroutine: typing.Coroutine[typing.Any, typing.Any, typing.Any],
+        error_type: typing.Type[BaseException],
+        name: typing.Optional[str] = None,
+    ) -> None:
+        """
+        Run a coroutine in the running event loop, or in the background loop if enabled.
+        The coroutine is tracked until it is done, see :py:meth:`drain`. If a name is given and
+        :py:attr:`metrics` are set, how long the coroutine ran is observed under that name.
+        """
+        # asyncio is only imported once a coroutine has to be run.
+        import asyncio
+
+        launch: typing.Callable[[typing.Any], typing.Any]
+        call_soon: typing.Optional[typing.Callable[..., typing.Any]] = None
+        try:
+            loop = asyncio.get_running_loop()
+            launch, call_soon = loop.create_task, loop.call_soon_threadsafe
+        except RuntimeError:
+            if not self.use_background_loop:
+                coroutine.close()
+                raise NoRunningLoop("no running event loop") from None
+            if self._background_loop is None:
+                from ._loop import BackgroundLoop
+
+                self._background_loop = BackgroundLoop()
+            _log.debug("No running event loop, submitting to the background loop.")
+            launch = self._background_loop.submit
+
+        if name is not None and self.metrics is not None:
+            coroutine = _observed(self.metrics, name, error_type, coroutine)
+
+        self._tasks.submit(
+            coroutine,
+            launch,
+            limit=self.max_pending_tasks,
+            policy=self.task_overflow_policy,
+            max_waiting=self.max_waiting_tasks,
+            call_soon=call_soon,
+        )
+        if self.metrics is not None:
+            self.metrics.increment("scheduled", error_type)
+
+    def get_time_budget(self, error_type: typing.Type[BaseException]) -> typing.Optional[float]:
+        """
+        Obtain the time budget of an exception type, see :py:attr:`time_budgets`.
+
+        Parameters
+        ----------
+        error_type : Type[BaseException]
+            The exception type to check.
+
+        Returns
+        -------
+        float | None
+            How many seconds the synchronous methods of the exception may run, or None if they
+            are not limited.
+        """
+        budgets = self.time_budgets
+        if not budgets:
+            return self.time_budget
+
+        index, compiled_source, compiled_size = self._budget_index
+        if index is None or compiled_source is not budgets or compiled_size != len(budgets):
+            index = TypeIndex(budgets)
+            self._budget_index = (index, budgets, len(budgets))
+        budget = index.lookup(error_type)
+        return self.time_budget if budget is None else budget
+
+    def _call_sync(
+        self,
+        name: str,
+        error: BaseException,
+        method: typing.Callable[..., typing.Any],
+        kwargs: typing.Dict[str, typing.Any],
+    ) -> bool:
+        """
+        Call a synchronous method, timing it and keeping it within its time budget if needed.
+
+        Returns
+        -------
+        bool
+            True if the method has returned, or False if it went over its budget.
+        """
+        budget = None
+        if name == "report" or self.budget_handle:
+            budget = self.get_time_budget(type(error))
+
+        metrics = self.metrics
+        started = time.perf_counter()
+        try:
+            if budget is None:
+                self._invoke(error, name, method, kwargs)
+                return True
+            return self._invoke_within(budget, name, error, method, kwargs)
+        finally:
+            if metrics is not None:
+                metrics.observe(name, type(error), time.perf_counter() - started)
+
+    def _invoke_within(
+        self,
+        budget: float,
+        name: str,
+        error: BaseException,
+        method: typing.Callable[..., typing.Any],
+        kwargs: typing.Dict[str, typing.Any],
+    ) -> bool:
+        """
+        Call a method on the watchdog, and stop waiting for it once its budget is spent.
+        """
+        import concurrent.futures
+
+        if self._watchdog is None:
+            from ._watchdog import Watchdog
+
+            self._watchdog = Watchdog(self.watchdog_workers)
+
+        future = self._watchdog.submit(
+            contextvars.copy_context().run, self._invoke, error, name, method, kwargs
+        )
+        try:
+            future.result(budget)
+        except concurrent.futures.TimeoutError:
+            # A call still waiting for a worker is skipped, a running one is left behind.
+            future.cancel()
+            self.overrun_counts[type(error).__name__] += 1
+            if self.metrics is not None:
+                self.metrics.increment("overrun", type(error))
+            _log.warning(
+                "%s took more than %s seconds to %s, abandoning it.",
+                type(error).__name__,
+                budget,
+                name,
+            )
+            return False
+        return True
+
+    @property
+    def overflow_counts(self) -> typing.Counter[str]:
+        """
+        How many coroutines went over :py:attr:`max_pending_tasks`, by what happened to them:
+        "wait" for those that waited for a free slot, "drop" for those that were dropped.
+        """
+        return self._tasks.overflow_counts
+
+    async def drain(self, timeout: typing.Optional[float] = None) -> bool:
+        """
+        Wait for every coroutine "handle" and "report" method scheduled by this handler.
+
+        Parameters
+        ----------
+        timeout : float | None
+            How many seconds to wait. Wait forever if None.
+
+        Returns
+        -------
+        bool
+            True if every coroutine is done, or False if the timeout has been reached.
+        """
+        return await self._tasks.drain(timeout)
+
+    def shutdown(self, timeout: typing.Optional[float] = None) -> bool:
+        """
+        Wait for the coroutines submitted to the background loop, for the records queued in the
+        report pipeline and for the reports sent to worker processes, then stop them. The
+        occurrences left in the :py:attr:`coalescer` are given to :py:meth:`report_aggregate`.
+        This is done automatically when the interpreter exits, for the handlers that have handled
+        an exception and are still alive.
+
+        Parameters
+        ----------
+        timeout : float | None
+            How many seconds to wait for pending coroutines, records and reports, altogether.
+            Wait forever if None.
+
+        Returns
+        -------
+        bool
+            True if everything pending has finished, or False if some were left behind.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining() -> typing.Optional[float]:
+            return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        if self.coalescer is not None:
+            for report in self.coalescer.collect(force=True):
+                self.report_aggregate(report)
+
+        if self._watchdog is not None:
+            self._watchdog.shutdown()
+
+        done = True
+        if self.process_reporter is not None:
+            done = self.process_reporter.shutdown(timeout=remaining())
+        if self.spool is not None:
+            self.spool.close()
+
+        if self._background_loop is not None:
+            done = self._background_loop.shutdown(remaining()) and done
+        if self.report_pipeline is not None:
+            done = self.report_pipeline.shutdown(remaining()) and done
+        return done
+
+    def _register_exit(self) -> None:
+        """
+        Shut the handler down when the interpreter exits, without keeping it alive until then.
+        """
+        self._exit_registered = True
+        atexit.register(_shutdown_at_exit, weakref.ref(self))
+
+    def _should_send_report(
+        self, error: BaseException, kwargs: typing.Dict[str, typing.Any]
+    ) -> bool:
+        """
+        Indicates if the "report" method of the exception must be called for this occurrence.
+        """
+        coalescer, sampling_policy = self.coalescer, self.sampling_policy
+        if coalescer is None and sampling_policy is None:
+            return True
+
+        capture = kwargs.get("capture")
+        if capture is not None:
+            error_fingerprint = capture.fingerprint
+        else:
+            traceback = kwargs.get("traceback") or error.__traceback__
+            error_fingerprint = fingerprint(type(error), traceback)
+        if sampling_policy is not None and not sampling_policy.sample(error, error_fingerprint):
+            return False
+        if coalescer is None:
+            return True
+
+        report_now = coalescer.observe(error_fingerprint, error)
+        for report in coalescer.collect():
+            self.report_aggregate(report)
+        return report_now
+
+    def report_aggregate(self, report: CoalescedReport) -> None:
+        """
+        Reports the occurrences of an exception that were suppressed by the :py:attr:`coalescer`.
+
+        By default, the "report_aggregate" method of the exception is called with the report if it
+        is defined, otherwise the occurrences are logged.
+
+        Parameters
+        ----------
+        report : CoalescedReport
+            The occurrences of the exception.
+        """
+        method = getattr(report.error, "report_aggregate", None)
+        if method is None:
+            _log.info(
+                "%s occurred %s times between %s and %s.",
+                type(report.error).__name__,
+                report.count,
+                report.first_seen,
+                report.last_seen,
+            )
+        elif iscoroutinefunction(method):
+            self._schedule(method(report), type(report.error))
+        else:
+            method(report)
+
+    @property
+    def _last_exception(self) -> typing.Optional[typing.Type[BaseException]]:
+        """
+        Store the last exception that has been received.
+        Every thread and asyncio task has its own last exception.
+
+        .. warning::
+           Because the last exception has been received, it does not mean it has been handled.
+        """
+        return self._last_exception_var.get()
+
+    @_last_exception.setter
+    def _last_exception(self, error_type: typing.Optional[typing.Type[BaseException]]) -> None:
+        self._last_exception_var.set(error_type)
+
     @property
     def should_report(self) -> bool:
         """
         Indicates if the exception handler should report the error.
-        This is based on the last received exception.
+        This is based on the last exception received in the current thread or asyncio task.
 
         Returns
         -------
         bool
             True if the error should be reported, or False if not.
         """
-        return self._last_exception not in self.ignore_errors
+        return self._last_exception is None or not self.is_ignored(self._last_exception)
 
     def _global_handler(
         self,
         error_type: typing.Type[BaseException],
         value: BaseException,
         traceback: typing.Optional[types.TracebackType],
+        sync_spool: bool = True,
     ) -> None:
-        _log.debug(f"Received new error: {error_type}")
+        _log.debug("Received new error: %s", error_type)
         self._last_exception = error_type
-        if error_type in self.ignore_errors:
+        if self.is_ignored(error_type):
             _log.debug("Ignoring, error has been set to be ignored.")
+            if self.metrics is not None:
+                self.metrics.increment("ignored", error_type)
             return
 
         _log.debug('Now being handed to "handle"')
 
         if iscoroutinefunction(self.handle):
             _log.debug("Async handle method detected, running in async mode.")
-            loop = asyncio.get_running_loop()
-            loop.create_task(self.handle(value, **{"traceback": traceback}))
+            coroutine = self.handle(value, **{"traceback": traceback})
+            self._schedule(coroutine, error_type)  # type: ignore[arg-type]
         else:
             self.handle(value, **{"traceback": traceback})
 
+        # The process is usually about to die, make sure the spooled reports survive it.
+        if sync_spool and self.spool is not None:
+            self.spool.flush()
+
+    def _global_handler_with_fallback(
+        self,
+        error_type: typing.Type[BaseException],
+        value: BaseException,
+        traceback: typing.Optional[types.TracebackType],
+        fallback: typing.Callable[[], typing.Any],
+    ) -> None:
+        # Threads and finalizers rarely run an event loop, do not lose the exception there.
+        if not self.is_ignored(error_type) and self._lacks_loop(value):
+            _log.warning(
+                "No event loop is running to handle %s, giving it back to its hook.",
+                error_type.__name__,
+            )
+            fallback()
+            return
+
+        token = _fallback_hook.set(fallback)
+        try:
+            self._global_handler(error_type, value, traceback)
+        except NoRunningLoop:
+            # The exception has already been partly handled, do not give it to the hook too.
+            _log.warning(
+                "No event loop is running, some coroutines of %s could not be scheduled.",
+                error_type.__name__,
+            )
+        finally:
+            _fallback_hook.reset(token)
+
+    def _lacks_loop(self, error: BaseException) -> bool:
+        """
+        Indicates if handling an exception would schedule coroutines, but nothing can run them.
+        """
+        if self.use_background_loop or not (
+            iscoroutinefunction(self.handle) or self._needs_loop(error)
+        ):
+            return False
+        # There cannot be a running loop if asyncio has not been imported yet.
+        asyncio = sys.modules.get("asyncio")
+        if asyncio is None:
+            return True
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return True
+        return False
+
+    def _needs_loop(self, error: BaseException) -> bool:
+        """
+        Indicates if the default handling of an exception schedules coroutines.
+        """
+        plan = self.get_dispatch_plan(type(error))
+        found_route = self._lookup_route(type(error))
+        if found_route is not None:
+            return found_route[1] or plan.report_is_coroutine
+        if plan.is_group:
+            members = error.exceptions  # type: ignore[attr-defined]
+            return any(self._needs_loop(member) for member in members)
+        return plan.handle_is_coroutine or plan.report_is_coroutine
+
+    def _threading_excepthook(self, args: "threading.ExceptHookArgs") -> None:
+        import threading
+
+        previous = self.old_threading_excepthook or threading.__excepthook__
+        # Like the default hook, let threads exit silently.
+        if args.exc_value is None or issubclass(args.exc_type, SystemExit):
+            previous(args)
+            return
+        self._global_handler_with_fallback(
+            args.exc_type, args.exc_value, args.exc_traceback, functools.partial(previous, args)
+        )
+
+    def _unraisablehook(self, unraisable: typing.Any) -> None:
+        previous = self.old_unraisablehook or sys.__unraisablehook__
+        if unraisable.exc_value is None:
+            previous(unraisable)
+            return
+        self._global_handler_with_fallback(
+            unraisable.exc_type,
+            unraisable.exc_value,
+            unraisable.exc_traceback,
+            functools.partial(previous, unraisable),
+        )
+
+    def _loop_exception_handler(
+        self, loop: "asyncio.AbstractEventLoop", context: typing.Dict[str, typing.Any]
+    ) -> None:
+        previous = self.old_loop_exception_handler
+        fallback = (
+            functools.partial(previous, loop, context)
+            if previous
+            else functools.partial(loop.default_exception_handler, context)
+        )
+        error = context.get("exception")
+        if error is None:
+            fallback()
+            return
+        self._global_handler_with_fallback(type(error), error, error.__traceback__, fallback)
+
+    async def arelay(self, timeout: typing.Optional[float] = None) -> RelayOutcome:
+        """
+        Handle the error being caught, and wait until it has been handled and reported.
+
+        Coroutine "handle" and "report" methods run concurrently. Those still running once the
+        deadline is reached are cancelled.
+
+        Parameters
+        ----------
+        timeout : float | None
+            How many seconds to wait. Defaults to :py:attr:`relay_timeout`.
+
+        Returns
+        -------
+        RelayOutcome
+            What happened to the exception.
+        """
+        error_type, error, traceback = sys.exc_info()
+        if error_type is None or error is None:
+            raise RuntimeError("No exceptions have been caught.")
+
+        _log.debug("Received new error: %s", error_type)
+        self._last_exception = error_type
+        if self.is_ignored(error_type):
+            _log.debug("Ignoring, error has been set to be ignored.")
+            outcome = RelayOutcome(error)
+            outcome.ignored = True
+            return outcome
+
+        return await self.ahandle(
+            error, timeout=self.relay_timeout if timeout is None else timeout, traceback=traceback
+        )
+
+    async def ahandle(
+        self, error: BaseException, timeout: typing.Optional[float] = None, **kwargs: typing.Any
+    ) -> RelayOutcome:
+        """
+        Handles an exception, waiting for coroutine methods to be done.
+
+        Parameters
+        ----------
+        error : BaseException
+            The exception that was raised.
+        timeout : float | None
+            How many seconds to wait for coroutine methods. Wait forever if None.
+        **kwargs : Any
+            Additional arguments that will be passed to the handle method.
+
+        Returns
+        -------
+        RelayOutcome
+            What happened to the exception.
+        """
+        import asyncio
+
+        outcome = RelayOutcome(error)
+        if not self._exit_registered:
+            self._register_exit()
+
+        # A subclass that overrides "handle" decides on its own how exceptions are handled.
+        if type(self).handle is not ExceptionHandler.handle:
+            try:
+                result = self.handle(error, **kwargs)
+                if result is not None:
+                    await asyncio.wait_for(result, timeout)
+                outcome.handled = True
+            except asyncio.TimeoutError:
+                outcome.timed_out = True
+            except Exception as exception:
+                outcome.failures.append(exception)
+            return outcome
+
+        plan = self.get_dispatch_plan(type(error))
+        if plan.is_group and self._lookup_route(type(error)) is None:
+            return await self._ahandle_group(error, timeout, kwargs)
+        if self.capture_records or self.clear_frames:
+            self._capture(error, kwargs)
+        if self.heavy_hitters is not None or self.shared_counters is not None:
+            self._count(error, kwargs)
+        if self.traceback_renderer is not None:
+            kwargs["formatted_traceback"] = self.traceback_renderer.lazy(
+                error, kwargs.get("traceback")
+            )
+        pending: typing.Dict["asyncio.Future[typing.Any]", str] = {}
+
+        def run(
+            name: str,
+            method: typing.Callable[..., typing.Any],
+            kwargs: typing.Dict[str, typing.Any],
+            is_coroutine: bool,
+        ) -> None:
+            try:
+                if is_coroutine:
+                    coroutine = self._invoke(error, name, method, kwargs)
+                    if self.metrics is not None:
+                        coroutine = _observed(self.metrics, name, type(error), coroutine)
+                    pending[asyncio.ensure_future(coroutine)] = name
+                    return
+                completed = self._call_sync(name, error, method, kwargs)
+            except Exception as exception:
+                outcome.failures.append(exception)
+                return
+            if not completed:
+                outcome.timed_out = True
+            elif name == "handle":
+                outcome.handled = True
+            else:
+                outcome.reported = True
+
+        handle_call = self._get_handle_call(error, plan, kwargs)
+        if handle_call is None:
+            self._fall_back(error, kwargs)
+        else:
+            run("handle", *handle_call)
+
+        report_kwargs = self._get_report_kwargs(error, plan, kwargs)
+        if report_kwargs is not None:
+            report, _ = self._get_report_method(error, plan, report_kwargs)
+            run("report", report, report_kwargs, plan.report_is_coroutine)
+
+        if not pending:
+            return outcome
+
+        done, not_done = await asyncio.wait(pending, timeout=timeout)
+        for task in not_done:
+            _log.warning(
+                "%s took too long to %s, cancelling it.", type(error).__name__, pending[task]
+            )
+            task.cancel()
+            outcome.timed_out = True
+        for task in done:
+            failure = task.exception()
+            if failure is not None:
+                outcome.failures.append(failure)
+            elif pending[task] == "handle":
+                outcome.handled = True
+            else:
+                outcome.reported = True
+        return outcome
+
     def relay(self) -> None:
         """
         Manually attempt to handle an error by calling this method.
@@ -102,7 +1275,7 @@ class ExceptionHandler:
         if exceptions_info[0] is None:
             raise RuntimeError("No exceptions have been caught.")
 
-        self._global_handler(*exceptions_info)
+        self._global_handler(*exceptions_info, sync_spool=False)
 
     def handle(
         self, error: BaseException, **kwargs: typing.Any
@@ -124,77 +1297,363 @@ class ExceptionHandler:
             If the handle method is async, a coroutine is returned.
         """
         _log.debug(
-            f"{error.__class__.__name__} is being treated by the default's Aspreno handler."
+            "%s is being treated by the default's Aspreno handler.", error.__class__.__name__
         )
-        handled = False
+        if not self._exit_registered:
+            self._register_exit()
+        metrics = self.metrics
+        plan = self.get_dispatch_plan(type(error))
+        if plan.is_group and self._lookup_route(type(error)) is None:
+            self._handle_group(error, kwargs)
+            return None
+        if self.capture_records or self.clear_frames:
+            self._capture(error, kwargs)
+        if self.heavy_hitters is not None or self.shared_counters is not None:
+            self._count(error, kwargs)
+        if self.traceback_renderer is not None:
+            kwargs["formatted_traceback"] = self.traceback_renderer.lazy(
+                error, kwargs.get("traceback")
+            )
 
-        # Attempt to call "handle" if available
-        if hasattr(error, "handle"):
-            _log.info(f"{error.__class__.__name__} has defined handle, letting it self-handle.")
-            handle_kwargs = kwargs.copy()
+        # Let the routed method, or the exception itself, handle the exception.
+        handle_call = self._get_handle_call(error, plan, kwargs)
+        if handle_call is None:
+            # In case the exception does not have a handle method, call the default excepthook.
+            self._fall_back(error, kwargs)
+        else:
+            method, handle_kwargs, is_coroutine = handle_call
+            if is_coroutine:
+                self._schedule(
+                    self._invoke(error, "handle", method, handle_kwargs), type(error), "handle"
+                )
+            elif metrics is None and not self.budget_handle:
+                self._invoke(error, "handle", method, handle_kwargs)
+            else:
+                self._call_sync("handle", error, method, handle_kwargs)
 
-            # Detect if the raised exception is an argumented exception.
-            if isinstance(error, ArgumentedException):
-                _log.debug("This is an ArgumentedException, obtaining additional kwargs.")
-                # Obtain kwargs for the handle method.
-                additional_kwargs = error.get_kwargs_for_handle()
+        # Report exception
+        report_kwargs = self._get_report_kwargs(error, plan, kwargs)
+        if report_kwargs is not None:
+            report, acknowledge = self._get_report_method(error, plan, report_kwargs)
+            if plan.report_is_coroutine:
+                self._schedule(
+                    self._invoke(error, "report", report, report_kwargs), type(error), "report"
+                )
+            elif self.process_reporter is not None and self.process_reporter.submit(
+                error, report_kwargs, acknowledge
+            ):
+                pass
+            elif self.report_pipeline is not None:
+                from .pipeline import ReportRecord
 
-                # Merge kwargs together
-                handle_kwargs.update(additional_kwargs)
+                self.report_pipeline.submit(ReportRecord(error, report_kwargs, acknowledge))
+            elif metrics is None and self.time_budget is None and not self.time_budgets:
+                self._invoke(error, "report", report, report_kwargs)
+            else:
+                self._call_sync("report", error, report, report_kwargs)
 
-            try:
-                _log.debug("Final kwargs for handle: %s", handle_kwargs)
-                if iscoroutinefunction(error.handle):
-                    event_loop = asyncio.get_running_loop()
-                    event_loop.create_task(error.handle(**handle_kwargs))
-                else:
-                    f = error.handle(**handle_kwargs)
-                handled = True
-            except TypeError as exception:
-                # In case the exception has removed "**kwargs" in its signature, raise a new
-                # exception to alert of this issue. Else raise the original exception.
-                if str(exception).endswith("got an unexpected keyword argument 'traceback'"):
-                    raise TypeError(
-                        f"'{error.__class__.__name__}' does not allow kwargs in the 'handle' method."
-                    ) from exception
-                raise exception  # pragma:  no cover
-
-        # In case the exception does not have a handle method, call the default excepthook.
-        if not handled:
-            # Obtain traceback
-            traceback = kwargs.get("traceback") or getattr(sys, "last_traceback", None)
-
-            # Return to the original excepthook.
-            if self.old_excepthook:
-                _log.debug("Passing error to custom excepthook.")
-                self.old_excepthook(type(error), error, traceback)
-            else:  # pragma: no cover
-                _log.debug("Passing error to sys.__excepthook__.")
-                sys.__excepthook__(type(error), error, traceback)
+        return None
 
-        # Report exception
-        if getattr(error, "report", None):
-            _log.info(f"{error.__class__.__name__} has defined report, letting it report.")
+    def _capture(self, error: BaseException, kwargs: typing.Dict[str, typing.Any]) -> None:
+        """
+        Add the capture record of an exception to its kwargs, then clear its frames if needed.
+        """
+        from .capture import CaptureRecord, clear_frames
 
-            report_kwargs = kwargs.copy()
-            if isinstance(error, ArgumentedException):
-                _log.debug("This is an ArgumentedException, obtaining additional kwargs.")
-                additional_kwargs = error.get_kwargs_for_report()
+        traceback = kwargs.get("traceback") or error.__traceback__
+        kwargs["capture"] = CaptureRecord.from_exception(error, traceback)
+        if self.clear_frames:
+            clear_frames(traceback)
 
-                report_kwargs.update(additional_kwargs)
+    def get_group_members(self, group: BaseException) -> typing.List[BaseException]:
+        """
+        Obtain the members of an exception group, flattening the nested groups.
+        Nested groups that handle or report themselves are kept as members.
 
-            try:
-                _log.debug("Final kwargs for report: %s", report_kwargs)
-                if iscoroutinefunction(error.report):
-                    loop = asyncio.get_running_loop()
-                    loop.create_task(error.report(**report_kwargs))
-                else:
-                    error.report(**report_kwargs)
-            except TypeError as exception:
-                if str(exception).endswith("got an unexpected keyword argument 'traceback'"):
-                    raise TypeError(
-                        f"'{error.__class__.__name__}' does not allow kwargs in the 'report' method."
-                    ) from exception
-                raise exception  # pragma: no cover
+        Parameters
+        ----------
+        group : BaseExceptionGroup
+            The exception group.
 
-        return None
+        Returns
+        -------
+        List[BaseException]
+            The members, in the order they appear in the group.
+        """
+        members: typing.List[BaseException] = []
+        for member in group.exceptions:
+            if self.get_dispatch_plan(type(member)).is_group:
+                members.extend(self.get_group_members(member))
+            else:
+                members.append(member)
+        return members
+
+    def _is_dispatched(self, member: BaseException) -> bool:
+        """
+        Indicates if a member of an exception group is routed, handles or reports itself.
+        """
+        plan = self.get_dispatch_plan(type(member))
+        return plan.has_handle or plan.has_report or self._lookup_route(type(member)) is not None
+
+    def _get_member_kwargs(
+        self, member: BaseException, kwargs: typing.Dict[str, typing.Any]
+    ) -> typing.Dict[str, typing.Any]:
+        # Members carry their own traceback, from where they were raised to the group.
+        return {**kwargs, "traceback": member.__traceback__}
+
+    def _handle_group(self, group: BaseException, kwargs: typing.Dict[str, typing.Any]) -> None:
+        """
+        Handle every member of an exception group, even if some fail.
+        Coroutine methods of the members are scheduled, so they run concurrently. If members are
+        left unhandled, the whole group is given to the previous hook, once.
+
+        Raises
+        ------
+        BaseExceptionGroup
+            The exceptions raised while handling members, if any.
+        """
+        _log.debug("%s is an exception group, handling its members.", type(group).__name__)
+        failures: typing.List[Exception] = []
+        deferred = _DeferredFallbacks()
+        token = _deferred_fallbacks.set(deferred)
+        try:
+            for member in self.get_group_members(group):
+                if self.is_ignored(type(member)):
+                    continue
+                if not self._is_dispatched(member):
+                    deferred.errors.append(member)
+                    continue
+                try:
+                    self.handle(member, **self._get_member_kwargs(member, kwargs))
+                except Exception as exception:
+                    failures.append(exception)
+        finally:
+            deferred.closed = True
+            _deferred_fallbacks.reset(token)
+
+        if deferred.errors:
+            self._fall_back(group, kwargs)
+        if failures:
+            raise _ExceptionGroup(
+                f"Failed to handle {len(failures)} members of {type(group).__name__}.", failures
+            )
+
+    async def _ahandle_group(
+        self,
+        group: BaseException,
+        timeout: typing.Optional[float],
+        kwargs: typing.Dict[str, typing.Any],
+    ) -> RelayOutcome:
+        """
+        Handle every member of an exception group concurrently, see :py:meth:`ahandle`.
+        """
+        import asyncio
+
+        deferred = _DeferredFallbacks()
+
+        async def member_outcome(member: BaseException) -> RelayOutcome:
+            if self.is_ignored(type(member)):
+                outcome = RelayOutcome(member)
+                outcome.ignored = True
+                return outcome
+            if not self._is_dispatched(member):
+                deferred.errors.append(member)
+                return RelayOutcome(member)
+            return await self.ahandle(member, timeout, **self._get_member_kwargs(member, kwargs))
+
+        # The tasks of the members copy the context, so they all see the deferred fallbacks.
+        token = _deferred_fallbacks.set(deferred)
+        try:
+            outcomes = await asyncio.gather(
+                *(member_outcome(member) for member in self.get_group_members(group))
+            )
+        finally:
+            deferred.closed = True
+            _deferred_fallbacks.reset(token)
+
+        if deferred.errors:
+            self._fall_back(group, kwargs)
+        return RelayOutcome.aggregate(group, list(outcomes))
+
+    def _count(self, error: BaseException, kwargs: typing.Dict[str, typing.Any]) -> None:
+        """
+        Count an exception in the :py:attr:`heavy_hitters` and :py:attr:`shared_counters`.
+        """
+        capture = kwargs.get("capture")
+        if capture is not None:
+            type_name = capture.type_name
+        else:
+            error_type = type(error)
+            type_name = f"{error_type.__module__}.{error_type.__qualname__}"
+
+        if self.shared_counters is not None:
+            self.shared_counters.increment(type_name)
+        if self.heavy_hitters is not None:
+            if capture is not None:
+                error_fingerprint = capture.fingerprint
+            else:
+                traceback = kwargs.get("traceback") or error.__traceback__
+                error_fingerprint = fingerprint(type(error), traceback)
+            self.heavy_hitters.add(type_name, error_fingerprint)
+
+    def _get_handle_call(
+        self, error: BaseException, plan: _DispatchPlan, kwargs: typing.Dict[str, typing.Any]
+    ) -> typing.Optional[
+        typing.Tuple[typing.Callable[..., typing.Any], typing.Dict[str, typing.Any], bool]
+    ]:
+        """
+        Obtain what handles an exception: its route, its "handle" method, or nothing.
+
+        Returns
+        -------
+        Tuple[Callable[..., Any], Dict[str, Any], bool] | None
+            The callable, its kwargs and whether it is a coroutine function, or None if the
+            exception must be given to the previous excepthook.
+        """
+        found_route = self._lookup_route(type(error))
+        if found_route is not None:
+            _log.debug("%s is routed to %r.", error.__class__.__name__, found_route[0])
+            route_handler, route_is_coroutine = found_route
+            return functools.partial(route_handler, error), kwargs, route_is_coroutine
+        return self._get_self_handle_call(error, plan, kwargs)
+
+    def _get_self_handle_call(
+        self, error: BaseException, plan: _DispatchPlan, kwargs: typing.Dict[str, typing.Any]
+    ) -> typing.Optional[
+        typing.Tuple[typing.Callable[..., typing.Any], typing.Dict[str, typing.Any], bool]
+    ]:
+        """
+        Obtain the "handle" method of an exception with its kwargs, ignoring routes.
+        """
+        if not plan.has_handle:
+            return None
+
+        _log.info("%s has defined handle, letting it self-handle.", error.__class__.__name__)
+        handle_kwargs = kwargs.copy()
+
+        # Detect if the raised exception is an argumented exception.
+        if plan.is_argumented:
+            _log.debug("This is an ArgumentedException, obtaining additional kwargs.")
+            # Merge the kwargs for the handle method together
+            handle_kwargs.update(error.get_kwargs_for_handle())
+
+        _log.debug("Final kwargs for handle: %s", handle_kwargs)
+        return error.handle, handle_kwargs, plan.handle_is_coroutine
+
+    def _get_report_kwargs(
+        self, error: BaseException, plan: _DispatchPlan, kwargs: typing.Dict[str, typing.Any]
+    ) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        """
+        Obtain the kwargs of the "report" method of an exception, or None if it must not report.
+        """
+        if not plan.has_report or not self._should_send_report(error, kwargs):
+            return None
+
+        _log.info("%s has defined report, letting it report.", error.__class__.__name__)
+        report_kwargs = kwargs.copy()
+        if plan.is_argumented:
+            _log.debug("This is an ArgumentedException, obtaining additional kwargs.")
+            report_kwargs.update(error.get_kwargs_for_report())
+
+        _log.debug("Final kwargs for report: %s", report_kwargs)
+        return report_kwargs
+
+    def _get_report_method(
+        self, error: BaseException, plan: _DispatchPlan, kwargs: typing.Dict[str, typing.Any]
+    ) -> typing.Tuple[
+        typing.Callable[..., typing.Any], typing.Optional[typing.Callable[[], typing.Any]]
+    ]:
+        """
+        Obtain the "report" method of an exception, writing the report to the :py:attr:`spool`
+        first if set.
+
+        Returns
+        -------
+        Tuple[Callable[..., Any], Callable[[], Any] | None]
+            The method, acknowledging the spooled report once it returns, and the acknowledgement
+            itself for reports made elsewhere. None if the report has not been spooled.
+        """
+        spool = self.spool
+        acknowledge = None if spool is None else spool.append(error, kwargs)
+        if acknowledge is None:
+            return error.report, None
+        return _acknowledged(error.report, acknowledge, plan.report_is_coroutine), acknowledge
+
+    def _invoke(
+        self,
+        error: BaseException,
+        name: str,
+        method: typing.Callable[..., typing.Any],
+        kwargs: typing.Dict[str, typing.Any],
+    ) -> typing.Any:
+        try:
+            return method(**kwargs)
+        except TypeError as exception:
+            # In case the exception has removed "**kwargs" in its signature, raise a new
+            # exception to alert of this issue. Else raise the original exception.
+            if str(exception).endswith("got an unexpected keyword argument 'traceback'"):
+                raise TypeError(
+                    f"'{error.__class__.__name__}' does not allow kwargs in the '{name}' method."
+                ) from exception
+            raise exception
+
+    def _fall_back(self, error: BaseException, kwargs: typing.Dict[str, typing.Any]) -> None:
+        deferred = _deferred_fallbacks.get()
+        if deferred is not None and not deferred.closed:
+            deferred.errors.append(error)
+            return
+
+        # Obtain traceback
+        traceback = kwargs.get("traceback") or getattr(sys, "last_traceback", None)
+
+        if self.metrics is not None:
+            self.metrics.increment("fallback", type(error))
+
+        # Return to the original excepthook.
+        fallback = _fallback_hook.get()
+        if fallback is not None:
+            _log.debug("Passing error to the hook it comes from.")
+            fallback()
+        elif self.old_excepthook and self.old_excepthook is not sys.__excepthook__:
+            _log.debug("Passing error to custom excepthook.")
+            self.old_excepthook(type(error), error, traceback)
+        elif "formatted_traceback" in kwargs:
+            _log.debug("Printing the rendered traceback, like sys.__excepthook__.")
+            if sys.stderr is not None:
+                sys.stderr.write(kwargs["formatted_traceback"].text)
+                sys.stderr.flush()
+        else:  # pragma: no cover
+            _log.debug("Passing error to sys.__excepthook__.")
+            sys.__excepthook__(type(error), error, traceback)
+
+
+async def _observed(
+    metrics: "MetricsHook",
+    name: str,
+    error_type: typing.Type[BaseException],
+    coroutine: typing.Coroutine[typing.Any, typing.Any, typing.Any],
+) -> typing.Any:
+    started = time.perf_counter()
+    try:
+        return await coroutine
+    finally:
+        metrics.observe(name, error_type, time.perf_counter() - started)
+
+
+def _shutdown_at_exit(reference: "weakref.ref[ExceptionHandler]") -> None:
+    handler = reference()
+    if handler is not None:
+        handler.shutdown(5.0)
+
+
+_LAZY_STATE: typing.Dict[str, typing.Callable[[ExceptionHandler], typing.Any]] = {
+    "_last_exception_var": lambda handler: contextvars.ContextVar(
+        f"aspreno_last_exception_{id(handler)}", default=None
+    ),
+    "_dispatch_cache": lambda handler: {},
+    "_tasks": lambda handler: TaskRegistry(),
+    "_added_routes": lambda handler: {},
+    "overrun_counts": lambda handler: collections.Counter(),
+    "guard": Guard,
+}
+"""Makes the state of a handler, by attribute name, the first time it is used."""
@@ -0,0 +1,143 @@
+import functools
+import types
+import typing
+
+from ._utils import NoRunningLoop, iscoroutinefunction
+from ._utils import log as _log
+
+if typing.TYPE_CHECKING:
+    from .global_handler import ExceptionHandler
+
+F = typing.TypeVar("F", bound=typing.Callable[..., typing.Any])
+
+
+class Guard:
+    """
+    Gives the exceptions raised in a block, or by a function, to an exception handler.
+
+    A guard is used as a context manager, ``with handler.guard:`` or
+    ``async with handler.guard:``, or as a decorator, ``@handler.guard``, on functions and
+    coroutine functions. Every handler owns its guards, which are reused by every block, so
+    nothing is allocated when no exception is raised, apart from the coroutine of
+    ``async with``.
+
+    Only :py:class:`Exception` subclasses are caught, so cancellations and interruptions go
+    through. Once handled, exceptions are swallowed, or re-raised by the guard obtained with
+    ``handler.guard(reraise=True)``.
+    """
+
+    __slots__ = ("handler", "reraise", "_other")
+
+    handler: "ExceptionHandler"
+    """The handler exceptions are given to."""
+
+    reraise: bool
+    """Whether exceptions are raised again once handled."""
+
+    def __init__(
+        self,
+        handler: "ExceptionHandler",
+        reraise: bool = False,
+        other: typing.Optional["Guard"] = None,
+    ) -> None:
+        self.handler = handler
+        self.reraise = reraise
+        self._other = other if other is not None else Guard(handler, not reraise, self)
+
+    def __repr__(self) -> str:
+        return f"<Guard handler={self.handler!r} reraise={self.reraise}>"
+
+    def _dispatch(
+        self, error: BaseException, traceback: typing.Optional[types.TracebackType]
+    ) -> bool:
+        try:
+            self.handler._global_handler(type(error), error, traceback, sync_spool=False)
+        except NoRunningLoop:
+            # Do not replace the guarded exception by the handler's own failure.
+            _log.warning(
+                "No event loop is running, some coroutines of %s could not be scheduled.",
+                type(error).__name__,
+            )
+        return not self.reraise
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(
+        self,
+        error_type: typing.Optional[typing.Type[BaseException]],
+        error: typing.Optional[BaseException],
+        traceback: typing.Optional[types.TracebackType],
+    ) -> bool:
+        if error is None or not isinstance(error, Exception):
+            return False
+        return self._dispatch(error, traceback)
+
+    async def __aenter__(self) -> None:
+        return None
+
+    async def __aexit__(
+        self,
+        error_type: typing.Optional[typing.Type[BaseException]],
+        error: typing.Optional[BaseException],
+        traceback: typing.Optional[types.TracebackType],
+    ) -> bool:
+        if error is None or not isinstance(error, Exception):
+            return False
+        return self._dispatch(error, traceback)
+
+    @typing.overload
+    def __call__(self, function: F) -> F: ...
+
+    @typing.overload
+    def __call__(self, *, reraise: bool) -> "Guard": ...
+
+    def __call__(
+        self,
+        function: typing.Optional[F] = None,
+        *,
+        reraise: typing.Optional[bool] = None,
+    ) -> typing.Union[F, "Guard"]:
+        """
+        Wrap a function, or obtain the guard with the given option.
+
+        Parameters
+        ----------
+        function : Callable[..., Any] | None
+            The function or coroutine function to guard.
+        reraise : bool | None
+            Whether the exceptions must be raised again once handled.
+
+        Returns
+        -------
+        Callable[..., Any] | Guard
+            The guarded function if one is given, otherwise the guard.
+        """
+        if function is None:
+            return self if reraise is None or reraise is self.reraise else self._other
+
+        dispatch = self._dispatch
+
+        if iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def guarded_coroutine(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+                try:
+                    return await function(*args, **kwargs)
+                except Exception as error:
+                    if not dispatch(error, error.__traceback__):
+                        raise
+                    return None
+
+            return typing.cast(F, guarded_coroutine)
+
+        @functools.wraps(function)
+        def guarded(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            try:
+                return function(*args, **kwargs)
+            except Exception as error:
+                if not dispatch(error, error.__traceback__):
+                    raise
+                return None
+
+        return typing.cast(F, guarded)
@@ -0,0 +1,154 @@
+import threading
+import typing
+
+Key = typing.Tuple[str, int]
+"""An exception type name, and a fingerprint."""
+
+
+class HeavyHitter(typing.NamedTuple):
+    """
+    An estimation of how many times an exception occurred.
+    """
+
+    type_name: str
+    fingerprint: int
+    occurrences: int
+    """The estimated amount of occurrences. It is never below the actual amount."""
+    error: int
+    """How much ``occurrences`` may be above the actual amount."""
+
+
+class HeavyHitters:
+    """
+    Estimates the most frequent exceptions in fixed memory, using the Space-Saving algorithm.
+
+    At most ``capacity`` exceptions are counted. When a new exception occurs and every counter is
+    taken, it replaces the least frequent exception and inherits its count, which becomes the
+    error of the estimation. Any exception occurring more than ``total / capacity`` times is
+    guaranteed to be counted.
+
+    Parameters
+    ----------
+    capacity : int
+        How many exceptions are counted at once.
+    """
+
+    def __init__(self, capacity: int = 128) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.capacity = capacity
+        self.total = 0
+        """How many occurrences have been added."""
+
+        self._lock = threading.Lock()
+        self._counters: typing.Dict[Key, typing.List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def add(self, type_name: str, fingerprint: int, count: int = 1) -> None:
+        """
+        Count occurrences of an exception.
+
+        Parameters
+        ----------
+        type_name : str
+            The name of the exception type.
+        fingerprint : int
+            The fingerprint of the exception, see :py:func:`aspreno.fingerprint`.
+        count : int
+            How many times the exception occurred.
+        """
+        key = (type_name, fingerprint)
+        with self._lock:
+            self.total += count
+            counter = self._counters.get(key)
+            if counter is not None:
+                counter[0] += count
+            elif len(self._counters) < self.capacity:
+                self._counters[key] = [count, 0]
+            else:
+                # Finding the minimum is linear, but only happens for exceptions not counted yet.
+                evicted = min(self._counters, key=lambda item: self._counters[item][0])
+                minimum = self._counters.pop(evicted)[0]
+                self._counters[key] = [minimum + count, minimum]
+
+    def top(self, n: int = 10) -> typing.List[HeavyHitter]:
+        """
+        Obtain the most frequent exceptions.
+
+        Parameters
+        ----------
+        n : int
+            How many exceptions to give back.
+
+        Returns
+        -------
+        List[HeavyHitter]
+            The most frequent exceptions, the most frequent first.
+        """
+        with self._lock:
+            items = [
+                HeavyHitter(type_name, fingerprint, count, error)
+                for (type_name, fingerprint), (count, error) in self._counters.items()
+            ]
+        items.sort(key=lambda item: item.occurrences, reverse=True)
+        return items[:n]
+
+    def snapshot(self) -> typing.Dict[str, typing.Any]:
+        """
+        Obtain the state of the counters, so they can be sent elsewhere and merged.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The capacity, the total and the counters, made of lists, strings and integers only.
+        """
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "total": self.total,
+                "counters": [
+                    [type_name, fingerprint, count, error]
+                    for (type_name, fingerprint), (count, error) in self._counters.items()
+                ],
+            }
+
+    def merge(self, snapshot: typing.Dict[str, typing.Any]) -> None:
+        """
+        Add the counters of another instance, such as the one of another worker process.
+
+        An exception missing from one side may still have occurred there up to that side's
+        smallest count, which is added to its count and error when that side is full. Only the
+        ``capacity`` largest counters are kept afterwards.
+
+        Parameters
+        ----------
+        snapshot : Dict[str, Any]
+            The snapshot of the other instance, see :py:meth:`snapshot`.
+        """
+        theirs: typing.Dict[Key, typing.List[int]] = {
+            (type_name, fingerprint): [count, error]
+            for type_name, fingerprint, count, error in snapshot["counters"]
+        }
+        their_floor = (
+            min(count for count, _ in theirs.values())
+            if len(theirs) >= snapshot["capacity"]
+            else 0
+        )
+
+        with self._lock:
+            our_floor = (
+                min(count for count, _ in self._counters.values())
+                if len(self._counters) >= self.capacity
+                else 0
+            )
+            merged: typing.Dict[Key, typing.List[int]] = {}
+            for key in self._counters.keys() | theirs.keys():
+                ours = self._counters.get(key, [our_floor, our_floor])
+                other = theirs.get(key, [their_floor, their_floor])
+                merged[key] = [ours[0] + other[0], ours[1] + other[1]]
+
+            kept = sorted(merged, key=lambda key: merged[key][0], reverse=True)[: self.capacity]
+            self._counters = {key: merged[key] for key in kept}
+            self.total += snapshot["total"]
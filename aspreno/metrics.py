@@ -0,0 +1,173 @@
+import bisect
+import collections
+import threading
+import typing
+
+DEFAULT_BUCKETS: typing.Tuple[float, ...] = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+)
+"""The default upper bounds of histogram buckets, in seconds."""
+
+
+class MetricsHook:
+    """
+    Receives measurements from an :py:class:`ExceptionHandler <aspreno.ExceptionHandler>`.
+
+    This base class ignores everything. Handlers without metrics do not call it at all.
+
+    The measurements are:
+
+    - Latencies: "handle" and "report", how long the exception's methods took.
+    - Counters: "ignored", the exception was set to be ignored; "fallback", the exception was
+      given to the previous excepthook; "scheduled", a coroutine has been scheduled; "overrun", a
+      method went over its time budget.
+    """
+
+    def observe(self, name: str, error_type: type, seconds: float) -> None:
+        """
+        Record a latency.
+
+        Parameters
+        ----------
+        name : str
+            The name of the measurement.
+        error_type : type
+            The type of the exception being handled.
+        seconds : float
+            The measured duration.
+        """
+
+    def increment(self, name: str, error_type: type) -> None:
+        """
+        Increment a counter.
+
+        Parameters
+        ----------
+        name : str
+            The name of the counter.
+        error_type : type
+            The type of the exception being handled.
+        """
+
+
+class Histogram:
+    """
+    A cumulative histogram of latencies.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: typing.Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        """How many values fell in each bucket, the last one being above every bound."""
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        cumulative: typing.Dict[str, int] = {}
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            cumulative[str(bound) if bound != float("inf") else "+Inf"] = total
+        return {"count": self.count, "sum": self.sum, "buckets": cumulative}
+
+
+class InMemoryMetrics(MetricsHook):
+    """
+    Keeps counters and latency histograms in memory, keyed by measurement and exception type.
+
+    Parameters
+    ----------
+    buckets : Sequence[float]
+        The upper bounds of the histogram buckets, in seconds.
+    """
+
+    def __init__(self, buckets: typing.Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: typing.Counter[typing.Tuple[str, str]] = collections.Counter()
+        self._histograms: typing.Dict[typing.Tuple[str, str], Histogram] = {}
+
+    def observe(self, name: str, error_type: type, seconds: float) -> None:
+        key = (name, error_type.__name__)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def increment(self, name: str, error_type: type) -> None:
+        with self._lock:
+            self._counters[(name, error_type.__name__)] += 1
+
+    def snapshot(self) -> typing.Dict[str, typing.Dict[str, typing.Dict[str, typing.Any]]]:
+        """
+        Obtain the current measurements.
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            Counters under "counters" and histograms under "latencies", both keyed by measurement
+            name, then by exception type name.
+        """
+        snapshot: typing.Dict[str, typing.Dict[str, typing.Dict[str, typing.Any]]] = {
+            "counters": {},
+            "latencies": {},
+        }
+        with self._lock:
+            for (name, type_name), value in self._counters.items():
+                snapshot["counters"].setdefault(name, {})[type_name] = value
+            for (name, type_name), histogram in self._histograms.items():
+                snapshot["latencies"].setdefault(name, {})[type_name] = histogram.to_dict()
+        return snapshot
+
+    def to_prometheus(self, prefix: str = "aspreno") -> str:
+        """
+        Render the current measurements in the Prometheus text exposition format.
+
+        Parameters
+        ----------
+        prefix : str
+            The prefix of every metric name.
+
+        Returns
+        -------
+        str
+            The rendered metrics.
+        """
+        snapshot = self.snapshot()
+        lines: typing.List[str] = []
+
+        for name, values in sorted(snapshot["counters"].items()):
+            metric = f"{prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for type_name, value in sorted(values.items()):
+                lines.append(f'{metric}{{exception="{type_name}"}} {value}')
+
+        for name, values in sorted(snapshot["latencies"].items()):
+            metric = f"{prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for type_name, histogram in sorted(values.items()):
+                for bound, count in histogram["buckets"].items():
+                    lines.append(
+                        f'{metric}_bucket{{exception="{type_name}",le="{bound}"}} {count}'
+                    )
+                lines.append(f'{metric}_sum{{exception="{type_name}"}} {histogram["sum"]}')
+                lines.append(f'{metric}_count{{exception="{type_name}"}} {histogram["count"]}')
+
+        return "\n".join(lines) + "\n"
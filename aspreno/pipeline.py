@@ -0,0 +1,231 @@
+import atexit
+import queue
+import threading
+import time
+import typing
+
+from ._utils import log as _log
+
+
+class ReportRecord:
+    """
+    A report waiting to be sent by a :py:class:`ReportPipeline`.
+    """
+
+    __slots__ = ("error", "kwargs", "created_at", "on_reported")
+
+    error: BaseException
+    """The exception to report."""
+
+    kwargs: typing.Dict[str, typing.Any]
+    """The kwargs to give to the "report" method of the exception."""
+
+    created_at: float
+    """When the record was created, as given by :py:func:`time.time`."""
+
+    on_reported: typing.Optional[typing.Callable[[], typing.Any]]
+    """Called by :py:meth:`mark_reported`, such as to acknowledge a spooled report."""
+
+    def __init__(
+        self,
+        error: BaseException,
+        kwargs: typing.Dict[str, typing.Any],
+        on_reported: typing.Optional[typing.Callable[[], typing.Any]] = None,
+    ) -> None:
+        self.error = error
+        self.kwargs = kwargs
+        self.created_at = time.time()
+        self.on_reported = on_reported
+
+    def __repr__(self) -> str:
+        return f"<ReportRecord error={self.error!r} created_at={self.created_at}>"
+
+    def report(self) -> None:
+        """
+        Call the "report" method of the exception, then mark the record as reported.
+        """
+        self.error.report(**self.kwargs)  # type: ignore[attr-defined]
+        self.mark_reported()
+
+    def mark_reported(self) -> None:
+        """
+        Tell that the record has been reported.
+        """
+        if self.on_reported is not None:
+            self.on_reported()
+
+
+_STOP = object()
+
+
+class ReportPipeline:
+    """
+    Moves the synchronous "report" methods of exceptions off the thread that raised them.
+
+    Records are put on a bounded queue, and a pool of worker threads hands them over to
+    :py:meth:`report_batch`. A batch holds up to ``batch_size`` records, or whatever arrived
+    within ``batch_interval`` seconds after its first record.
+
+    The worker threads are started with the first record.
+
+    Parameters
+    ----------
+    workers : int
+        The amount of worker threads.
+    max_queue : int
+        How many records can wait in the queue. Records submitted to a full queue are dropped.
+    batch_size : int
+        The maximum amount of records given to :py:meth:`report_batch` at once.
+    batch_interval : float
+        How many seconds to wait for more records before sending an incomplete batch.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        max_queue: int = 1024,
+        batch_size: int = 1,
+        batch_interval: float = 0.0,
+    ) -> None:
+        if workers < 1 or batch_size < 1:
+            raise ValueError("workers and batch_size must be at least 1.")
+
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.dropped = 0
+        """How many records were dropped because the queue was full."""
+
+        self._queue: "queue.Queue[typing.Any]" = queue.Queue(max_queue)
+        self._threads: typing.List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def report_batch(self, records: typing.List[ReportRecord]) -> None:
+        """
+        Send a batch of records.
+        By default, the "report" method of every record is called. Override this method to send
+        records in bulk, calling :py:meth:`ReportRecord.mark_reported` once a record has been sent.
+
+        Parameters
+        ----------
+        records : List[ReportRecord]
+            The records to send.
+        """
+        for record in records:
+            try:
+                record.report()
+            except Exception:
+                _log.exception("Failed to report %r.", record)
+
+    def submit(self, record: ReportRecord) -> bool:
+        """
+        Queue a record to be reported. This never blocks.
+
+        Parameters
+        ----------
+        record : ReportRecord
+            The record to report.
+
+        Returns
+        -------
+        bool
+            True if the record has been queued, or False if it has been dropped.
+        """
+        if not self._threads:
+            self._start()
+
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            _log.warning("The report queue is full, dropping %r.", record)
+            return False
+        return True
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._threads = [
+                threading.Thread(target=self._work, name=f"aspreno-report-{index}", daemon=True)
+                for index in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+            atexit.register(self.shutdown, 5.0)
+
+    def _next_batch(self) -> typing.Tuple[typing.List[ReportRecord], bool]:
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.batch_interval
+        while len(batch) < self.batch_size:
+            try:
+                remaining = deadline - time.monotonic()
+                record = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if record is _STOP:
+                return batch, True
+            batch.append(record)
+        return batch, False
+
+    def _work(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            try:
+                if batch:
+                    self.report_batch(batch)
+            except Exception:
+                _log.exception("Failed to report a batch of %s records.", len(batch))
+            finally:
+                for _ in range(len(batch) + stopping):
+                    self._queue.task_done()
+
+    def join(self) -> None:
+        """
+        Block until every queued record has been reported.
+        """
+        self._queue.join()
+
+    def shutdown(self, timeout: typing.Optional[float] = None) -> bool:
+        """
+        Report the queued records, then stop the worker threads.
+
+        Parameters
+        ----------
+        timeout : float | None
+            How many seconds to wait for the worker threads. Wait forever if None.
+
+        Returns
+        -------
+        bool
+            True if every worker thread has stopped, or False if some are still running.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+            if threads:
+                atexit.unregister(self.shutdown)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining() -> typing.Optional[float]:
+            return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        for _ in threads:
+            # Stop markers are queued after the pending records, so those are reported first.
+            try:
+                self._queue.put(_STOP, timeout=remaining())
+            except queue.Full:
+                _log.warning("The report queue is still full, leaving the worker threads behind.")
+                return False
+        for thread in threads:
+            thread.join(remaining())
+        return not any(thread.is_alive() for thread in threads)
@@ -0,0 +1,215 @@
+import functools
+import sys
+import threading
+import typing
+
+from ._utils import log as _log
+from .capture import dump_report, load_report
+
+if typing.TYPE_CHECKING:
+    import concurrent.futures
+    import multiprocessing.context
+
+
+def _report(payload: bytes) -> None:
+    """
+    Call the "report" method of a pickled exception. This runs in a worker process.
+    """
+    error, kwargs = load_report(payload)
+    error.report(**kwargs)  # type: ignore[attr-defined]
+
+
+class ProcessReporter:
+    """
+    Moves the synchronous "report" methods of exceptions to a pool of worker processes, so
+    CPU-heavy reporters do not compete with the application for the GIL.
+
+    The exception and its report kwargs are pickled and sent to a
+    :py:class:`concurrent.futures.ProcessPoolExecutor`. Tracebacks cannot be pickled, so the
+    "traceback" kwarg is replaced by the "capture" kwarg, a
+    :py:class:`CaptureRecord <aspreno.CaptureRecord>` of the exception. Reports that cannot be
+    pickled and unpickled back are made in this process instead.
+
+    The pool is started with the first exception.
+
+    Parameters
+    ----------
+    workers : int
+        The amount of worker processes.
+    max_pending : int
+        How many reports can be waiting for, or running in, the pool. Reports submitted once it
+        is reached are dropped.
+    mp_context : multiprocessing.context.BaseContext | None
+        The multiprocessing context used to start the workers. Defaults to the platform's.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: int = 64,
+        mp_context: typing.Optional["multiprocessing.context.BaseContext"] = None,
+    ) -> None:
+        if workers < 1 or max_pending < 1:
+            raise ValueError("workers and max_pending must be at least 1.")
+
+        self.workers = workers
+        self.max_pending = max_pending
+        self.mp_context = mp_context
+        self.dropped = 0
+        """How many reports were dropped because too many were pending."""
+        self.unpicklable = 0
+        """
+        How many reports could not be pickled or unpickled, and were made in this process instead.
+        """
+
+        self._executor: typing.Optional["concurrent.futures.ProcessPoolExecutor"] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._futures: typing.Set["concurrent.futures.Future[typing.Any]"] = set()
+        # The reports given up by shutdown(), whose failures are expected.
+        self._abandoned: typing.Set["concurrent.futures.Future[typing.Any]"] = set()
+
+    @property
+    def pending(self) -> int:
+        """How many reports are waiting for, or running in, the pool."""
+        return self._pending
+
+    def submit(
+        self,
+        error: BaseException,
+        kwargs: typing.Dict[str, typing.Any],
+        on_reported: typing.Optional[typing.Callable[[], typing.Any]] = None,
+    ) -> bool:
+        """
+        Send the "report" method of an exception to the pool. This never blocks.
+
+        Parameters
+        ----------
+        error : BaseException
+            The exception to report.
+        kwargs : Dict[str, Any]
+            The kwargs to give to the "report" method of the exception.
+        on_reported : Callable[[], Any] | None
+            Called once the report has been made.
+
+        Returns
+        -------
+        bool
+            True if the report has been sent to the pool or dropped, or False if it could not be
+            pickled and must be made in this process.
+        """
+        try:
+            payload = dump_report(error, kwargs, check=True)
+        except Exception:
+            self.unpicklable += 1
+            _log.debug("%s cannot be pickled, reporting it in process.", type(error).__name__)
+            return False
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                full = True
+            else:
+                self._pending += 1
+                full = False
+        if full:
+            _log.warning("Too many reports are pending, dropping %s.", type(error).__name__)
+            return True
+
+        try:
+            future = self._get_executor().submit(_report, payload)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(functools.partial(self._on_done, on_reported))
+        return True
+
+    def _get_executor(self) -> "concurrent.futures.ProcessPoolExecutor":
+        with self._lock:
+            if self._executor is None:
+                import concurrent.futures
+
+                _log.debug("Starting %s report processes.", self.workers)
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    self.workers, mp_context=self.mp_context
+                )
+            return self._executor
+
+    def _on_done(
+        self,
+        on_reported: typing.Optional[typing.Callable[[], typing.Any]],
+        future: "concurrent.futures.Future[typing.Any]",
+    ) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._futures.discard(future)
+            abandoned = future in self._abandoned
+            self._abandoned.discard(future)
+        if future.cancelled():
+            return
+        if abandoned:
+            _log.debug("A report was stopped along with its worker process.")
+        elif future.exception() is not None:
+            _log.error(
+                "A report made in a worker process has failed.", exc_info=future.exception()
+            )
+        elif on_reported is not None:
+            on_reported()
+
+    def shutdown(self, wait: bool = True, timeout: typing.Optional[float] = None) -> bool:
+        """
+        Stop the worker processes.
+
+        If the pending reports are not made in time, the ones not started yet are cancelled and
+        the worker processes are terminated, so a stuck reporter cannot keep the interpreter from
+        exiting.
+
+        Parameters
+        ----------
+        wait : bool
+            If True, wait for the pending reports to be made first. Otherwise, they are made in
+            the background.
+        timeout : float | None
+            How many seconds to wait for the pending reports. Wait forever if None.
+
+        Returns
+        -------
+        bool
+            True if every pending report has been made, or False if some were left behind. When
+            not waiting, True if no report was pending.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            futures = list(self._futures)
+        if executor is None:
+            return True
+
+        if not wait:
+            executor.shutdown(wait=False)
+            return not futures
+
+        import concurrent.futures
+
+        _, not_done = concurrent.futures.wait(futures, timeout=timeout)
+        if not not_done:
+            executor.shutdown(wait=True)
+            return True
+
+        _log.warning("%s reports were not made in time, stopping the workers.", len(not_done))
+        with self._lock:
+            self._abandoned.update(future for future in not_done if not future.done())
+        # The executor waits for its running reports when the interpreter exits, even if it has
+        # been shut down without waiting. Its processes are terminated to not block the exit.
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        if sys.version_info >= (3, 9):
+            executor.shutdown(wait=False, cancel_futures=True)
+        else:  # pragma: no cover
+            for future in not_done:
+                future.cancel()
+            executor.shutdown(wait=False)
+        for process in processes:
+            process.terminate()
+        return False
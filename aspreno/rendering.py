@@ -0,0 +1,221 @@
+import collections
+import threading
+import types
+import typing
+
+from .fingerprint import fingerprint
+
+_CAUSE = "\nThe above exception was the direct cause of the following exception:\n\n"
+_CONTEXT = "\nDuring handling of the above exception, another exception occurred:\n\n"
+
+
+def _format_compact(traceback: typing.Optional[types.TracebackType]) -> str:
+    lines: typing.List[str] = []
+    while traceback is not None:
+        code = traceback.tb_frame.f_code
+        lines.append(
+            f'  File "{code.co_filename}", line {traceback.tb_lineno}, in {code.co_name}\n'
+        )
+        traceback = traceback.tb_next
+    return "".join(lines)
+
+
+class TracebackRenderer:
+    """
+    Renders tracebacks as text, the way :py:func:`sys.excepthook` prints them, remembering the
+    text of the most recent stacks.
+
+    The stack of an exception is rendered once per fingerprint, see
+    :py:func:`aspreno.fingerprint`, so repeated exceptions only format their own message. The
+    text kept is the one of the first occurrence. Unless compact, stacks are also told apart by
+    the instruction that failed in each frame, as the markers under the source lines point at
+    the failing expression since Python 3.11. Chained exceptions are rendered too, while the
+    members of exception groups are not.
+
+    Parameters
+    ----------
+    max_entries : int
+        How many rendered stacks are kept. Once reached, the least recently used is dropped.
+    compact : bool
+        If True, the source lines of the frames are not read, which skips any disk access.
+    """
+
+    def __init__(self, max_entries: int = 256, compact: bool = False) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.max_entries = max_entries
+        self.compact = compact
+        self.hits = 0
+        """How many stacks were found already rendered."""
+        self.misses = 0
+        """How many stacks had to be rendered."""
+
+        self._lock = threading.Lock()
+        self._stacks: "collections.OrderedDict[int, str]" = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._stacks)
+
+    def lazy(
+        self, error: BaseException, traceback: typing.Optional[types.TracebackType] = None
+    ) -> "LazyTraceback":
+        """
+        Obtain the traceback of an exception, to be rendered when it is first read.
+
+        Parameters
+        ----------
+        error : BaseException
+            The exception.
+        traceback : types.TracebackType | None
+            Its traceback. Defaults to the one the exception holds.
+
+        Returns
+        -------
+        LazyTraceback
+            The traceback, not rendered yet.
+        """
+        return LazyTraceback(self, error, traceback or error.__traceback__)
+
+    def render(
+        self, error: BaseException, traceback: typing.Optional[types.TracebackType] = None
+    ) -> str:
+        """
+        Render an exception and its traceback, along with the exceptions it is chained to.
+
+        Parameters
+        ----------
+        error : BaseException
+            The exception.
+        traceback : types.TracebackType | None
+            Its traceback. Defaults to the one the exception holds.
+
+        Returns
+        -------
+        str
+            The rendered text, ending with a newline.
+        """
+        parts: typing.List[str] = []
+        seen: typing.Set[int] = set()
+        current: typing.Optional[BaseException] = error
+        current_traceback = traceback or error.__traceback__
+        while current is not None and id(current) not in seen:
+            seen.add(id(current))
+            parts.append(self._render_one(current, current_traceback))
+
+            if current.__cause__ is not None:
+                parts.append(_CAUSE)
+                current = current.__cause__
+            elif current.__context__ is not None and not current.__suppress_context__:
+                parts.append(_CONTEXT)
+                current = current.__context__
+            else:
+                break
+            current_traceback = current.__traceback__
+        else:
+            if current is not None:
+                # A cycle, which is where the chain would stop printing.
+                parts.pop()
+
+        parts.reverse()
+        return "".join(parts)
+
+    def _render_one(
+        self, error: BaseException, traceback: typing.Optional[types.TracebackType]
+    ) -> str:
+        import traceback as traceback_module
+
+        message = "".join(traceback_module.format_exception_only(type(error), error))
+        if traceback is None:
+            return message
+        return f"Traceback (most recent call last):\n{self._stack(error, traceback)}{message}"
+
+    def _stack(self, error: BaseException, traceback: types.TracebackType) -> str:
+        key = self._key(error, traceback)
+        with self._lock:
+            stack = self._stacks.get(key)
+            if stack is not None:
+                self._stacks.move_to_end(key)
+                self.hits += 1
+                return stack
+            self.misses += 1
+
+        if self.compact:
+            stack = _format_compact(traceback)
+        else:
+            import traceback as traceback_module
+
+            stack = "".join(traceback_module.format_tb(traceback))
+
+        with self._lock:
+            self._stacks[key] = stack
+            if len(self._stacks) > self.max_entries:
+                self._stacks.popitem(last=False)
+        return stack
+
+    def _key(self, error: BaseException, traceback: types.TracebackType) -> int:
+        key = fingerprint(type(error), traceback)
+        if self.compact:
+            return key
+        # Two expressions of the same line fail at different instructions.
+        instructions = [key]
+        current: typing.Optional[types.TracebackType] = traceback
+        while current is not None:
+            instructions.append(current.tb_lasti)
+            current = current.tb_next
+        return hash(tuple(instructions))
+
+
+class LazyTraceback:
+    """
+    The traceback of an exception, rendered as text by a :py:class:`TracebackRenderer` the first
+    time it is read.
+
+    Lazy tracebacks are rendered when pickled, so reports made in other processes receive the
+    text without the traceback.
+    """
+
+    __slots__ = ("renderer", "error", "traceback", "_text")
+
+    renderer: typing.Optional[TracebackRenderer]
+    """The renderer of the text, or None once unpickled."""
+
+    error: BaseException
+    """The exception."""
+
+    traceback: typing.Optional[types.TracebackType]
+    """The traceback of the exception."""
+
+    def __init__(
+        self,
+        renderer: typing.Optional[TracebackRenderer],
+        error: BaseException,
+        traceback: typing.Optional[types.TracebackType],
+    ) -> None:
+        self.renderer = renderer
+        self.error = error
+        self.traceback = traceback
+        self._text: typing.Optional[str] = None
+
+    def __repr__(self) -> str:
+        rendered = "rendered" if self._text is not None else "not rendered"
+        return f"<LazyTraceback of {type(self.error).__name__}, {rendered}>"
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __reduce__(self) -> typing.Tuple[typing.Any, ...]:
+        return _rendered, (self.error, self.text)
+
+    @property
+    def text(self) -> str:
+        """The rendered text, as :py:func:`sys.excepthook` would print it."""
+        if self._text is None:
+            assert self.renderer is not None
+            self._text = self.renderer.render(self.error, self.traceback)
+        return self._text
+
+
+def _rendered(error: BaseException, text: str) -> LazyTraceback:
+    lazy = LazyTraceback(None, error, None)
+    lazy._text = text
+    return lazy
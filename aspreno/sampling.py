@@ -0,0 +1,168 @@
+import collections
+import random
+import threading
+import time
+import typing
+
+
+class SamplingPolicy:
+    """
+    Decides which exceptions get reported.
+    The "handle" method of an exception is always called, only its "report" method is sampled.
+
+    The base policy reports everything. Subclasses override :py:meth:`should_sample`.
+    """
+
+    def __init__(self) -> None:
+        self.sampled_out: typing.Counter[str] = collections.Counter()
+        """How many exceptions were not reported, per exception type name."""
+
+    def sample(self, error: BaseException, fingerprint: int) -> bool:
+        """
+        Indicates if an exception must be reported, counting it if it must not.
+
+        Parameters
+        ----------
+        error : BaseException
+            The exception to report.
+        fingerprint : int
+            The fingerprint of the exception, see :py:func:`aspreno.fingerprint`.
+
+        Returns
+        -------
+        bool
+            True if the exception must be reported, or False if not.
+        """
+        if self.should_sample(error, fingerprint):
+            return True
+        self.sampled_out[type(error).__name__] += 1
+        return False
+
+    def should_sample(self, error: BaseException, fingerprint: int) -> bool:
+        return True
+
+
+class EveryNth(SamplingPolicy):
+    """
+    Reports the first exception of every ``n`` exceptions of the same type.
+
+    Parameters
+    ----------
+    n : int
+        One exception is reported every ``n`` exceptions.
+    """
+
+    def __init__(self, n: int) -> None:
+        if n < 1:
+            raise ValueError("n must be at least 1.")
+        super().__init__()
+        self.n = n
+        self._seen: typing.Counter[type] = collections.Counter()
+
+    def should_sample(self, error: BaseException, fingerprint: int) -> bool:
+        error_type = type(error)
+        seen = self._seen[error_type]
+        self._seen[error_type] = seen + 1
+        return seen % self.n == 0
+
+
+class TokenBucket(SamplingPolicy):
+    """
+    Limits the rate of reports per fingerprint.
+
+    Every fingerprint has its own bucket of ``burst`` tokens, refilled at ``rate`` tokens per
+    second. Reporting an exception takes a token, and exceptions are not reported while their
+    bucket is empty.
+
+    Parameters
+    ----------
+    rate : float
+        How many tokens are added to a bucket each second.
+    burst : int
+        How many tokens a bucket can hold.
+    max_fingerprints : int
+        How many buckets are kept. When reached, the oldest bucket is forgotten.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, max_fingerprints: int = 1024) -> None:
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._buckets: typing.Dict[int, typing.Tuple[float, float]] = {}
+
+    def should_sample(self, error: BaseException, fingerprint: int) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.pop(fingerprint, None)
+            if bucket is None:
+                tokens = float(self.burst)
+                if len(self._buckets) >= self.max_fingerprints:
+                    self._buckets.pop(next(iter(self._buckets)))
+            else:
+                tokens, updated_at = bucket
+                tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+
+            sampled = tokens >= 1
+            self._buckets[fingerprint] = (tokens - 1 if sampled else tokens, now)
+        return sampled
+
+
+class Reservoir(SamplingPolicy):
+    """
+    Keeps a representative set of ``size`` exceptions out of every ``interval`` seconds, using
+    reservoir sampling.
+
+    An exception is reported when it enters the reservoir. Exceptions early in an interval are
+    likely to enter it, later ones are less and less likely to, so about
+    ``size * (1 + ln(seen / size))`` exceptions are reported per interval.
+
+    Parameters
+    ----------
+    size : int
+        How many exceptions the reservoir holds.
+    interval : float
+        How many seconds an interval lasts.
+    """
+
+    def __init__(self, size: int, interval: float = 60.0) -> None:
+        if size < 1:
+            raise ValueError("size must be at least 1.")
+        super().__init__()
+        self.size = size
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self._samples: typing.List[BaseException] = []
+        self._previous: typing.List[BaseException] = []
+        self._seen = 0
+        self._interval_end = time.monotonic() + interval
+
+    def samples(self) -> typing.List[BaseException]:
+        """
+        Obtain the exceptions held by the reservoir at the end of the last complete interval.
+        """
+        with self._lock:
+            self._roll(time.monotonic())
+            return list(self._previous)
+
+    def _roll(self, now: float) -> None:
+        if now >= self._interval_end:
+            self._previous, self._samples = self._samples, []
+            self._seen = 0
+            self._interval_end = now + self.interval
+
+    def should_sample(self, error: BaseException, fingerprint: int) -> bool:
+        with self._lock:
+            self._roll(time.monotonic())
+            self._seen += 1
+            if len(self._samples) < self.size:
+                self._samples.append(error)
+                return True
+
+            index = self._random.randrange(self._seen)
+            if index < self.size:
+                self._samples[index] = error
+                return True
+            return False
@@ -0,0 +1,260 @@
+import os
+import struct
+import threading
+import typing
+import weakref
+import zlib
+
+from ._utils import log as _log
+
+if typing.TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+_MAGIC = b"ASPRCNT1"
+_HEADER = struct.Struct("=8sII")
+"""The header of the segment: magic, amount of slots, amount of workers."""
+
+_NAME_SIZE = 128
+OTHER = "<other>"
+"""The name counting the exception types that did not get a slot of their own."""
+
+
+def _encode_name(name: str) -> bytes:
+    encoded = name.encode("utf-8")[: _NAME_SIZE - 1]
+    # Do not leave half of a multibyte character behind.
+    return encoded.decode("utf-8", "ignore").encode("utf-8").ljust(_NAME_SIZE, b"\0")
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # pragma: no cover
+        return True
+    return True
+
+
+class SharedCounters:
+    """
+    Counts exceptions per type in shared memory, across the worker processes forked from the
+    process that created the counters.
+
+    The segment holds one row of counters per worker, and one column per exception type. Each
+    process only writes to its own row, which it claims on its first increment, so incrementing
+    takes no lock shared with other processes. Any process, such as the master or a sidecar
+    attached with :py:meth:`attach`, can sum the rows to read fleet-wide counts.
+
+    Claiming a row or a column takes a lock shared by the forked processes, which only happens
+    once per process and per exception type. A process forked from a worker claims a row of its
+    own. Rows of dead workers are reused, keeping their counts.
+
+    Parameters
+    ----------
+    slots : int
+        How many exception types can be counted. Once every slot is taken, other types are
+        counted as :py:data:`OTHER`. Type names are cut at 127 bytes.
+    workers : int
+        How many processes can write to the counters.
+    name : str | None
+        The name of the shared memory segment. Defaults to a random name.
+    """
+
+    def __init__(
+        self, slots: int = 64, workers: int = 32, name: typing.Optional[str] = None
+    ) -> None:
+        import multiprocessing
+        from multiprocessing.shared_memory import SharedMemory
+
+        if slots < 2 or workers < 1:
+            raise ValueError("slots must be at least 2, and workers at least 1.")
+
+        size = _HEADER.size + workers * 8 + slots * _NAME_SIZE + workers * slots * 8
+        self._setup(SharedMemory(name, create=True, size=size))
+        _HEADER.pack_into(self._buffer, 0, _MAGIC, slots, workers)
+        self._map()
+        self._names[:_NAME_SIZE] = _encode_name(OTHER)
+        self._lock: typing.Optional[typing.Any] = multiprocessing.Lock()
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedCounters":
+        """
+        Open counters created by another process, to read them.
+        Attached counters cannot be incremented, as they do not share the lock of the workers.
+
+        Parameters
+        ----------
+        name : str
+            The name of the shared memory segment, see :py:attr:`name`.
+
+        Returns
+        -------
+        SharedCounters
+            The attached counters.
+        """
+        from multiprocessing.shared_memory import SharedMemory
+
+        try:
+            memory = SharedMemory(name, track=False)  # type: ignore[call-arg]
+        except TypeError:
+            # Before Python 3.13, attaching also registers the segment to be deleted on exit.
+            memory = SharedMemory(name)
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(memory._name, "shared_memory")  # type: ignore[attr-defined]
+
+        counters = cls.__new__(cls)
+        counters._setup(memory)
+        magic, _, _ = _HEADER.unpack_from(counters._buffer, 0)
+        if magic != _MAGIC:
+            memory.close()
+            raise ValueError(f"{name} does not hold Aspreno counters.")
+        counters._map()
+        counters._lock = None
+        return counters
+
+    def _setup(self, memory: "SharedMemory") -> None:
+        self._memory = memory
+        self._buffer = typing.cast(memoryview, memory.buf)
+        self._thread_lock = threading.Lock()
+        self._pid = 0
+        self._row = -1
+        self._slots_by_name: typing.Dict[str, int] = {}
+
+        reference = weakref.ref(self)
+
+        def forget_row() -> None:
+            counters = reference()
+            if counters is not None:
+                counters._pid = 0
+                counters._row = -1
+                counters._thread_lock = threading.Lock()
+
+        os.register_at_fork(after_in_child=forget_row)
+
+    def _map(self) -> None:
+        _, self.slots, self.workers = _HEADER.unpack_from(self._buffer, 0)
+        offset = _HEADER.size
+        self._pids = self._buffer[offset : offset + self.workers * 8].cast("q")
+        offset += self.workers * 8
+        self._names = self._buffer[offset : offset + self.slots * _NAME_SIZE]
+        offset += self.slots * _NAME_SIZE
+        self._counts = self._buffer[offset : offset + self.workers * self.slots * 8].cast("Q")
+
+    @property
+    def name(self) -> str:
+        """The name of the shared memory segment, to :py:meth:`attach` to it."""
+        return self._memory.name
+
+    def _claim_row(self) -> int:
+        if self._lock is None:
+            raise RuntimeError("Attached counters cannot be incremented.")
+
+        pid = os.getpid()
+        with self._lock:
+            for row in range(self.workers):
+                owner = self._pids[row]
+                if owner == pid or owner == 0 or not _is_alive(owner):
+                    self._pids[row] = pid
+                    break
+            else:
+                raise RuntimeError(f"Every one of the {self.workers} rows has been claimed.")
+        _log.debug("Process %s counts exceptions in row %s.", pid, row)
+        self._pid, self._row = pid, row
+        return row
+
+    def _claim_slot(self, name: str) -> int:
+        assert self._lock is not None
+        encoded = _encode_name(name)
+        with self._lock:
+            start = zlib.crc32(encoded) % (self.slots - 1)
+            for probe in range(self.slots - 1):
+                slot = 1 + (start + probe) % (self.slots - 1)
+                current = self._names[slot * _NAME_SIZE : (slot + 1) * _NAME_SIZE]
+                if current == encoded:
+                    return slot
+                if current[0] == 0:
+                    current[:] = encoded
+                    return slot
+        return 0
+
+    def increment(self, type_name: str, count: int = 1) -> None:
+        """
+        Count occurrences of an exception type in the row of this process.
+
+        Parameters
+        ----------
+        type_name : str
+            The name of the exception type.
+        count : int
+            How many times the exception occurred.
+        """
+        with self._thread_lock:
+            row = self._row if self._pid == os.getpid() else self._claim_row()
+            slot = self._slots_by_name.get(type_name)
+            if slot is None:
+                slot = self._slots_by_name[type_name] = self._claim_slot(type_name)
+            self._counts[row * self.slots + slot] += count
+
+    def _read_names(self) -> typing.List[str]:
+        return [
+            bytes(self._names[slot * _NAME_SIZE : (slot + 1) * _NAME_SIZE])
+            .rstrip(b"\0")
+            .decode("utf-8")
+            for slot in range(self.slots)
+        ]
+
+    def per_worker(self) -> typing.Dict[int, typing.Dict[str, int]]:
+        """
+        Read the counts of every worker.
+
+        Returns
+        -------
+        Dict[int, Dict[str, int]]
+            The counts of each exception type, keyed by the pid of the worker that last claimed
+            the row.
+        """
+        names = self._read_names()
+        workers: typing.Dict[int, typing.Dict[str, int]] = {}
+        for row in range(self.workers):
+            pid = self._pids[row]
+            if pid == 0:
+                continue
+            base = row * self.slots
+            workers[pid] = {
+                name: self._counts[base + slot]
+                for slot, name in enumerate(names)
+                if name and self._counts[base + slot]
+            }
+        return workers
+
+    def snapshot(self) -> typing.Dict[str, int]:
+        """
+        Read the counts of every exception type, summed over every worker.
+
+        Returns
+        -------
+        Dict[str, int]
+            The counts, keyed by exception type name.
+        """
+        totals: typing.Dict[str, int] = {}
+        for counts in self.per_worker().values():
+            for name, count in counts.items():
+                totals[name] = totals.get(name, 0) + count
+        return totals
+
+    def close(self) -> None:
+        """
+        Stop using the counters in this process. The process that created them must also
+        :py:meth:`unlink` them.
+        """
+        self._pids.release()
+        self._names.release()
+        self._counts.release()
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """
+        Delete the shared memory segment, once every process has closed it.
+        """
+        self._memory.unlink()
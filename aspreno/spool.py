@@ -0,0 +1,338 @@
+import functools
+import itertools
+import os
+import struct
+import threading
+import time
+import typing
+import zlib
+
+from ._utils import iscoroutinefunction
+from ._utils import log as _log
+from .capture import dump_report, load_report
+
+_MAGIC = b"ASPRENO\x01"
+"""The first bytes of every spool file."""
+
+_HEADER = struct.Struct(">IIBQ")
+"""The header of a spooled entry: payload length, checksum, kind and report id."""
+
+_REPORT = 1
+_ACKNOWLEDGEMENT = 2
+
+Reporter = typing.Callable[[BaseException, typing.Dict[str, typing.Any]], typing.Any]
+
+
+def _entry(kind: int, report_id: int, payload: bytes = b"") -> bytes:
+    checksum = zlib.crc32(payload, zlib.crc32(bytes((kind,)) + report_id.to_bytes(8, "big")))
+    return _HEADER.pack(len(payload), checksum, kind, report_id) + payload
+
+
+def _read_entries(path: str) -> typing.Iterator[typing.Tuple[int, int, bytes]]:
+    """
+    Read the entries of a spool file, stopping at the first truncated or corrupted one.
+    """
+    with open(path, "rb") as file:
+        if file.read(len(_MAGIC)) != _MAGIC:
+            _log.warning("%s is not a spool file, skipping it.", path)
+            return
+
+        while True:
+            header = file.read(_HEADER.size)
+            if not header:
+                return
+            if len(header) < _HEADER.size:
+                _log.warning("%s ends with a truncated entry.", path)
+                return
+
+            length, checksum, kind, report_id = _HEADER.unpack(header)
+            payload = file.read(length)
+            expected = zlib.crc32(payload, zlib.crc32(header[8:]))
+            if len(payload) < length or checksum != expected:
+                _log.warning("%s has a corrupted entry, skipping the rest of the file.", path)
+                return
+            yield kind, report_id, payload
+
+
+def _report(error: BaseException, kwargs: typing.Dict[str, typing.Any]) -> None:
+    method = error.report  # type: ignore[attr-defined]
+    if iscoroutinefunction(method):
+        import asyncio
+
+        asyncio.run(method(**kwargs))
+    else:
+        method(**kwargs)
+
+
+def spool_files(path: str, backups: int) -> typing.List[str]:
+    """
+    Obtain the existing files of a spool, the oldest first.
+
+    Parameters
+    ----------
+    path : str
+        The path of the spool's current file.
+    backups : int
+        How many rotated files the spool keeps.
+
+    Returns
+    -------
+    List[str]
+        The paths of the existing files.
+    """
+    candidates = [f"{path}.{index}" for index in range(backups, 0, -1)] + [path]
+    return [candidate for candidate in candidates if os.path.exists(candidate)]
+
+
+def replay(path: str, backups: int = 3, report: typing.Optional[Reporter] = None) -> int:
+    """
+    Deliver the reports left in a spool, then delete its files.
+
+    Reports are delivered once, in the order they were spooled. Those that fail are logged and
+    dropped.
+
+    Parameters
+    ----------
+    path : str
+        The path of the spool's current file.
+    backups : int
+        How many rotated files the spool keeps.
+    report : Callable[[BaseException, Dict[str, Any]], Any] | None
+        Delivers a report, given the exception and its kwargs. Defaults to calling the "report"
+        method of the exception.
+
+    Returns
+    -------
+    int
+        How many reports have been delivered.
+    """
+    report = _report if report is None else report
+    files = spool_files(path, backups)
+
+    acknowledged: typing.Set[int] = set()
+    reports: typing.List[typing.Tuple[int, bytes]] = []
+    for file in files:
+        for kind, report_id, payload in _read_entries(file):
+            if kind == _ACKNOWLEDGEMENT:
+                acknowledged.add(report_id)
+            elif kind == _REPORT:
+                reports.append((report_id, payload))
+
+    delivered = 0
+    for report_id, payload in reports:
+        if report_id in acknowledged:
+            continue
+        try:
+            error, kwargs = load_report(payload)
+            report(error, kwargs)
+        except Exception:
+            _log.exception("Failed to replay the spooled report %s.", report_id)
+        else:
+            delivered += 1
+
+    for file in files:
+        os.remove(file)
+    _log.debug("Replayed %s reports out of %s spool files.", delivered, len(files))
+    return delivered
+
+
+class Spool:
+    """
+    Writes reports to an append-only file before they are made, so the reports that were still
+    pending when the process died can be replayed on the next start, see :py:meth:`replay`.
+
+    Every report is written as a length-prefixed, checksummed entry, and is followed by an
+    acknowledgement once it has been made. Entries are written straight to the operating system,
+    which keeps them if the process crashes. They are synced to the disk every ``fsync_every``
+    entries or ``fsync_interval`` seconds, and when :py:func:`sys.excepthook` returns.
+
+    Once the file reaches ``max_bytes``, it is rotated, keeping ``backups`` older files. The
+    oldest file is deleted, along with the reports it holds.
+
+    Parameters
+    ----------
+    path : str
+        The path of the spool file.
+    max_bytes : int
+        The size a file can reach before being rotated.
+    backups : int
+        How many rotated files are kept.
+    fsync_every : int
+        How many entries can be written before syncing the file to the disk.
+    fsync_interval : float
+        How many seconds can pass before syncing written entries to the disk.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 16 * 1024 * 1024,
+        backups: int = 3,
+        fsync_every: int = 64,
+        fsync_interval: float = 1.0,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.unpicklable = 0
+        """How many reports could not be pickled or unpickled, and were not spooled."""
+
+        self._lock = threading.Lock()
+        self._file: typing.Optional[typing.BinaryIO] = None
+        self._size = 0
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+        self._ids = itertools.count(time.time_ns())
+
+    def _open(self) -> typing.BinaryIO:
+        file = typing.cast(typing.BinaryIO, open(self.path, "ab", buffering=0))
+        self._size = file.seek(0, os.SEEK_END)
+        if self._size == 0:
+            self._size = file.write(_MAGIC)
+        return file
+
+    def _rotate(self) -> None:
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+        if self.backups < 1:
+            os.remove(self.path)
+            return
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def _write(self, entry: bytes) -> None:
+        with self._lock:
+            if self._file is None:
+                self._file = self._open()
+            if self._size + len(entry) > self.max_bytes and self._size > len(_MAGIC):
+                self._rotate()
+                self._file = self._open()
+
+            self._file.write(entry)
+            self._size += len(entry)
+            self._unsynced += 1
+            if (
+                self._unsynced >= self.fsync_every
+                or time.monotonic() - self._synced_at >= self.fsync_interval
+            ):
+                self._sync()
+
+    def _sync(self) -> None:
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def append(
+        self, error: BaseException, kwargs: typing.Dict[str, typing.Any]
+    ) -> typing.Optional[typing.Callable[[], None]]:
+        """
+        Write a report to the spool.
+
+        Parameters
+        ----------
+        error : BaseException
+            The exception to report.
+        kwargs : Dict[str, Any]
+            The kwargs to give to the "report" method of the exception.
+
+        Returns
+        -------
+        Callable[[], None] | None
+            Acknowledges the report once it has been made, so it is not replayed. None if the
+            report could not be pickled, or unpickled back, which would keep it from being
+            replayed.
+        """
+        try:
+            payload = dump_report(error, kwargs, check=True)
+        except Exception:
+            self.unpicklable += 1
+            _log.debug("%s cannot be pickled, not spooling it.", type(error).__name__)
+            return None
+
+        report_id = next(self._ids)
+        self._write(_entry(_REPORT, report_id, payload))
+        return functools.partial(self.acknowledge, report_id)
+
+    def acknowledge(self, report_id: int) -> None:
+        """
+        Tell that a spooled report has been made.
+
+        Parameters
+        ----------
+        report_id : int
+            The id of the report.
+        """
+        self._write(_entry(_ACKNOWLEDGEMENT, report_id))
+
+    def flush(self) -> None:
+        """
+        Sync the written entries to the disk.
+        """
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        """
+        Sync the written entries to the disk, and close the file.
+        """
+        with self._lock:
+            self._sync()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def replay(self, report: typing.Optional[Reporter] = None) -> int:
+        """
+        Deliver the reports left in the spool by a previous process, then delete its files.
+        This must be called before reports are spooled, usually when the application starts.
+
+        Parameters
+        ----------
+        report : Callable[[BaseException, Dict[str, Any]], Any] | None
+            Delivers a report, given the exception and its kwargs. Defaults to calling the
+            "report" method of the exception.
+
+        Returns
+        -------
+        int
+            How many reports have been delivered.
+        """
+        self.close()
+        with self._lock:
+            return replay(self.path, self.backups, report)
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    """
+    Replay a spool from the command line.
+    The modules of the spooled exceptions must be importable.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="aspreno-replay", description="Deliver the reports left in an Aspreno spool."
+    )
+    parser.add_argument("path", help="the path of the spool file")
+    parser.add_argument(
+        "--backups", type=int, default=3, help="how many rotated files the spool keeps"
+    )
+    arguments = parser.parse_args(argv)
+
+    if not spool_files(arguments.path, arguments.backups):
+        print(f"No spool found at {arguments.path}.")
+        return 1
+    delivered = replay(arguments.path, arguments.backups)
+    print(f"Delivered {delivered} reports.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
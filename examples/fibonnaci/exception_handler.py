@@ -1,16 +1,17 @@
 import typing
 from functools import lru_cache
 
-from aspreno import ExceptionHandler, register_global_handler
+from aspreno import ExceptionHandler, register_global_handler, route
 
 
 class FibonacciHandler(ExceptionHandler):
-    def handle(self, error: BaseException, **kwargs: typing.Any) -> None:
-        if isinstance(error, ValueError) and str(error) == "Fibonacci Incorrect value":
+    @route(ValueError)
+    def handle_value_error(self, error: BaseException, **kwargs: typing.Any) -> None:
+        if str(error) == "Fibonacci Incorrect value":
             print("You have given a number that cannot be worked upon Fibonacci sequence!")
 
-        # Default handle's method
-        super().handle(error, **kwargs)
+        # Default handling, printing the traceback
+        self.handle_unrouted(error, **kwargs)
 
 
 @lru_cache(None)
@@ -0,0 +1,124 @@
+"""
+Benchmarks of Aspreno's hot paths.
+
+They run with the rest of the tests, on a small scale by default. The following environment
+variables tune them:
+
+- ``ASPRENO_BENCH_SCALE``: multiplies the amount of iterations (default: 1).
+- ``ASPRENO_BENCH_SAVE``: set to 1 to save the results as the new baseline.
+- ``ASPRENO_BENCH_TOLERANCE``: how many times slower than the baseline a benchmark can be before
+  it is flagged (default: 2).
+- ``ASPRENO_BENCH_STRICT``: set to 1 to fail flagged benchmarks instead of warning about them.
+"""
+
+import gc
+import json
+import logging
+import os
+import pathlib
+import statistics
+import time
+import tracemalloc
+import typing
+import warnings
+
+import pytest
+
+BASELINE_PATH = pathlib.Path(__file__).parent / "baseline.json"
+RESULTS_PATH = pathlib.Path(__file__).parent / "results.json"
+
+SCALE = float(os.environ.get("ASPRENO_BENCH_SCALE", "1"))
+TOLERANCE = float(os.environ.get("ASPRENO_BENCH_TOLERANCE", "2"))
+STRICT = os.environ.get("ASPRENO_BENCH_STRICT") == "1"
+SAVE = os.environ.get("ASPRENO_BENCH_SAVE") == "1"
+
+_results: typing.Dict[str, typing.Dict[str, float]] = {}
+
+
+class BenchmarkRegression(UserWarning):
+    pass
+
+
+class Benchmark:
+    """
+    Runs a function many times, measuring its throughput, its latency and its peak memory.
+    """
+
+    def __init__(self, baseline: typing.Dict[str, typing.Dict[str, float]]) -> None:
+        self.baseline = baseline
+
+    def __call__(
+        self, name: str, function: typing.Callable[[], typing.Any], iterations: int = 10_000
+    ) -> typing.Dict[str, float]:
+        iterations = max(1, int(iterations * SCALE))
+
+        # Warm up caches, so the first-sight costs are not measured.
+        for _ in range(min(iterations, 100)):
+            function()
+
+        latencies: typing.List[int] = []
+        gc.disable()
+        try:
+            started = time.perf_counter_ns()
+            for _ in range(iterations):
+                call_started = time.perf_counter_ns()
+                function()
+                latencies.append(time.perf_counter_ns() - call_started)
+            elapsed = time.perf_counter_ns() - started
+        finally:
+            gc.enable()
+
+        tracemalloc.start()
+        try:
+            for _ in range(min(iterations, 1000)):
+                function()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        latencies.sort()
+        result = {
+            "iterations": iterations,
+            "ops_per_second": iterations / (elapsed / 1e9),
+            "p50_us": statistics.median(latencies) / 1e3,
+            "p99_us": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] / 1e3,
+            "peak_memory_kib": peak_memory / 1024,
+        }
+        _results[name] = result
+        self._compare(name, result)
+        return result
+
+    def _compare(self, name: str, result: typing.Dict[str, float]) -> None:
+        baseline = self.baseline.get(name)
+        if baseline is None:
+            return
+
+        slowdown = baseline["ops_per_second"] / result["ops_per_second"]
+        if slowdown > TOLERANCE:
+            message = (
+                f"{name} is {slowdown:.1f} times slower than its baseline "
+                f"({result['ops_per_second']:.0f} ops/s against {baseline['ops_per_second']:.0f})."
+            )
+            if STRICT:
+                pytest.fail(message)
+            warnings.warn(message, BenchmarkRegression)
+
+
+@pytest.fixture(scope="session")
+def benchmark() -> typing.Iterator[Benchmark]:
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+
+    # Debug logs are enabled for the tests, they would be measured instead of Aspreno.
+    logger = logging.getLogger("aspreno")
+    level = logger.level
+    logger.setLevel(logging.WARNING)
+    try:
+        yield Benchmark(baseline)
+    finally:
+        logger.setLevel(level)
+
+    if _results:
+        output = json.dumps(_results, indent=2, sort_keys=True)
+        RESULTS_PATH.write_text(output)
+        if SAVE:
+            BASELINE_PATH.write_text(output)
@@ -0,0 +1,173 @@
+import gc
+import sys
+import threading
+import time
+import typing
+
+import pytest
+
+import aspreno
+
+from .conftest import Benchmark
+
+
+@pytest.fixture(autouse=True)
+def teardown_method() -> None:
+    sys.excepthook = sys.__excepthook__
+    sys.unraisablehook = sys.__unraisablehook__
+    threading.excepthook = threading.__excepthook__
+
+
+class SelfHandledException(Exception):
+    def handle(self, **_: typing.Any) -> None:
+        pass
+
+    def report(self, **_: typing.Any) -> None:
+        pass
+
+
+class AsyncSelfHandledException(Exception):
+    async def handle(self, **_: typing.Any) -> None:
+        pass
+
+    async def report(self, **_: typing.Any) -> None:
+        pass
+
+
+class BenchArgumentedException(aspreno.ArgumentedException):
+    def handle(self, argument_1: str, argument_2: int, **_: typing.Any) -> None:
+        pass
+
+
+def relay_function(
+    handler: aspreno.ExceptionHandler, error_type: typing.Type[BaseException]
+) -> typing.Callable[[], None]:
+    def relay() -> None:
+        try:
+            raise error_type()
+        except BaseException:
+            handler.relay()
+
+    return relay
+
+
+def test_relay_sync(benchmark: Benchmark) -> None:
+    handler = aspreno.ExceptionHandler()
+    result = benchmark("relay_sync", relay_function(handler, SelfHandledException))
+    assert result["ops_per_second"] > 0
+
+
+@pytest.mark.asyncio
+async def test_relay_async(benchmark: Benchmark) -> None:
+    handler = aspreno.ExceptionHandler()
+    benchmark("relay_async", relay_function(handler, AsyncSelfHandledException), 2_000)
+    assert await handler.drain(30)
+
+
+def test_global_handler_ignored(benchmark: Benchmark) -> None:
+    class IgnoringHandler(aspreno.ExceptionHandler):
+        ignore_errors = [KeyError, IndexError, OSError, ValueError, TypeError, ArithmeticError]
+
+    handler = IgnoringHandler()
+    error = ConnectionResetError()
+    traceback = None
+
+    def global_handler() -> None:
+        handler._global_handler(ConnectionResetError, error, traceback)
+
+    benchmark("global_handler_ignored", global_handler, 50_000)
+    assert not handler.should_report
+
+
+@pytest.mark.parametrize("size", [2, 1_000])
+def test_argumented_kwargs(benchmark: Benchmark, size: int) -> None:
+    arguments = {f"unused_{index}": index for index in range(size - 2)}
+    error = BenchArgumentedException(argument_1="value", argument_2=2, **arguments)
+
+    result = benchmark(
+        f"argumented_kwargs_{size}", error.get_kwargs_for_handle, 50_000 if size < 100 else 2_000
+    )
+    assert error.get_kwargs_for_handle() == {"argument_1": "value", "argument_2": 2}
+    assert result["ops_per_second"] > 0
+
+
+@pytest.mark.parametrize("coalesce", [False, True], ids=["plain", "coalesced"])
+def test_storm(benchmark: Benchmark, coalesce: bool) -> None:
+    handler = aspreno.ExceptionHandler()
+    if coalesce:
+        handler.coalescer = aspreno.StormCoalescer(window=3600)
+
+    benchmark(
+        f"storm_{'coalesced' if coalesce else 'plain'}",
+        relay_function(handler, SelfHandledException),
+        100_000,
+    )
+
+
+def batched_ns(function: typing.Callable[[], typing.Any], calls: int, repeats: int = 5) -> int:
+    """
+    Time a loop of calls to the function, keeping the fastest of a few repeats.
+    """
+    best = None
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            started = time.perf_counter_ns()
+            for _ in range(calls):
+                function()
+            elapsed = time.perf_counter_ns() - started
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    assert best is not None
+    return best
+
+
+@pytest.mark.parametrize("style", ["decorator", "context_manager"])
+def test_guard_success(benchmark: Benchmark, style: str) -> None:
+    handler = aspreno.ExceptionHandler()
+
+    def function() -> int:
+        return 1
+
+    if style == "decorator":
+        guarded = handler.guard(function)
+    else:
+        guard = handler.guard
+
+        def guarded() -> int:
+            with guard:
+                return function()
+
+    result = benchmark(f"guard_{style}", guarded, 100_000)
+    assert result["peak_memory_kib"] < 1
+
+    # Per-call latencies are dominated by the timer, time whole loops and compare them instead.
+    overhead_ns = (batched_ns(guarded, 100_000) - batched_ns(function, 100_000)) / 100_000
+    assert overhead_ns < 1_000
+
+
+def raise_deep(depth: int) -> None:
+    if depth == 0:
+        raise ValueError("repeated")
+    raise_deep(depth - 1)
+
+
+@pytest.mark.parametrize("mode", ["uncached", "cached", "compact"])
+def test_render_repeated(benchmark: Benchmark, mode: str) -> None:
+    import traceback
+
+    renderer = aspreno.TracebackRenderer(compact=mode == "compact")
+    try:
+        raise_deep(10)
+    except ValueError as error:
+        caught = error
+
+    def render() -> None:
+        if mode == "uncached":
+            traceback.format_exception(type(caught), caught, caught.__traceback__)
+        else:
+            renderer.render(caught)
+
+    benchmark(f"render_{mode}", render, 2_000 if mode == "uncached" else 20_000)
+    assert mode == "uncached" or renderer.hits
@@ -1,3 +1,4 @@
+import typing
 from typing import Dict
 
 import pytest
@@ -77,3 +78,34 @@ def test_obtain_kwargs_for_report(argumented_exception: MyArgumentedException) -
     exception = SecondArgumentedException("This error is being raised", **ARGS)
     with pytest.raises(AttributeError):
         exception.get_kwargs_for_report()
+
+
+def test_argument_plan_is_cached(argumented_exception: MyArgumentedException) -> None:
+    """
+    Test that the handle method is only introspected once per class.
+    """
+    plan = MyArgumentedException.get_argument_plan(argumented_exception.handle)
+    assert plan.parameters == {"argument_1", "argument_2", "argument_3"}
+    assert plan.accepts_var_keyword is False
+    assert MyArgumentedException.get_argument_plan(argumented_exception.handle) is plan
+    assert "handle" not in ArgumentedException._argument_plans
+
+
+def test_argument_plan_invalidated_on_reassign() -> None:
+    """
+    Test that reassigning a method rebuilds its plan.
+    """
+
+    class ReassignedException(ArgumentedException):
+        def handle(self, argument_1: str, **kwargs: typing.Any) -> None:
+            pass
+
+    exception = ReassignedException(**ARGS)
+    assert exception.get_kwargs_for_handle() == {"argument_1": ARGS["argument_1"]}
+    assert ReassignedException.get_argument_plan(exception.handle).accepts_var_keyword
+
+    def handle(self: ReassignedException, argument_2: int) -> None:
+        pass
+
+    ReassignedException.handle = handle  # type: ignore[assignment]
+    assert exception.get_kwargs_for_handle() == {"argument_2": ARGS["argument_2"]}
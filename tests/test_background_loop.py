@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import typing
+
+import pytest
+
+import aspreno
+
+
+class BackgroundExceptionHandler(aspreno.ExceptionHandler):
+    use_background_loop = True
+
+
+def test_no_running_loop() -> None:
+    class MyException(Exception):
+        async def report(self, **_: typing.Any) -> None:
+            pass
+
+    with pytest.raises(RuntimeError):
+        try:
+            raise MyException()
+        except MyException:
+            aspreno.ExceptionHandler().relay()
+
+
+def test_background_loop() -> None:
+    class MyException(Exception):
+        handle_thread: typing.Optional[threading.Thread] = None
+        report_thread: typing.Optional[threading.Thread] = None
+
+        async def handle(self, **_: typing.Any) -> None:
+            self.handle_thread = threading.current_thread()
+
+        async def report(self, **_: typing.Any) -> None:
+            self.report_thread = threading.current_thread()
+
+    handler = BackgroundExceptionHandler()
+    try:
+        raise MyException()
+    except MyException as exception:
+        handler.relay()
+        assert handler.shutdown(5)
+
+        assert exception.handle_thread is not None
+        assert exception.handle_thread is exception.report_thread
+        assert exception.handle_thread is not threading.current_thread()
+
+
+def test_shutdown_without_loop() -> None:
+    assert BackgroundExceptionHandler().shutdown(0)
+
+
+@pytest.mark.asyncio
+async def test_waiting_for_background_loop() -> None:
+    release = threading.Event()
+    report_threads: typing.List[threading.Thread] = []
+
+    class MyException(Exception):
+        async def report(self, **_: typing.Any) -> None:
+            if not report_threads:
+                await asyncio.get_running_loop().run_in_executor(None, release.wait)
+            report_threads.append(threading.current_thread())
+
+    def relay() -> None:
+        try:
+            raise MyException()
+        except MyException:
+            handler.relay()
+
+    # Debug mode rejects the tasks created from another thread than the loop's.
+    asyncio.get_running_loop().set_debug(True)
+    handler = BackgroundExceptionHandler()
+    handler.max_pending_tasks = 1
+    # Without a running loop, the first report runs in the background loop.
+    thread = threading.Thread(target=relay)
+    thread.start()
+    thread.join()
+    # The second one waits for its slot in the running loop.
+    relay()
+    assert handler.overflow_counts["wait"] == 1
+
+    release.set()
+    assert await handler.drain(5)
+    assert report_threads[1] is threading.current_thread()
+    assert handler.shutdown(5)
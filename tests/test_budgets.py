@@ -0,0 +1,112 @@
+import threading
+import time
+import typing
+
+import pytest
+
+import aspreno
+
+
+class SlowReport(Exception):
+    def __init__(self, delay: float) -> None:
+        super().__init__()
+        self.delay = delay
+        self.release = threading.Event()
+        self.report_thread: typing.Optional[threading.Thread] = None
+
+    def handle(self, **_: typing.Any) -> None:
+        pass
+
+    def report(self, **_: typing.Any) -> None:
+        self.report_thread = threading.current_thread()
+        self.release.wait(self.delay)
+
+
+class BudgetedHandler(aspreno.ExceptionHandler):
+    time_budget = 0.05
+
+
+def test_report_within_budget() -> None:
+    handler = BudgetedHandler()
+    error = SlowReport(0)
+    handler.handle(error)
+
+    assert error.report_thread is not threading.current_thread()
+    assert not handler.overrun_counts
+    handler.shutdown()
+
+
+def test_report_over_budget() -> None:
+    handler = BudgetedHandler()
+    handler.metrics = aspreno.InMemoryMetrics()
+    error = SlowReport(10)
+
+    started = time.perf_counter()
+    handler.handle(error)
+    assert time.perf_counter() - started < 5
+
+    assert handler.overrun_counts == {"SlowReport": 1}
+    assert handler.metrics.snapshot()["counters"]["overrun"] == {"SlowReport": 1}
+    error.release.set()
+    handler.shutdown()
+
+
+def test_report_failure_within_budget() -> None:
+    class BrokenReport(Exception):
+        def report(self, **_: typing.Any) -> None:
+            raise ValueError("report")
+
+    handler = BudgetedHandler()
+    with pytest.raises(ValueError):
+        handler.handle(BrokenReport())
+    handler.shutdown()
+
+
+def test_per_type_budgets() -> None:
+    class SubclassReport(SlowReport):
+        pass
+
+    class PerTypeHandler(aspreno.ExceptionHandler):
+        time_budgets = {SlowReport: 0.05}
+
+    handler = PerTypeHandler()
+    assert handler.get_time_budget(SubclassReport) == 0.05
+    assert handler.get_time_budget(KeyError) is None
+
+    error = SubclassReport(10)
+    handler.handle(error)
+    assert handler.overrun_counts == {"SubclassReport": 1}
+    error.release.set()
+    handler.shutdown()
+
+
+def test_handle_inline_by_default() -> None:
+    class MyException(Exception):
+        handle_thread: typing.Optional[threading.Thread] = None
+
+        def handle(self, **_: typing.Any) -> None:
+            self.handle_thread = threading.current_thread()
+
+    error = MyException()
+    BudgetedHandler().handle(error)
+    assert error.handle_thread is threading.current_thread()
+
+    class HandleBudgetedHandler(BudgetedHandler):
+        budget_handle = True
+
+    error = MyException()
+    HandleBudgetedHandler().handle(error)
+    assert error.handle_thread is not threading.current_thread()
+
+
+@pytest.mark.asyncio
+async def test_arelay_over_budget() -> None:
+    try:
+        raise SlowReport(10)
+    except SlowReport as error:
+        outcome = await BudgetedHandler().arelay()
+        error.release.set()
+
+    assert outcome.handled
+    assert not outcome.reported
+    assert outcome.timed_out
@@ -0,0 +1,88 @@
+import pickle
+import sys
+import typing
+import weakref
+
+import aspreno
+
+
+class Payload:
+    pass
+
+
+def fail(payload: Payload) -> None:
+    raise aspreno.ArgumentedException("it failed", user_id=42)
+
+
+def test_capture_record() -> None:
+    try:
+        fail(Payload())
+    except aspreno.ArgumentedException as exception:
+        record = aspreno.CaptureRecord.from_exception(exception)
+        expected_fingerprint = aspreno.fingerprint(type(exception), exception.__traceback__)
+
+    assert record.type_name == "aspreno.global_handler.ArgumentedException"
+    assert record.message == "it failed"
+    assert record.additional_args == {"user_id": 42}
+    assert record.fingerprint == expected_fingerprint
+    assert [frame.function for frame in record.frames] == ["test_capture_record", "fail"]
+    assert record.frames[-1].filename == __file__
+
+
+def test_capture_record_pickle() -> None:
+    try:
+        fail(Payload())
+    except aspreno.ArgumentedException as exception:
+        record = aspreno.CaptureRecord.from_exception(exception)
+
+    copy = pickle.loads(pickle.dumps(record))
+    for name in aspreno.CaptureRecord.__slots__:
+        assert getattr(copy, name) == getattr(record, name)
+
+
+def test_handler_gives_capture() -> None:
+    class MyException(Exception):
+        handle_capture: typing.Optional[aspreno.CaptureRecord] = None
+        report_capture: typing.Optional[aspreno.CaptureRecord] = None
+
+        def handle(self, capture: aspreno.CaptureRecord, **_: typing.Any) -> None:
+            self.handle_capture = capture
+
+        def report(self, capture: aspreno.CaptureRecord, **_: typing.Any) -> None:
+            self.report_capture = capture
+
+    class CapturingHandler(aspreno.ExceptionHandler):
+        capture_records = True
+
+    try:
+        raise MyException("message")
+    except MyException as exception:
+        CapturingHandler().relay()
+
+        assert exception.handle_capture is not None
+        assert exception.handle_capture is exception.report_capture
+        assert exception.handle_capture.message == "message"
+
+
+def test_clear_frames() -> None:
+    class ClearingHandler(aspreno.ExceptionHandler):
+        clear_frames = True
+
+    class MyException(Exception):
+        def report(self, capture: aspreno.CaptureRecord, **_: typing.Any) -> None:
+            self.capture = capture
+
+    def raise_with(payload: Payload) -> None:
+        raise MyException()
+
+    payload = Payload()
+    reference = weakref.ref(payload)
+    try:
+        raise_with(payload)
+    except MyException:
+        del payload
+        ClearingHandler().relay()
+        error = sys.exc_info()[1]
+
+    assert reference() is None
+    assert error is not None and error.capture.frames[-1].function == "raise_with"
@@ -0,0 +1,87 @@
+import pathlib
+import threading
+import typing
+
+import pytest
+
+import aspreno
+from aspreno.collector import decode_record, encode_record
+
+
+class CollectedException(aspreno.ArgumentedException):
+    def report(self, **_: typing.Any) -> None:
+        raise AssertionError("The sink replaces the report method.")
+
+
+class RecordingCollector(aspreno.Collector):
+    def __init__(self, address: typing.Any) -> None:
+        self.records: typing.List[aspreno.CaptureRecord] = []
+        self.event = threading.Event()
+        super().__init__(address, self.collect)
+
+    def collect(self, records: typing.List[aspreno.CaptureRecord]) -> None:
+        self.records.extend(records)
+        self.event.set()
+
+
+def capture(message: str) -> aspreno.CaptureRecord:
+    try:
+        raise CollectedException(message, request_id=7, payload=object())
+    except CollectedException as exception:
+        return aspreno.CaptureRecord.from_exception(exception)
+
+
+def test_encoding_round_trip() -> None:
+    record = capture("héllo")
+    decoded = decode_record(encode_record(record))
+
+    assert decoded.type_name == record.type_name
+    assert decoded.message == "héllo"
+    assert decoded.fingerprint == record.fingerprint
+    assert decoded.created_at == record.created_at
+    assert decoded.frames == record.frames
+    assert decoded.additional_args["request_id"] == 7
+    assert decoded.additional_args["payload"].startswith("<object object")
+
+
+@pytest.mark.parametrize("transport", ["unix", "tcp"])
+def test_sink_to_collector(tmp_path: pathlib.Path, transport: str) -> None:
+    address: typing.Any = (
+        str(tmp_path / "collector.sock") if transport == "unix" else ("127.0.0.1", 0)
+    )
+    collector = RecordingCollector(address)
+    collector.start()
+
+    sink = aspreno.CollectorSink(collector.server_address, workers=1, batch_size=10)
+
+    class SinkHandler(aspreno.ExceptionHandler):
+        report_pipeline = sink
+
+    handler = SinkHandler()
+    for index in range(5):
+        handler.handle(CollectedException(str(index)))
+    sink.join()
+    assert sink.shutdown(5)
+
+    assert collector.event.wait(5)
+    collector.shutdown()
+    assert sorted(record.message for record in collector.records) == ["0", "1", "2", "3", "4"]
+    assert sink.sent == 5
+
+
+def test_reconnect_with_backoff(tmp_path: pathlib.Path) -> None:
+    address = str(tmp_path / "collector.sock")
+    sink = aspreno.CollectorSink(address, workers=1, max_attempts=2, backoff=0.01)
+    assert sink.submit(aspreno.ReportRecord(CollectedException("lost"), {}))
+    sink.join()
+    assert sink.failed == 1
+
+    collector = RecordingCollector(address)
+    collector.start()
+    assert sink.submit(aspreno.ReportRecord(CollectedException("sent"), {}))
+    sink.join()
+    assert sink.shutdown(5)
+
+    assert collector.event.wait(5)
+    collector.shutdown()
+    assert [record.message for record in collector.records] == ["sent"]
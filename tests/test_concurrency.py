@@ -0,0 +1,64 @@
+import asyncio
+import threading
+import typing
+
+import pytest
+
+import aspreno
+
+
+class IgnoringHandler(aspreno.ExceptionHandler):
+    ignore_errors = [KeyError]
+
+
+class HandledException(Exception):
+    def handle(self, **_: typing.Any) -> None:
+        pass
+
+
+def test_relay_from_many_threads() -> None:
+    """
+    Hammer a handler from many threads and check each thread sees its own last exception.
+    """
+    handler = IgnoringHandler()
+    barrier = threading.Barrier(16)
+    inconsistencies: typing.List[str] = []
+
+    def work(index: int) -> None:
+        error_type: typing.Type[BaseException] = KeyError if index % 2 else HandledException
+        barrier.wait()
+        for _ in range(2_000):
+            try:
+                raise error_type()
+            except BaseException:
+                handler.relay()
+            if handler.should_report is (error_type is KeyError):
+                inconsistencies.append(f"Thread {index} saw the exception of another thread.")
+
+    threads = [threading.Thread(target=work, args=(index,)) for index in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert inconsistencies == []
+    # The main thread never received an exception.
+    assert handler.should_report
+
+
+@pytest.mark.asyncio
+async def test_relay_from_many_tasks() -> None:
+    handler = IgnoringHandler()
+
+    async def work(error_type: typing.Type[BaseException]) -> bool:
+        try:
+            raise error_type()
+        except BaseException:
+            handler.relay()
+        await asyncio.sleep(0)
+        return handler.should_report
+
+    results = await asyncio.gather(
+        *(work(KeyError if i % 2 else HandledException) for i in range(100))
+    )
+    assert results == [bool(i % 2 == 0) for i in range(100)]
@@ -0,0 +1,149 @@
+import asyncio
+import sys
+import threading
+import typing
+
+import pytest
+
+import aspreno
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 11), reason="ExceptionGroup is 3.11+")
+
+
+class Member(Exception):
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.handled_with: typing.Optional[typing.Dict[str, typing.Any]] = None
+
+    def handle(self, **kwargs: typing.Any) -> None:
+        self.handled_with = kwargs
+
+
+class Ignored(Member):
+    pass
+
+
+class GroupHandler(aspreno.ExceptionHandler):
+    ignore_errors = [Ignored]
+
+
+def raise_group(*members: BaseException) -> BaseException:
+    try:
+        raise ExceptionGroup("group", list(members))
+    except ExceptionGroup as group:
+        return group
+
+
+def test_dispatch_plan() -> None:
+    handler = GroupHandler()
+    assert handler.get_dispatch_plan(ExceptionGroup).is_group
+    assert not handler.get_dispatch_plan(ValueError).is_group
+
+    class SelfHandledGroup(ExceptionGroup):
+        def handle(self, **_: typing.Any) -> None:
+            pass
+
+    assert not handler.get_dispatch_plan(SelfHandledGroup).is_group
+
+
+def test_handle_members() -> None:
+    first, second, ignored = Member("first"), Member("second"), Ignored("ignored")
+    nested = raise_group(second, ignored)
+    group = raise_group(first, nested)
+
+    handler = GroupHandler()
+    assert handler.get_group_members(group) == [first, second, ignored]
+    handler.handle(group, traceback=group.__traceback__)
+
+    assert first.handled_with is not None and second.handled_with is not None
+    assert first.handled_with["traceback"] is first.__traceback__
+    assert ignored.handled_with is None
+
+
+def test_handle_member_failures() -> None:
+    class Broken(Exception):
+        def handle(self, **_: typing.Any) -> None:
+            raise ValueError("broken")
+
+    member = Member("member")
+    with pytest.raises(ExceptionGroup) as caught:
+        GroupHandler().handle(raise_group(Broken(), member))
+
+    assert [str(failure) for failure in caught.value.exceptions] == ["broken"]
+    assert member.handled_with is not None
+
+
+@pytest.mark.asyncio
+async def test_arelay_runs_members_concurrently() -> None:
+    first_started, second_started = asyncio.Event(), asyncio.Event()
+
+    class First(Exception):
+        async def handle(self, **_: typing.Any) -> None:
+            first_started.set()
+            await second_started.wait()
+
+    class Second(Exception):
+        async def handle(self, **_: typing.Any) -> None:
+            second_started.set()
+            await first_started.wait()
+
+    try:
+        raise ExceptionGroup("group", [First(), Second(), Ignored("ignored")])
+    except ExceptionGroup:
+        outcome = await GroupHandler().arelay(timeout=5)
+
+    assert [member.handled for member in outcome.members] == [True, True, False]
+    assert outcome.members[2].ignored
+    assert outcome.handled
+    assert not outcome.timed_out
+    assert not outcome.failed
+
+
+def test_unhandled_members_fall_back_once(capsys: pytest.CaptureFixture[str]) -> None:
+    handled = Member("handled")
+    group = raise_group(handled, ValueError(1), KeyError(2))
+
+    GroupHandler()._global_handler(ExceptionGroup, group, group.__traceback__)
+
+    assert handled.handled_with is not None
+    error = capsys.readouterr().err
+    assert error.startswith("  + Exception Group Traceback (most recent call last):")
+    assert error.count("ExceptionGroup: group (3 sub-exceptions)") == 1
+    assert "ValueError: 1" in error and "KeyError: 2" in error
+
+
+def test_unhandled_members_from_thread() -> None:
+    fallbacks: typing.List[BaseException] = []
+    threading.excepthook = lambda args: fallbacks.append(args.exc_value)
+    aspreno.register_global_handler(GroupHandler(), unraisable=False)
+    group = ExceptionGroup("group", [ValueError(1), KeyError(2), TypeError(3)])
+
+    def fail() -> None:
+        raise group
+
+    try:
+        thread = threading.Thread(target=fail)
+        thread.start()
+        thread.join()
+    finally:
+        aspreno.reset_global_handler()
+        threading.excepthook = threading.__excepthook__
+
+    assert fallbacks == [group]
+
+
+@pytest.mark.asyncio
+async def test_arelay_unhandled_members_fall_back_once() -> None:
+    handler = GroupHandler()
+    fallbacks: typing.List[BaseException] = []
+    handler.old_excepthook = lambda error_type, error, traceback: fallbacks.append(error)
+    handled = Member("handled")
+
+    try:
+        raise ExceptionGroup("group", [handled, ValueError(1), KeyError(2)])
+    except ExceptionGroup as group:
+        outcome = await handler.arelay(timeout=5)
+        assert fallbacks == [group]
+
+    assert [member.handled for member in outcome.members] == [True, False, False]
+    assert not outcome.handled
@@ -1,5 +1,6 @@
 import asyncio
 import sys
+import threading
 import typing
 
 import pytest
@@ -10,6 +11,8 @@ import aspreno
 @pytest.fixture(autouse=True)
 def teardown_method() -> None:
     sys.excepthook = sys.__excepthook__
+    sys.unraisablehook = sys.__unraisablehook__
+    threading.excepthook = threading.__excepthook__
 
 
 @pytest.fixture
@@ -68,7 +71,7 @@ async def test_relay_async(handler: aspreno.ExceptionHandler) -> None:
         raise SignalException()
     except SignalException as exception:
         handler.relay()
-        await asyncio.sleep(1)
+        await handler.drain()
 
         assert exception.handle_called
         assert exception.report_called
@@ -109,7 +112,7 @@ async def test_handle_async() -> None:
         raise ValueError("This is a test")
     except ValueError as exception:
         sys.excepthook(type(exception), exception, exception.__traceback__)
-        await asyncio.sleep(1)
+        await handler.drain()
         assert handler.was_handle_called
 
 
@@ -203,7 +206,7 @@ async def test_handle_exception_argumented_async(handler: aspreno.ExceptionHandl
         raise MyException(**{"arg1": "arg1", "arg2": "arg2"})
     except MyException as exception:
         sys.excepthook(type(exception), exception, exception.__traceback__)
-        await asyncio.sleep(1)
+        await handler.drain()
         assert exception.error == exception
         assert exception.arg1 == "arg1"
         assert exception.arg2 == "arg2"
@@ -224,7 +227,7 @@ async def test_handle_exception_async(handler: aspreno.ExceptionHandler) -> None
         raise MyException()
     except MyException as exception:
         sys.excepthook(type(exception), exception, exception.__traceback__)
-        await asyncio.sleep(1)
+        await handler.drain()
         assert exception.was_handle_called
 
 
@@ -258,7 +261,7 @@ async def test_report_exception_async(handler: aspreno.ExceptionHandler) -> None
         raise MyException()
     except MyException as exception:
         sys.excepthook(type(exception), exception, exception.__traceback__)
-        await asyncio.sleep(1)
+        await handler.drain()
         assert exception.was_report_called
 
 
@@ -336,8 +339,336 @@ async def test_report_exception_argumented_async(handler: aspreno.ExceptionHandl
         raise MyException(**{"arg1": "arg1", "arg2": "arg2"})
     except MyException as exception:
         sys.excepthook(type(exception), exception, exception.__traceback__)
-        await asyncio.sleep(1)
+        await handler.drain()
         assert exception.error == exception
         assert exception.arg1 == "arg1"
         assert exception.arg2 == "arg2"
         assert exception.traceback is not None
+
+
+def test_dispatch_plan_cache(handler: aspreno.ExceptionHandler) -> None:
+    class MyException(Exception):
+        async def report(self, **_: typing.Any) -> None:
+            pass
+
+    plan = handler.get_dispatch_plan(MyException)
+    assert not plan.has_handle
+    assert plan.has_report and plan.report_is_coroutine
+    assert handler.get_dispatch_plan(MyException) is plan
+
+    handler.invalidate_dispatch_cache(MyException)
+    assert handler.get_dispatch_plan(MyException) is not plan
+
+
+def test_dispatch_plan_cache_is_bounded(handler: aspreno.ExceptionHandler) -> None:
+    handler.dispatch_cache_size = 4
+    error_types = [type(f"DynamicException{i}", (Exception,), {}) for i in range(10)]
+
+    for error_type in error_types:
+        handler.get_dispatch_plan(error_type)
+
+    assert list(handler._dispatch_cache) == error_types[-4:]
+
+    handler.invalidate_dispatch_cache()
+    assert not handler._dispatch_cache
+
+
+def test_ignore_exception_subclass() -> None:
+    class SignalExceptionHandler(aspreno.ExceptionHandler):
+        ignore_errors = [OSError, LookupError]
+
+    handler = SignalExceptionHandler()
+    assert handler.is_ignored(ConnectionResetError)
+    assert handler.is_ignored(KeyError)
+    assert not handler.is_ignored(ValueError)
+
+    handler.ignore_errors.append(ValueError)
+    assert handler.is_ignored(ValueError)
+
+    handler.ignore_errors = []
+    assert not handler.is_ignored(ConnectionResetError)
+
+
+@pytest.mark.asyncio
+async def test_pending_tasks_wait(handler: aspreno.ExceptionHandler) -> None:
+    handler.max_pending_tasks = 1
+    release = asyncio.Event()
+    reported: typing.List[int] = []
+
+    class MyException(Exception):
+        async def report(self, **_: typing.Any) -> None:
+            await release.wait()
+            reported.append(id(self))
+
+    for _ in range(3):
+        try:
+            raise MyException()
+        except MyException:
+            handler.relay()
+
+    assert handler.overflow_counts["wait"] == 2
+    assert not await handler.drain(0.05)
+
+    release.set()
+    assert await handler.drain(1)
+    assert len(reported) == 3
+
+
+@pytest.mark.asyncio
+async def test_pending_tasks_drop(handler: aspreno.ExceptionHandler) -> None:
+    handler.max_pending_tasks = 1
+    handler.task_overflow_policy = "drop"
+    reported: typing.List[int] = []
+
+    class MyException(Exception):
+        async def report(self, **_: typing.Any) -> None:
+            reported.append(id(self))
+
+    for _ in range(3):
+        try:
+            raise MyException()
+        except MyException:
+            handler.relay()
+
+    assert await handler.drain(1)
+    assert handler.overflow_counts["drop"] == 2
+    assert len(reported) == 1
+
+
+@pytest.mark.asyncio
+async def test_pending_tasks_max_waiting(handler: aspreno.ExceptionHandler) -> None:
+    handler.max_pending_tasks = 1
+    handler.max_waiting_tasks = 1
+    release = asyncio.Event()
+    reported: typing.List[int] = []
+
+    class MyException(Exception):
+        async def report(self, **_: typing.Any) -> None:
+            await release.wait()
+            reported.append(id(self))
+
+    for _ in range(4):
+        try:
+            raise MyException()
+        except MyException:
+            handler.relay()
+
+    assert handler.overflow_counts == {"wait": 1, "drop": 2}
+    release.set()
+    assert await handler.drain(1)
+    assert len(reported) == 2
+
+
+@pytest.mark.asyncio
+async def test_no_pending_tasks(handler: aspreno.ExceptionHandler) -> None:
+    handler.max_pending_tasks = 0
+
+    class MyException(Exception):
+        async def report(self, **_: typing.Any) -> None:
+            raise AssertionError("Coroutines must not run.")
+
+    try:
+        raise MyException()
+    except MyException:
+        handler.relay()
+
+    assert await handler.drain(1)
+    assert handler.overflow_counts == {"drop": 1}
+
+
+def test_routes() -> None:
+    class RoutedHandler(aspreno.ExceptionHandler):
+        routed: typing.List[typing.Tuple[str, BaseException]] = []
+
+        @aspreno.route(LookupError)
+        def on_lookup_error(self, error: BaseException, **kwargs: typing.Any) -> None:
+            self.routed.append(("lookup", error))
+
+        @aspreno.route(KeyError, ZeroDivisionError)
+        def on_key_error(self, error: BaseException, **kwargs: typing.Any) -> None:
+            self.routed.append(("key", error))
+
+    class SelfHandledError(IndexError):
+        def handle(self, **kwargs: typing.Any) -> None:
+            raise AssertionError("Routes take precedence over self-handling.")
+
+    handler = RoutedHandler()
+    errors = [IndexError(), KeyError(), ZeroDivisionError(), SelfHandledError()]
+    for error in errors:
+        handler.handle(error)
+
+    assert handler.routed == [
+        ("lookup", errors[0]),
+        ("key", errors[1]),
+        ("key", errors[2]),
+        ("lookup", errors[3]),
+    ]
+    assert handler.get_route(ValueError) is None
+
+
+def test_handle_unrouted() -> None:
+    class SelfHandledError(ValueError):
+        handled = False
+
+        def handle(self, **_: typing.Any) -> None:
+            self.handled = True
+
+    class RoutedHandler(aspreno.ExceptionHandler):
+        @aspreno.route(ValueError)
+        def on_value_error(self, error: BaseException, **kwargs: typing.Any) -> None:
+            if str(error) != "known":
+                self.handle_unrouted(error, **kwargs)
+
+    fallen_back: typing.List[BaseException] = []
+    handler = RoutedHandler()
+    handler.old_excepthook = lambda error_type, error, traceback: fallen_back.append(error)
+
+    known, unknown, self_handled = ValueError("known"), ValueError("unknown"), SelfHandledError()
+    for error in (known, unknown, self_handled):
+        handler.handle(error)
+
+    assert fallen_back == [unknown]
+    assert self_handled.handled
+
+
+def test_added_routes(handler: aspreno.ExceptionHandler) -> None:
+    class MyException(Exception):
+        was_handle_called: bool = False
+
+        def handle(self, **_: typing.Any) -> None:
+            self.was_handle_called = True
+
+    routed: typing.List[BaseException] = []
+    handler.add_route(MyException, lambda error, **_: routed.append(error))
+
+    error = MyException()
+    handler.handle(error)
+    assert routed == [error]
+    assert not error.was_handle_called
+
+    handler.remove_route(MyException)
+    handler.handle(error)
+    assert routed == [error]
+    assert error.was_handle_called
+
+
+@pytest.mark.asyncio
+async def test_arelay(handler: aspreno.ExceptionHandler) -> None:
+    class SignalException(Exception):
+        handle_called = False
+        report_called = False
+
+        async def handle(self, **_: typing.Any) -> None:
+            self.handle_called = True
+
+        def report(self, **_: typing.Any) -> None:
+            self.report_called = True
+
+    try:
+        raise SignalException()
+    except SignalException as exception:
+        outcome = await handler.arelay()
+
+        assert exception.handle_called
+        assert exception.report_called
+        assert outcome.error is exception
+
+    assert outcome.handled
+    assert outcome.reported
+    assert not outcome.timed_out
+    assert not outcome.failed
+
+
+@pytest.mark.asyncio
+async def test_arelay_no_exception(handler: aspreno.ExceptionHandler) -> None:
+    with pytest.raises(RuntimeError):
+        await handler.arelay()
+
+
+@pytest.mark.asyncio
+async def test_arelay_timeout(handler: aspreno.ExceptionHandler) -> None:
+    class SlowException(Exception):
+        cancelled = False
+
+        def handle(self, **_: typing.Any) -> None:
+            pass
+
+        async def report(self, **_: typing.Any) -> None:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+
+    try:
+        raise SlowException()
+    except SlowException as exception:
+        outcome = await handler.arelay(timeout=0.01)
+        await asyncio.sleep(0)
+
+        assert exception.cancelled
+
+    assert outcome.handled
+    assert not outcome.reported
+    assert outcome.timed_out
+
+
+@pytest.mark.asyncio
+async def test_arelay_failures(handler: aspreno.ExceptionHandler) -> None:
+    class BrokenException(Exception):
+        def handle(self, **_: typing.Any) -> None:
+            raise ValueError("handle")
+
+        async def report(self, **_: typing.Any) -> None:
+            raise ValueError("report")
+
+    try:
+        raise BrokenException()
+    except BrokenException:
+        outcome = await handler.arelay()
+
+    assert outcome.failed
+    assert [str(failure) for failure in outcome.failures] == ["handle", "report"]
+    assert not outcome.handled
+    assert not outcome.reported
+
+
+@pytest.mark.asyncio
+async def test_arelay_ignored() -> None:
+    class IgnoringHandler(aspreno.ExceptionHandler):
+        ignore_errors = [KeyError]
+
+    try:
+        raise KeyError()
+    except KeyError:
+        outcome = await IgnoringHandler().arelay()
+
+    assert outcome.ignored
+    assert not outcome.handled
+
+
+def test_subclass_without_super_init() -> None:
+    """
+    See if subclasses defining "__init__" without calling the parent's one still work.
+    """
+
+    class ConfiguredHandler(aspreno.ExceptionHandler):
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+    class SignalException(Exception):
+        handled = False
+
+        def handle(self, **kwargs: typing.Any) -> None:
+            self.handled = True
+
+    handler = ConfiguredHandler("configured")
+    error = SignalException()
+    with handler.guard:
+        raise error
+
+    assert error.handled
+    assert handler.should_report
+    assert not handler.overrun_counts
+    with pytest.raises(AttributeError):
+        handler.missing  # type: ignore[attr-defined]
@@ -0,0 +1,107 @@
+import subprocess
+import sys
+import typing
+
+import aspreno
+
+
+def raise_value_error() -> None:
+    raise ValueError("Storm")
+
+
+def catch(function: typing.Callable[[], None]) -> BaseException:
+    try:
+        function()
+    except BaseException as exception:
+        return exception
+    raise AssertionError("Nothing has been raised.")
+
+
+def test_fingerprint() -> None:
+    first, second = catch(raise_value_error), catch(raise_value_error)
+    assert aspreno.fingerprint(type(first), first.__traceback__) == aspreno.fingerprint(
+        type(second), second.__traceback__
+    )
+
+    def raise_elsewhere() -> None:
+        raise ValueError("Storm")
+
+    third = catch(raise_elsewhere)
+    assert aspreno.fingerprint(type(first), first.__traceback__) != aspreno.fingerprint(
+        type(third), third.__traceback__
+    )
+    assert aspreno.fingerprint(ValueError, None) != aspreno.fingerprint(KeyError, None)
+
+
+def test_coalescer() -> None:
+    coalescer = aspreno.StormCoalescer(window=10)
+    error = ValueError()
+
+    assert coalescer.observe(1, error, now=100)
+    assert not coalescer.observe(1, error, now=101)
+    assert not coalescer.observe(1, error, now=105)
+    assert coalescer.observe(2, error, now=105)
+    assert coalescer.collect(now=106) == []
+
+    (report,) = coalescer.collect(now=110)
+    assert (report.fingerprint, report.count, report.first_seen, report.last_seen) == (
+        1,
+        3,
+        100,
+        105,
+    )
+    assert coalescer.observe(1, error, now=111)
+    # The window of fingerprint 2 only saw one occurrence, which has already been reported.
+    assert coalescer.collect(now=200) == []
+
+
+def test_handler_coalesces_reports() -> None:
+    class StormException(Exception):
+        reports: typing.ClassVar[int] = 0
+        aggregates: typing.ClassVar[typing.List[aspreno.CoalescedReport]] = []
+
+        def report(self, **_: typing.Any) -> None:
+            StormException.reports += 1
+
+        def report_aggregate(self, report: aspreno.CoalescedReport) -> None:
+            StormException.aggregates.append(report)
+
+    def raise_storm() -> None:
+        raise StormException()
+
+    handler = aspreno.ExceptionHandler()
+    handler.coalescer = aspreno.StormCoalescer(window=60)
+    for _ in range(100):
+        try:
+            raise_storm()
+        except StormException:
+            handler.relay()
+
+    assert StormException.reports == 1
+    handler.shutdown()
+    assert [report.count for report in StormException.aggregates] == [100]
+
+
+def test_aggregates_reported_at_exit() -> None:
+    code = """
+import aspreno
+
+class StormException(Exception):
+    def report(self, **_):
+        pass
+
+    def report_aggregate(self, report):
+        print(report.count)
+
+handler = aspreno.ExceptionHandler()
+handler.coalescer = aspreno.StormCoalescer(window=60)
+for _ in range(3):
+    try:
+        raise StormException()
+    except StormException:
+        handler.relay()
+"""
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    assert output == "3\n"
@@ -0,0 +1,123 @@
+import typing
+
+import pytest
+
+import aspreno
+
+
+class SignalException(Exception):
+    def __init__(self) -> None:
+        super().__init__()
+        self.handled = False
+        self.reported = False
+
+    def handle(self, **_: typing.Any) -> None:
+        self.handled = True
+
+    def report(self, **_: typing.Any) -> None:
+        self.reported = True
+
+
+@pytest.fixture
+def handler() -> aspreno.ExceptionHandler:
+    return aspreno.ExceptionHandler()
+
+
+def test_guard_context_manager(handler: aspreno.ExceptionHandler) -> None:
+    error = SignalException()
+    with handler.guard:
+        raise error
+
+    assert error.handled and error.reported
+
+
+def test_guard_reraise(handler: aspreno.ExceptionHandler) -> None:
+    error = SignalException()
+    with pytest.raises(SignalException):
+        with handler.guard(reraise=True):
+            raise error
+
+    assert error.handled
+    assert handler.guard(reraise=True) is handler.guard(reraise=True)
+    assert handler.guard(reraise=True)(reraise=False) is handler.guard
+
+
+def test_guard_lets_base_exceptions_through(handler: aspreno.ExceptionHandler) -> None:
+    with pytest.raises(KeyboardInterrupt):
+        with handler.guard:
+            raise KeyboardInterrupt()
+
+
+def test_guard_ignored(handler: aspreno.ExceptionHandler) -> None:
+    handler.ignore_errors = [SignalException]
+    error = SignalException()
+    with handler.guard:
+        raise error
+
+    assert not error.handled
+
+
+def test_guard_decorator(handler: aspreno.ExceptionHandler) -> None:
+    error = SignalException()
+
+    @handler.guard
+    def fails() -> None:
+        raise error
+
+    @handler.guard(reraise=True)
+    def succeeds(value: int) -> int:
+        return value
+
+    assert fails() is None
+    assert error.handled
+    assert succeeds(2) == 2
+    assert fails.__name__ == "fails"
+
+
+@pytest.mark.asyncio
+async def test_guard_async(handler: aspreno.ExceptionHandler) -> None:
+    first, second = SignalException(), SignalException()
+
+    async with handler.guard:
+        raise first
+
+    @handler.guard(reraise=True)
+    async def fails() -> None:
+        raise second
+
+    with pytest.raises(SignalException):
+        await fails()
+    assert first.handled and second.handled
+
+
+class AsyncReportedException(SignalException):
+    async def report(self, **_: typing.Any) -> None:
+        self.reported = True
+
+
+@pytest.mark.parametrize("reraise", [False, True])
+def test_guard_without_loop(handler: aspreno.ExceptionHandler, reraise: bool) -> None:
+    guard = handler.guard(reraise=reraise)
+
+    @guard
+    def fail(error: BaseException) -> None:
+        raise error
+
+    # The report cannot be scheduled, but the exception is still swallowed or raised as is.
+    error = AsyncReportedException()
+    if reraise:
+        with pytest.raises(AsyncReportedException) as raised:
+            fail(error)
+        assert raised.value is error
+    else:
+        fail(error)
+    assert error.handled and not error.reported
+
+    error = AsyncReportedException()
+    try:
+        with guard:
+            raise error
+    except AsyncReportedException as raised_error:
+        assert reraise and raised_error is error
+    else:
+        assert not reraise
@@ -0,0 +1,71 @@
+import collections
+import random
+import typing
+
+import aspreno
+
+
+def test_exact_below_capacity() -> None:
+    heavy_hitters = aspreno.HeavyHitters(capacity=4)
+    for name, count in (("A", 5), ("B", 3), ("C", 1)):
+        for _ in range(count):
+            heavy_hitters.add(name, 0)
+
+    assert heavy_hitters.top(2) == [
+        aspreno.HeavyHitter("A", 0, 5, 0),
+        aspreno.HeavyHitter("B", 0, 3, 0),
+    ]
+    assert heavy_hitters.total == 9
+
+
+def test_fixed_memory() -> None:
+    heavy_hitters = aspreno.HeavyHitters(capacity=16)
+    actual: typing.Counter[int] = collections.Counter()
+    generator = random.Random(0)
+    for _ in range(5000):
+        # Two frequent exceptions in a long tail of rare ones.
+        roll = generator.random()
+        fingerprint = 1 if roll < 0.3 else 2 if roll < 0.5 else generator.randrange(10_000) + 3
+        heavy_hitters.add("ValueError", fingerprint)
+        actual[fingerprint] += 1
+
+    assert len(heavy_hitters) == 16
+    top = heavy_hitters.top(2)
+    assert [item.fingerprint for item in top] == [1, 2]
+    for item in top:
+        assert item.occurrences - item.error <= actual[item.fingerprint] <= item.occurrences
+
+
+def test_merge() -> None:
+    first = aspreno.HeavyHitters(capacity=3)
+    second = aspreno.HeavyHitters(capacity=3)
+    for _ in range(10):
+        first.add("A", 1)
+        second.add("A", 1)
+    second.add("B", 2, count=4)
+
+    first.merge(second.snapshot())
+    assert first.top(1) == [aspreno.HeavyHitter("A", 1, 20, 0)]
+    assert first.top(2)[1].type_name == "B"
+    assert first.total == 24
+
+
+def test_handler_feeds_heavy_hitters() -> None:
+    class MyException(Exception):
+        def handle(self, **_: typing.Any) -> None:
+            pass
+
+    class CountingHandler(aspreno.ExceptionHandler):
+        heavy_hitters = aspreno.HeavyHitters()
+
+    handler = CountingHandler()
+    for _ in range(3):
+        try:
+            raise MyException()
+        except MyException:
+            handler.relay()
+
+    assert handler.heavy_hitters is not None
+    (top,) = handler.heavy_hitters.top()
+    assert top.type_name.endswith("MyException")
+    assert top.occurrences == 3
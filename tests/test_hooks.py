@@ -0,0 +1,145 @@
+import asyncio
+import gc
+import sys
+import threading
+import typing
+
+import pytest
+
+import aspreno
+
+
+@pytest.fixture(autouse=True)
+def teardown_method() -> typing.Iterator[None]:
+    yield
+    aspreno.reset_global_handler()
+    sys.excepthook = sys.__excepthook__
+    sys.unraisablehook = sys.__unraisablehook__
+    threading.excepthook = threading.__excepthook__
+
+
+class RecordingHandler(aspreno.ExceptionHandler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.handled: typing.List[BaseException] = []
+
+    def handle(self, error: BaseException, **kwargs: typing.Any) -> None:
+        self.handled.append(error)
+        if not isinstance(error, KeyError):
+            super().handle(error, **kwargs)
+
+
+def test_threading_excepthook_without_loop() -> None:
+    class AsyncHandler(aspreno.ExceptionHandler):
+        async def handle(self, error: BaseException, **kwargs: typing.Any) -> None:
+            super().handle(error, **kwargs)
+
+    fallbacks: typing.List[BaseException] = []
+    threading.excepthook = lambda args: fallbacks.append(args.exc_value)
+    aspreno.register_global_handler(AsyncHandler())
+
+    error = ValueError()
+
+    def fail() -> None:
+        raise error
+
+    thread = threading.Thread(target=fail)
+    thread.start()
+    thread.join()
+
+    assert fallbacks == [error]
+
+
+class AsyncReportedException(Exception):
+    handled = False
+
+    async def report(self, **_: typing.Any) -> None:
+        pass
+
+
+class HandledAsyncReportedException(AsyncReportedException):
+    def handle(self, **_: typing.Any) -> None:
+        self.handled = True
+
+
+@pytest.mark.parametrize("error_type", [AsyncReportedException, HandledAsyncReportedException])
+def test_threading_excepthook_async_report_without_loop(
+    error_type: typing.Type[AsyncReportedException],
+) -> None:
+    fallbacks: typing.List[BaseException] = []
+    threading.excepthook = lambda args: fallbacks.append(args.exc_value)
+    aspreno.register_global_handler(aspreno.ExceptionHandler())
+
+    error = error_type()
+
+    def fail() -> None:
+        raise error
+
+    thread = threading.Thread(target=fail)
+    thread.start()
+    thread.join()
+
+    # The exception goes either to the handler or to the previous hook, never to both.
+    assert fallbacks == [error]
+    assert not error.handled
+
+
+def test_threading_excepthook() -> None:
+    handler = RecordingHandler()
+    fallbacks: typing.List[BaseException] = []
+    threading.excepthook = lambda args: fallbacks.append(args.exc_value)
+    aspreno.register_global_handler(handler)
+
+    def fail(error: BaseException) -> None:
+        raise error
+
+    errors = [KeyError("handled"), ValueError("not handled"), SystemExit()]
+    for error in errors:
+        thread = threading.Thread(target=fail, args=(error,))
+        thread.start()
+        thread.join()
+
+    assert handler.handled == errors[:2]
+    assert fallbacks == errors[1:]
+
+    aspreno.reset_global_handler()
+    assert threading.excepthook is not handler._threading_excepthook
+
+
+def test_unraisablehook() -> None:
+    handler = RecordingHandler()
+    aspreno.register_global_handler(handler)
+
+    class Finalized:
+        def __del__(self) -> None:
+            raise KeyError("from __del__")
+
+    Finalized()
+    gc.collect()
+
+    assert len(handler.handled) == 1
+    assert isinstance(handler.handled[0], KeyError)
+
+    aspreno.reset_global_handler()
+    assert sys.unraisablehook is sys.__unraisablehook__
+
+
+@pytest.mark.asyncio
+async def test_loop_exception_handler() -> None:
+    handler = RecordingHandler()
+    loop = asyncio.get_running_loop()
+    previous_contexts: typing.List[typing.Dict[str, typing.Any]] = []
+    loop.set_exception_handler(lambda _, context: previous_contexts.append(context))
+    aspreno.register_global_handler(handler)
+
+    error = KeyError("orphaned")
+    loop.call_exception_handler(
+        {"message": "Task exception was never retrieved", "exception": error}
+    )
+    loop.call_exception_handler({"message": "No exception"})
+
+    assert handler.handled == [error]
+    assert [context["message"] for context in previous_contexts] == ["No exception"]
+
+    aspreno.reset_global_handler()
+    assert loop.get_exception_handler() is not handler._loop_exception_handler
@@ -0,0 +1,69 @@
+import subprocess
+import sys
+
+import pytest
+
+import aspreno
+
+
+def test_import_is_lazy() -> None:
+    """
+    Test that importing Aspreno does not import heavy modules it only needs later.
+    """
+    code = (
+        "import sys, aspreno;"
+        "print(','.join(m for m in ('asyncio', 'inspect', 'importlib.metadata') "
+        "if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    assert output.strip() == ""
+
+
+def test_optional_features_are_lazy() -> None:
+    """
+    Test that importing Aspreno does not import the modules of its optional features.
+    """
+    code = "import sys, aspreno;print(','.join(sorted(m for m in sys.modules if 'aspreno' in m)))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    assert output.strip().split(",") == [
+        "aspreno",
+        "aspreno._tasks",
+        "aspreno._utils",
+        "aspreno.fingerprint",
+        "aspreno.global_handler",
+        "aspreno.guard",
+    ]
+
+
+def test_lazy_names() -> None:
+    from aspreno import Spool
+
+    assert aspreno.Spool is Spool
+    assert "TracebackRenderer" in dir(aspreno)
+    with pytest.raises(AttributeError):
+        aspreno.Missing  # type: ignore[attr-defined]
+
+
+def test_iscoroutinefunction_without_inspect() -> None:
+    code = (
+        "import functools, sys\n"
+        "from aspreno._utils import iscoroutinefunction\n"
+        "class Error(Exception):\n"
+        "    async def handle(self): pass\n"
+        "    def report(self): pass\n"
+        "assert iscoroutinefunction(Error().handle)\n"
+        "assert iscoroutinefunction(functools.partial(Error.handle, None))\n"
+        "assert not iscoroutinefunction(Error().report)\n"
+        "assert not iscoroutinefunction(None)\n"
+        "assert 'inspect' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_metadata() -> None:
+    assert aspreno.__version__
+    assert aspreno.__author__
@@ -0,0 +1,90 @@
+import gc
+import sys
+import threading
+import typing
+import warnings
+
+import pytest
+
+import aspreno
+
+
+@pytest.fixture(autouse=True)
+def teardown_method() -> None:
+    sys.excepthook = sys.__excepthook__
+    sys.unraisablehook = sys.__unraisablehook__
+    threading.excepthook = threading.__excepthook__
+
+
+class MeasuredException(Exception):
+    def handle(self, **_: typing.Any) -> None:
+        pass
+
+    def report(self, **_: typing.Any) -> None:
+        pass
+
+
+def test_metrics() -> None:
+    class MeasuredHandler(aspreno.ExceptionHandler):
+        ignore_errors = [KeyError]
+
+    handler = MeasuredHandler()
+    metrics = handler.metrics = aspreno.InMemoryMetrics()
+    handler.old_excepthook = lambda *_: None
+
+    for error in (MeasuredException(), MeasuredException(), KeyError(), ValueError()):
+        try:
+            raise error
+        except Exception:
+            handler.relay()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {"ignored": {"KeyError": 1}, "fallback": {"ValueError": 1}}
+    assert snapshot["latencies"]["handle"]["MeasuredException"]["count"] == 2
+    assert snapshot["latencies"]["report"]["MeasuredException"]["buckets"]["+Inf"] == 2
+
+    text = metrics.to_prometheus()
+    assert 'aspreno_ignored_total{exception="KeyError"} 1' in text
+    assert 'aspreno_handle_seconds_count{exception="MeasuredException"} 2' in text
+
+
+@pytest.mark.asyncio
+async def test_metrics_scheduled() -> None:
+    class AsyncException(Exception):
+        async def report(self, **_: typing.Any) -> None:
+            pass
+
+    handler = aspreno.ExceptionHandler()
+    handler.old_excepthook = lambda *_: None
+    metrics = handler.metrics = aspreno.InMemoryMetrics()
+
+    try:
+        raise AsyncException()
+    except AsyncException:
+        handler.relay()
+    await handler.drain()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["scheduled"] == {"AsyncException": 1}
+    assert snapshot["latencies"]["report"]["AsyncException"]["count"] == 1
+
+    outcome = await handler.ahandle(AsyncException())
+    assert outcome.reported
+    assert metrics.snapshot()["latencies"]["report"]["AsyncException"]["count"] == 2
+
+
+def test_metrics_without_loop() -> None:
+    class AsyncException(Exception):
+        async def report(self, **_: typing.Any) -> None:
+            pass
+
+    handler = aspreno.ExceptionHandler()
+    handler.metrics = aspreno.InMemoryMetrics()
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        with pytest.raises(RuntimeError):
+            handler.handle(AsyncException())
+        # Unawaited coroutines warn once they are collected.
+        gc.collect()
+    assert not [warning for warning in caught if "never awaited" in str(warning.message)]
@@ -0,0 +1,84 @@
+import threading
+import time
+import typing
+
+import aspreno
+
+
+class RecordingPipeline(aspreno.ReportPipeline):
+    def __init__(self, **kwargs: typing.Any) -> None:
+        super().__init__(**kwargs)
+        self.batches: typing.List[typing.List[aspreno.ReportRecord]] = []
+
+    def report_batch(self, records: typing.List[aspreno.ReportRecord]) -> None:
+        self.batches.append(records)
+        super().report_batch(records)
+
+
+class ReportedException(Exception):
+    report_thread: typing.Optional[threading.Thread] = None
+
+    def report(self, **_: typing.Any) -> None:
+        self.report_thread = threading.current_thread()
+
+
+def test_report_in_pipeline() -> None:
+    handler = aspreno.ExceptionHandler()
+    handler.report_pipeline = RecordingPipeline()
+
+    try:
+        raise ReportedException()
+    except ReportedException as exception:
+        handler.relay()
+        assert handler.shutdown(5)
+
+        assert exception.report_thread is not None
+        assert exception.report_thread is not threading.current_thread()
+
+
+def test_report_batch() -> None:
+    pipeline = RecordingPipeline(batch_size=10, batch_interval=1)
+    errors = [ReportedException() for _ in range(25)]
+
+    for error in errors:
+        assert pipeline.submit(aspreno.ReportRecord(error, {}))
+    assert pipeline.shutdown(5)
+
+    assert [len(batch) for batch in pipeline.batches] == [10, 10, 5]
+    assert all(error.report_thread is not None for error in errors)
+
+
+def test_full_queue_drops() -> None:
+    release = threading.Event()
+
+    class BlockedPipeline(aspreno.ReportPipeline):
+        def report_batch(self, records: typing.List[aspreno.ReportRecord]) -> None:
+            release.wait()
+
+    pipeline = BlockedPipeline(max_queue=1)
+    results = [pipeline.submit(aspreno.ReportRecord(ReportedException(), {})) for _ in range(5)]
+    release.set()
+    assert pipeline.shutdown(5)
+
+    assert results.count(False) == pipeline.dropped
+    assert pipeline.dropped >= 3
+
+
+def test_shutdown_timeout_full_queue() -> None:
+    blocked, release = threading.Event(), threading.Event()
+
+    class BlockedPipeline(aspreno.ReportPipeline):
+        def report_batch(self, records: typing.List[aspreno.ReportRecord]) -> None:
+            blocked.set()
+            release.wait()
+
+    pipeline = BlockedPipeline(max_queue=1)
+    pipeline.submit(aspreno.ReportRecord(ReportedException(), {}))
+    assert blocked.wait(5)
+    # The worker is stuck, and the queue full.
+    assert pipeline.submit(aspreno.ReportRecord(ReportedException(), {}))
+
+    started = time.monotonic()
+    assert not pipeline.shutdown(0.2)
+    assert time.monotonic() - started < 2
+    release.set()
@@ -0,0 +1,106 @@
+import os
+import pathlib
+import threading
+import time
+import typing
+
+import aspreno
+
+
+class FileReportedException(aspreno.ArgumentedException):
+    """
+    Writes where it has been reported into the file given as the "path" argument.
+    """
+
+    def report(self, path: str, capture: aspreno.CaptureRecord, **kwargs: typing.Any) -> None:
+        pathlib.Path(path).write_text(f"{os.getpid()} {capture.message} {'traceback' in kwargs}")
+
+
+class SlowException(Exception):
+    def report(self, **_: typing.Any) -> None:
+        time.sleep(0.2)
+
+
+class ProcessExceptionHandler(aspreno.ExceptionHandler):
+    def __init__(self, reporter: aspreno.ProcessReporter) -> None:
+        super().__init__()
+        self.process_reporter = reporter
+
+
+def test_report_in_process(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "report"
+    handler = ProcessExceptionHandler(aspreno.ProcessReporter(workers=1))
+    try:
+        raise FileReportedException("offloaded", path=str(path))
+    except FileReportedException:
+        handler.relay()
+    handler.shutdown()
+
+    pid, message, has_traceback = path.read_text().split()
+    assert int(pid) != os.getpid()
+    assert message == "offloaded"
+    assert has_traceback == "False"
+
+
+def test_unpicklable_report() -> None:
+    class LocalException(Exception):
+        report_thread: typing.Optional[threading.Thread] = None
+
+        def report(self, **_: typing.Any) -> None:
+            self.report_thread = threading.current_thread()
+
+    reporter = aspreno.ProcessReporter(workers=1)
+    handler = ProcessExceptionHandler(reporter)
+    error = LocalException()
+    handler.handle(error)
+
+    assert error.report_thread is threading.current_thread()
+    assert reporter.unpicklable == 1
+    assert reporter.pending == 0
+    handler.shutdown()
+
+
+class UnloadableException(Exception):
+    def __init__(self, code: int, detail: str) -> None:
+        super().__init__(code)
+        self.detail = detail
+        self.report_thread: typing.Optional[threading.Thread] = None
+
+    def report(self, **_: typing.Any) -> None:
+        self.report_thread = threading.current_thread()
+
+
+def test_unloadable_report() -> None:
+    reporter = aspreno.ProcessReporter(workers=1)
+    handler = ProcessExceptionHandler(reporter)
+    error = UnloadableException(1, "cannot be unpickled")
+    handler.handle(error)
+
+    assert error.report_thread is threading.current_thread()
+    assert reporter.unpicklable == 1
+    handler.shutdown()
+
+
+def test_bounded_submission() -> None:
+    reporter = aspreno.ProcessReporter(workers=1, max_pending=2)
+    results = [reporter.submit(SlowException(), {}) for _ in range(5)]
+    assert results == [True] * 5
+    assert reporter.dropped == 3
+    reporter.shutdown()
+    assert reporter.pending == 0
+
+
+class StuckException(Exception):
+    def report(self, **_: typing.Any) -> None:
+        time.sleep(30)
+
+
+def test_shutdown_timeout() -> None:
+    reporter = aspreno.ProcessReporter(workers=1)
+    handler = ProcessExceptionHandler(reporter)
+    for _ in range(3):
+        handler.handle(StuckException())
+
+    started = time.monotonic()
+    assert not handler.shutdown(0.5)
+    assert time.monotonic() - started < 5
@@ -0,0 +1,137 @@
+import functools
+import io
+import pickle
+import sys
+import traceback
+import typing
+
+import pytest
+
+import aspreno
+
+
+def raise_value_error(message: str) -> None:
+    raise ValueError(message)
+
+
+def caught(function: typing.Callable[[], None]) -> BaseException:
+    try:
+        function()
+    except BaseException as error:
+        return error
+    raise AssertionError("Nothing was raised.")
+
+
+def test_render_like_excepthook() -> None:
+    renderer = aspreno.TracebackRenderer()
+    error = caught(functools.partial(raise_value_error, "first"))
+
+    assert renderer.render(error) == "".join(
+        traceback.format_exception(type(error), error, error.__traceback__)
+    )
+
+
+def test_render_chained() -> None:
+    def chained() -> None:
+        try:
+            raise_value_error("inner")
+        except ValueError as inner:
+            raise KeyError("outer") from inner
+
+    renderer = aspreno.TracebackRenderer()
+    error = caught(chained)
+
+    assert renderer.render(error) == "".join(
+        traceback.format_exception(type(error), error, error.__traceback__)
+    )
+
+
+def test_render_cached_per_fingerprint() -> None:
+    renderer = aspreno.TracebackRenderer(max_entries=1)
+    first = caught(functools.partial(raise_value_error, "first"))
+    second = caught(functools.partial(raise_value_error, "second"))
+
+    renderer.render(first)
+    text = renderer.render(second)
+
+    assert (renderer.misses, renderer.hits) == (1, 1)
+    assert text.endswith("ValueError: second\n")
+
+    renderer.render(caught(functools.partial(raise_value_error, "third")))
+    renderer.render(caught(lambda: {}["missing"]))
+    assert len(renderer) == 1
+
+
+def add_keys(x: typing.Dict[str, int], y: typing.Dict[str, int]) -> None:
+    x["k"] + y["k"]
+
+
+def test_render_same_line() -> None:
+    renderer = aspreno.TracebackRenderer()
+    for x, y in (({}, {"k": 1}), ({"k": 1}, {})):
+        error = caught(functools.partial(add_keys, x, y))
+        assert renderer.render(error) == "".join(
+            traceback.format_exception(type(error), error, error.__traceback__)
+        )
+    assert renderer.misses == 2
+
+
+def test_render_compact() -> None:
+    renderer = aspreno.TracebackRenderer(compact=True)
+    error = caught(functools.partial(raise_value_error, "compact"))
+    text = renderer.render(error)
+
+    assert "raise ValueError(message)" not in text
+    assert "in raise_value_error\nValueError: compact\n" in text
+
+
+def test_lazy_traceback() -> None:
+    renderer = aspreno.TracebackRenderer()
+    lazy = renderer.lazy(caught(functools.partial(raise_value_error, "lazy")))
+
+    assert not renderer.misses
+    assert str(lazy) is lazy.text
+    assert renderer.misses == 1
+
+    unpickled = pickle.loads(pickle.dumps(lazy))
+    assert unpickled.text == lazy.text
+    assert unpickled.traceback is None
+
+
+def test_handler_gives_formatted_traceback() -> None:
+    class ReportedException(Exception):
+        received: typing.Optional[aspreno.LazyTraceback] = None
+
+        def handle(self, **_: typing.Any) -> None:
+            pass
+
+        def report(self, formatted_traceback: aspreno.LazyTraceback, **_: typing.Any) -> None:
+            self.received = formatted_traceback
+
+    class RenderingHandler(aspreno.ExceptionHandler):
+        traceback_renderer = aspreno.TracebackRenderer(compact=True)
+
+    reported = ReportedException()
+    RenderingHandler().handle(reported)
+
+    assert reported.received is not None
+    assert reported.received.error is reported
+    assert RenderingHandler.traceback_renderer is not None
+    assert RenderingHandler.traceback_renderer.misses == 0
+
+
+def test_fall_back_prints_rendered(monkeypatch: pytest.MonkeyPatch) -> None:
+    class RenderingHandler(aspreno.ExceptionHandler):
+        traceback_renderer = aspreno.TracebackRenderer()
+
+    stderr = io.StringIO()
+    monkeypatch.setattr(sys, "stderr", stderr)
+    handler = RenderingHandler()
+    for message in ("first", "second"):
+        error = caught(functools.partial(raise_value_error, message))
+        handler._global_handler(ValueError, error, error.__traceback__)
+
+    assert stderr.getvalue().count("Traceback (most recent call last):") == 2
+    assert stderr.getvalue().endswith("ValueError: second\n")
+    assert handler.traceback_renderer is not None
+    assert handler.traceback_renderer.hits == 1
@@ -0,0 +1,66 @@
+import typing
+
+import pytest
+
+import aspreno
+
+
+def test_every_nth() -> None:
+    policy = aspreno.EveryNth(3)
+    results = [policy.sample(ValueError(), 0) for _ in range(7)]
+    assert results == [True, False, False, True, False, False, True]
+    assert policy.sample(KeyError(), 0)
+    assert policy.sampled_out == {"ValueError": 4}
+
+
+def test_token_bucket() -> None:
+    policy = aspreno.TokenBucket(rate=0, burst=2)
+    assert [policy.sample(ValueError(), 1) for _ in range(3)] == [True, True, False]
+    assert policy.sample(ValueError(), 2)
+    assert policy.sampled_out["ValueError"] == 1
+
+
+def test_reservoir() -> None:
+    policy = aspreno.Reservoir(size=5, interval=3600)
+    errors = [ValueError(index) for index in range(1000)]
+    reported = sum(policy.sample(error, 0) for error in errors)
+
+    assert 5 <= reported < 100
+    assert policy.sampled_out["ValueError"] == 1000 - reported
+
+    # End the interval.
+    policy._interval_end = 0
+    samples = policy.samples()
+    assert len(samples) == 5
+    assert all(sample in errors for sample in samples)
+
+
+def test_handler_samples_reports_only() -> None:
+    class SampledException(Exception):
+        handled: typing.ClassVar[int] = 0
+        reported: typing.ClassVar[int] = 0
+
+        def handle(self, **_: typing.Any) -> None:
+            SampledException.handled += 1
+
+        def report(self, **_: typing.Any) -> None:
+            SampledException.reported += 1
+
+    handler = aspreno.ExceptionHandler()
+    handler.sampling_policy = aspreno.EveryNth(10)
+    for _ in range(100):
+        try:
+            raise SampledException()
+        except SampledException:
+            handler.relay()
+
+    assert SampledException.handled == 100
+    assert SampledException.reported == 10
+    assert handler.sampling_policy.sampled_out["SampledException"] == 90
+
+
+def test_invalid_policies() -> None:
+    with pytest.raises(ValueError):
+        aspreno.EveryNth(0)
+    with pytest.raises(ValueError):
+        aspreno.Reservoir(0)
@@ -0,0 +1,96 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import typing
+
+import pytest
+
+import aspreno
+from aspreno.shared_counters import OTHER
+
+
+@pytest.fixture
+def counters() -> typing.Iterator[aspreno.SharedCounters]:
+    counters = aspreno.SharedCounters(slots=4, workers=4)
+    yield counters
+    counters.close()
+    counters.unlink()
+
+
+def test_increment(counters: aspreno.SharedCounters) -> None:
+    counters.increment("builtins.KeyError")
+    counters.increment("builtins.KeyError", 2)
+    counters.increment("builtins.ValueError")
+
+    assert counters.snapshot() == {"builtins.KeyError": 3, "builtins.ValueError": 1}
+    assert counters.per_worker() == {os.getpid(): counters.snapshot()}
+
+
+def test_full_slots(counters: aspreno.SharedCounters) -> None:
+    for index in range(5):
+        counters.increment(f"Error{index}")
+
+    snapshot = counters.snapshot()
+    assert len(snapshot) == 4
+    assert snapshot[OTHER] == 2
+
+
+def test_attach(counters: aspreno.SharedCounters) -> None:
+    counters.increment("builtins.KeyError")
+    # Attach from another interpreter, like a sidecar would.
+    script = (
+        "import aspreno\n"
+        f"attached = aspreno.SharedCounters.attach({counters.name!r})\n"
+        "print(attached.snapshot())\n"
+        "try:\n"
+        "    attached.increment('builtins.KeyError')\n"
+        "except RuntimeError:\n"
+        "    print('read-only')\n"
+        "attached.close()\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.splitlines() == ["{'builtins.KeyError': 1}", "read-only"]
+    assert not result.stderr
+    # The sidecar exiting must not delete the segment.
+    assert counters.snapshot() == {"builtins.KeyError": 1}
+
+
+def increment_in_child(counters: aspreno.SharedCounters) -> None:
+    for _ in range(100):
+        counters.increment("builtins.KeyError")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Workers are forked.")
+def test_forked_workers(counters: aspreno.SharedCounters) -> None:
+    # The parent claims a row before forking, children must claim their own.
+    counters.increment("builtins.KeyError")
+
+    context = multiprocessing.get_context("fork")
+    children = [context.Process(target=increment_in_child, args=(counters,)) for _ in range(3)]
+    for child in children:
+        child.start()
+    for child in children:
+        child.join()
+        assert child.exitcode == 0
+
+    assert counters.snapshot() == {"builtins.KeyError": 301}
+    # Rows of exited children may have been reused, their counts are kept.
+    workers = counters.per_worker()
+    assert workers[os.getpid()] == {"builtins.KeyError": 1}
+    assert set(workers) <= {os.getpid()} | {child.pid for child in children}
+
+
+def test_handler_feeds_shared_counters(counters: aspreno.SharedCounters) -> None:
+    class MyException(Exception):
+        def handle(self, **_: typing.Any) -> None:
+            pass
+
+    class CountingHandler(aspreno.ExceptionHandler):
+        shared_counters = counters
+
+    CountingHandler().handle(MyException())
+    (name,) = counters.snapshot()
+    assert name.endswith("MyException")
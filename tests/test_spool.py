@@ -0,0 +1,122 @@
+import os
+import pathlib
+import typing
+
+import pytest
+
+import aspreno
+from aspreno.spool import main, spool_files
+
+Delivered = typing.List[typing.Tuple[BaseException, typing.Dict[str, typing.Any]]]
+
+
+class SpooledException(Exception):
+    fail = False
+
+    def handle(self, **_: typing.Any) -> None:
+        pass
+
+    def report(self, **_: typing.Any) -> None:
+        if self.fail:
+            raise ConnectionError("The collector is down.")
+
+
+class UnloadableException(Exception):
+    def __init__(self, code: int, detail: str) -> None:
+        super().__init__(code)
+        self.detail = detail
+
+
+def collect(delivered: Delivered) -> typing.Callable[..., None]:
+    return lambda error, kwargs: delivered.append((error, kwargs))
+
+
+def test_replay_unacknowledged(tmp_path: pathlib.Path) -> None:
+    spool = aspreno.Spool(str(tmp_path / "spool"))
+    acknowledge = spool.append(SpooledException("made"), {})
+    assert acknowledge is not None
+    spool.append(SpooledException("pending"), {})
+    acknowledge()
+
+    delivered: Delivered = []
+    assert spool.replay(collect(delivered)) == 1
+    assert [str(error) for error, _ in delivered] == ["pending"]
+    assert isinstance(delivered[0][1]["capture"], aspreno.CaptureRecord)
+    assert not spool_files(spool.path, spool.backups)
+
+
+def test_unpicklable(tmp_path: pathlib.Path) -> None:
+    class LocalException(Exception):
+        pass
+
+    spool = aspreno.Spool(str(tmp_path / "spool"))
+    assert spool.append(LocalException(), {}) is None
+    assert spool.unpicklable == 1
+
+    assert spool.append(UnloadableException(1, "cannot be unpickled"), {}) is None
+    assert spool.unpicklable == 2
+
+
+def test_rotation(tmp_path: pathlib.Path) -> None:
+    spool = aspreno.Spool(str(tmp_path / "spool"), max_bytes=1024, backups=2)
+    for index in range(50):
+        spool.append(SpooledException(str(index)), {})
+    spool.close()
+
+    files = spool_files(spool.path, spool.backups)
+    assert len(files) == 3
+    assert all(os.path.getsize(file) <= 1024 for file in files)
+
+    delivered: Delivered = []
+    replayed = spool.replay(collect(delivered))
+    assert 0 < replayed < 50
+    # The oldest reports were dropped along with the oldest file.
+    assert str(delivered[-1][0]) == "49"
+
+
+def test_truncated_entry(tmp_path: pathlib.Path) -> None:
+    spool = aspreno.Spool(str(tmp_path / "spool"))
+    spool.append(SpooledException("complete"), {})
+    spool.append(SpooledException("truncated"), {})
+    spool.close()
+
+    with open(spool.path, "r+b") as file:
+        file.truncate(os.path.getsize(spool.path) - 3)
+
+    delivered: Delivered = []
+    assert spool.replay(collect(delivered)) == 1
+    assert str(delivered[0][0]) == "complete"
+
+
+def test_handler_spools_reports(tmp_path: pathlib.Path) -> None:
+    class SpoolingHandler(aspreno.ExceptionHandler):
+        spool = aspreno.Spool(str(tmp_path / "spool"), fsync_every=1000, fsync_interval=1000)
+
+    handler = SpoolingHandler()
+    handler.handle(SpooledException("made"))
+
+    failing = SpooledException("failed")
+    failing.fail = True
+    with pytest.raises(ConnectionError):
+        handler.handle(failing)
+
+    # The excepthook syncs the spool before returning.
+    handler._global_handler(SpooledException, SpooledException("last"), None)
+    assert handler.spool is not None and handler.spool._unsynced == 0
+
+    delivered: Delivered = []
+    assert handler.spool.replay(collect(delivered)) == 1
+    assert [str(error) for error, _ in delivered] == ["failed"]
+
+
+def test_cli(tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = str(tmp_path / "spool")
+    assert main([path]) == 1
+
+    spool = aspreno.Spool(path)
+    spool.append(SpooledException("pending"), {})
+    spool.close()
+
+    assert main([path]) == 0
+    assert capsys.readouterr().out.splitlines()[-1] == "Delivered 1 reports."
+    assert not os.path.exists(path)